@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.client import responses as HTTP_REASONS
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+
+ARCHIVE_VERSION = 1
+TOKEN_PLACEHOLDER = "<token>"
+
+
+def _sanitize(text: str, bearer_token: Optional[str]) -> str:
+    """Retire le token Bearer d'une URL ou d'un corps de réponse"""
+    if bearer_token and bearer_token in text:
+        return text.replace(bearer_token, TOKEN_PLACEHOLDER)
+    return text
+
+
+def load_archive(archive_file: str) -> Tuple[Dict, List[Dict]]:
+    """
+    Lit une archive de capture
+
+    Returns:
+        (en-tête, requêtes dans l'ordre avec leur corps de réponse résolu)
+    """
+    header: Dict = {}
+    bodies: Dict[str, str] = {}
+    entries: List[Dict] = []
+    with gzip.open(archive_file, 'rt', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            kind = record.pop("kind")
+            if kind == "header":
+                header = header or record
+            elif kind == "body":
+                bodies[record["id"]] = record["body"]
+            else:
+                record["body"] = bodies.get(record.pop("body_id"), "")
+                entries.append(record)
+    entries.sort(key=lambda entry: entry["t"])
+    return header, entries
+
+
+class UpstreamCapture:
+    """
+    Enregistre chaque requête vers l'API Epitech et sa réponse dans une archive compacte
+
+    Format: JSON lines compressées (gzip, un membre par ajout pour rester lisible si le
+    processus s'arrête). Les corps identiques (ex: /me/{year} entre deux vérifications)
+    ne sont stockés qu'une fois. Aucun en-tête n'est enregistré et le token est retiré
+    des URL et des corps.
+    """
+
+    def __init__(self, archive_file: str):
+        self.archive_file = archive_file
+        self.started_at = time.monotonic()
+        self._known_bodies = set()
+        self._lock = threading.Lock()
+        self._write([{"kind": "header", "version": ARCHIVE_VERSION, "started_at": datetime.now().isoformat()}])
+
+    def _write(self, records: List[Dict]):
+        try:
+            with gzip.open(self.archive_file, 'at', encoding='utf-8') as f:
+                f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+        except OSError as e:
+            print(f"⚠️  Impossible d'écrire la capture dans {self.archive_file}: {e}")
+
+    def record(self, endpoint: str, path: str, response: requests.Response, elapsed: float, bearer_token: Optional[str]):
+        """
+        Ajoute une requête à l'archive
+
+        Args:
+            endpoint: Modèle de route (ex: "/me/{year}")
+            path: Chemin demandé, relatif à l'URL de base
+            response: Réponse reçue
+            elapsed: Durée de la requête en secondes
+            bearer_token: Token à retirer de l'enregistrement
+        """
+        body = _sanitize(response.text, bearer_token)
+        body_id = hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+        entry = {
+            "kind": "request",
+            "t": round(time.monotonic() - self.started_at - elapsed, 4),
+            "endpoint": endpoint,
+            "path": _sanitize(path, bearer_token),
+            "status": response.status_code,
+            "elapsed": round(elapsed, 4),
+            "body_id": body_id
+        }
+        with self._lock:
+            records = []
+            if body_id not in self._known_bodies:
+                self._known_bodies.add(body_id)
+                records.append({"kind": "body", "id": body_id, "body": body})
+            records.append(entry)
+            self._write(records)
+
+
+class UpstreamReplay:
+    """
+    Sert les réponses d'une archive de capture à la place de l'API Epitech
+
+    Chaque chemin rejoue ses réponses dans l'ordre d'origine (la dernière est resservie
+    une fois la liste épuisée), avec la latence d'origine divisée par `speed`.
+    """
+
+    def __init__(self, archive_file: str, speed: float = 1.0):
+        self.speed = speed
+        self.header, self.entries = load_archive(archive_file)
+        self._by_path: Dict[str, List[Dict]] = {}
+        for entry in self.entries:
+            self._by_path.setdefault(entry["path"], []).append(entry)
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.served = 0
+        self.missing = 0
+
+    def _next(self, path: str) -> Optional[Dict]:
+        with self._lock:
+            entries = self._by_path.get(path)
+            if not entries:
+                self.missing += 1
+                return None
+            position = self._positions.get(path, 0)
+            self._positions[path] = position + 1
+            self.served += 1
+            return entries[min(position, len(entries) - 1)]
+
+    def get(self, path: str, url: str) -> requests.Response:
+        """Réponse enregistrée pour `path` (404 si le chemin n'a jamais été capturé)"""
+        entry = self._next(path)
+        response = requests.Response()
+        response.url = url
+        if entry is None:
+            response.status_code = 404
+            response._content = b'{"message": "Absent de la capture"}'
+        else:
+            time.sleep(entry["elapsed"] / self.speed)
+            response.status_code = entry["status"]
+            response._content = entry["body"].encode('utf-8')
+        response.reason = HTTP_REASONS.get(response.status_code, "")
+        response.headers["Content-Type"] = "application/json"
+        response.encoding = "utf-8"
+        return response
+
+
+# Instances partagées par toutes les instances d'EpitechAPI (le client est recréé à chaque token)
+upstream_capture = UpstreamCapture(os.environ["EPITECH_API_CAPTURE"]) if os.getenv("EPITECH_API_CAPTURE") else None
+upstream_replay = (UpstreamReplay(os.environ["EPITECH_API_REPLAY"], float(os.getenv("EPITECH_API_REPLAY_SPEED", "1")))
+                   if os.getenv("EPITECH_API_REPLAY") else None)
@@ -0,0 +1,77 @@
+"""
+Benchmark des exports en colonnes (Parquet/Arrow) face au CSV
+
+Génère un historique synthétique (un passage = une ligne "run", ses tâches et
+ses tests), puis compare durée d'écriture et taille du fichier produit.
+
+Usage:
+    python benchmarks/bench_columnar_export.py [nombre_de_passages]
+"""
+import csv
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_worker import COLUMNAR_FIELDS, filter_results, iter_columnar_records, write_export  # noqa: E402
+
+
+def make_history(count: int, seed: int = 42):
+    """Génère un historique synthétique et les résultats par test associés"""
+    rng = random.Random(seed)
+    results, outcomes = [], {}
+    for run_id in range(count):
+        skills, tests = {}, []
+        for task in range(rng.randint(3, 12)):
+            total = rng.randint(1, 10)
+            passed = rng.randint(0, total)
+            skills[f"task{task:02d}"] = {"count": total, "passed": passed, "crashed": rng.randint(0, 1), "mandatoryFailed": 0}
+            tests.extend([f"task{task:02d}", f"test_{task}_{i}", i < passed, False] for i in range(total))
+        results.append({
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z",
+            "project": {"name": f"Projet {run_id % 200}", "slug": f"proj{run_id % 200}", "module": {"code": f"G-CPE-{100 + run_id % 7}"}},
+            "results": {"testRunId": run_id, "skills": skills}
+        })
+        outcomes[str(run_id)] = tests
+    return results, outcomes
+
+
+def write_flat_csv(results, outcomes, filters, path):
+    """Écrit les mêmes lignes que l'export en colonnes, en CSV (comparaison à contenu égal)"""
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=[name for name, _ in COLUMNAR_FIELDS])
+        writer.writeheader()
+        for record in iter_columnar_records(filter_results(results, filters), outcomes):
+            writer.writerow(record)
+            rows += 1
+    return {"rows": rows, "path": path, "size": os.path.getsize(path)}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results, outcomes = make_history(runs)
+    filters = {"module": "G-CPE-100", "date_from": "2025-03-01", "date_to": "2025-06-30"}
+    print(f"{runs} passages (csv: une ligne par passage; csv-flat: mêmes lignes que Parquet/Arrow)")
+    print(f"{'Format':>8} | {'Filtré':>6} | {'Lignes':>8} | {'Durée (s)':>9} | {'Taille (Ko)':>11}")
+
+    for export_format in ("csv", "csv-flat", "parquet", "arrow"):
+        for label, active_filters in (("non", None), ("oui", filters)):
+            try:
+                start = time.perf_counter()
+                if export_format == "csv-flat":
+                    summary = write_flat_csv(results, outcomes, active_filters, "bench_columnar.csv")
+                else:
+                    summary = write_export(export_format, results, filters=active_filters, test_outcomes=outcomes)
+                duration = time.perf_counter() - start
+            except ImportError as e:
+                print(f"{export_format:>8} | ignoré: {e}")
+                break
+            print(f"{export_format:>8} | {label:>6} | {summary['rows']:>8} | {duration:>9.2f} | {summary['size'] / 1024:>11.0f}")
+            os.remove(summary["path"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark de /export: durée de génération et latence de la boucle d'événements
+
+Compare la génération dans la boucle (ancien comportement) avec la génération
+dans le pool de processus d'export_worker, en mesurant le retard de
+planification d'une tâche « battement » toutes les 10ms.
+
+Usage:
+    python benchmarks/bench_export.py [nombre_de_lignes] [formats...]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export_worker import ExportManager, write_export  # noqa: E402
+
+TICK = 0.01
+
+
+def make_results(count: int, seed: int = 42):
+    """Génère des résultats synthétiques au format /me/{year}"""
+    rng = random.Random(seed)
+    results = []
+    for run_id in range(count):
+        skills = {}
+        for task in range(rng.randint(3, 12)):
+            total = rng.randint(1, 10)
+            skills[f"task{task:02d}"] = {"count": total, "passed": rng.randint(0, total), "crashed": rng.randint(0, 1)}
+        results.append({
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z",
+            "project": {"name": f"Projet {run_id % 200}", "slug": f"proj{run_id % 200}", "module": {"code": f"G-CPE-{100 + run_id % 7}"}},
+            "results": {"testRunId": run_id, "skills": skills}
+        })
+    return results
+
+
+async def measure(job):
+    """Exécute `job` en mesurant le retard de la boucle; retourne (durée, retard max, retard p99)"""
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            expected = time.perf_counter() + TICK
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(TICK * 3)
+    start = time.perf_counter()
+    await job()
+    duration = time.perf_counter() - start
+    done.set()
+    await ticker
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    return duration, (lags[-1] if lags else 0.0), p99
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    formats = sys.argv[2:] or ["csv", "json", "pdf"]
+    results = make_results(rows)
+    manager = ExportManager()
+    print(f"{rows} lignes")
+    print(f"{'Format':>6} | {'Mode':>10} | {'Durée (s)':>9} | {'Retard max (ms)':>15} | {'Retard p99 (ms)':>15}")
+
+    for export_format in formats:
+        try:
+            async def inline():
+                summary = write_export(export_format, results)
+                os.remove(summary["path"])
+
+            async def pooled():
+                summary = await manager.export(export_format, time.time_ns(), results)
+                os.remove(summary["path"])
+
+            # Démarrer le pool avant la mesure (coût payé une seule fois au premier export)
+            await manager.export("csv", -1, results[:1])
+            for mode, job in (("boucle", inline), ("processus", pooled)):
+                duration, max_lag, p99 = await measure(job)
+                print(f"{export_format:>6} | {mode:>10} | {duration:>9.2f} | {max_lag * 1000:>15.1f} | {p99 * 1000:>15.1f}")
+        except ImportError as e:
+            print(f"{export_format:>6} | ignoré: {e}")
+
+    manager.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
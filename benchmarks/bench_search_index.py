@@ -0,0 +1,80 @@
+"""
+Benchmark de l'index de recherche des traces (/search)
+
+Indexe N passages synthétiques puis mesure la latence des requêtes
+(objectif: < 50ms sur plusieurs milliers de passages).
+
+Usage:
+    python benchmarks/bench_search_index.py [nombre_de_passages]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import TraceSearchIndex  # noqa: E402
+
+ERRORS = ["Segmentation fault", "Timeout", "Expected 42 but got 0", "Bus error", "Floating point exception", "Abort"]
+WORDS = ["malloc", "free", "strlen", "my_printf", "linked_list", "buffer", "pointer", "array", "recursion", "putchar"]
+
+
+def make_run(rng: random.Random, run_id: int):
+    """Génère un couple (résultat, détails) avec une trace de quelques Ko"""
+    project = f"cpoolday{rng.randint(1, 13):02d}"
+    tests = [f"test_{rng.choice(WORDS)}_{i}" for i in range(rng.randint(5, 30))]
+    lines = []
+    for test in tests:
+        lines.append(f"{test}: " + ("SUCCESS" if rng.random() > 0.2 else f"FAILURE {rng.choice(ERRORS)}"))
+        lines.extend(" ".join(rng.choice(WORDS) for _ in range(8)) for _ in range(rng.randint(1, 5)))
+    result = {
+        "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+        "project": {"name": project.title(), "slug": project, "module": {"code": "G-CPE-100"}},
+        "results": {"testRunId": run_id, "skills": {}}
+    }
+    details = {
+        "results": {"skills": {"task01": {"tests": [{"name": name} for name in tests]}}},
+        "externalItems": [{"type": "trace-pool", "comment": "\n".join(lines)}]
+    }
+    return result, details
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = TraceSearchIndex(os.path.join(tmp, "search_index.jsonl"))
+
+        start = time.perf_counter()
+        for run_id in range(runs):
+            index.index_run(*make_run(rng, run_id))
+        print(f"Indexation de {runs} passages: {(time.perf_counter() - start):.2f}s")
+
+        start = time.perf_counter()
+        index.save()
+        size = os.path.getsize(index.index_file) / 1024 / 1024
+        print(f"Sauvegarde: {(time.perf_counter() - start):.2f}s ({size:.1f} Mo)")
+
+        start = time.perf_counter()
+        TraceSearchIndex(index.index_file).load()
+        print(f"Chargement: {(time.perf_counter() - start):.2f}s")
+
+        # Nouveau passage après une vérification: seule sa ligne est ajoutée au journal
+        index.index_run(*make_run(rng, runs))
+        start = time.perf_counter()
+        index.save()
+        print(f"Sauvegarde incrémentale (1 passage): {(time.perf_counter() - start) * 1000:.2f}ms")
+
+        for query in ["Segmentation fault", "my_printf", "malloc pointer", "test_free_3", "introuvable"]:
+            timings = []
+            for _ in range(20):
+                matches, elapsed_ms = index.timed_search(query, 10)
+                timings.append(elapsed_ms)
+            timings.sort()
+            print(f"{query!r:>22}: p50={timings[10]:.2f}ms max={timings[-1]:.2f}ms ({len(matches)} affichés)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark de l'extraction des logs d'échec sur des traces `trace-pool` de plusieurs Mo
+
+Compare l'ancienne extraction (plusieurs parcours ligne à ligne à chaque affichage)
+avec l'index construit en une passe puis réutilisé par testRunId.
+
+Usage:
+    python benchmarks/bench_trace_parser.py [taille_en_mo ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trace_parser import TraceIndex, TraceIndexCache  # noqa: E402
+
+
+def legacy_extract(output: str, task_name: str) -> str:
+    """Ancienne implémentation de LogsMoulinetteSelect._extract_failed_task_output"""
+    cleaned_output = output.replace('\x1b[0m', '').replace('\x1b[31m', '').replace('\x1b[32m', '').replace('\x1b[33m', '')
+    lines = cleaned_output.split('\n')
+    failed_task_start = -1
+    for i, line in enumerate(lines):
+        if ": FAILURE" in line or "Test failed:" in line:
+            for j in range(i, max(0, i - 20), -1):
+                if "====" in lines[j]:
+                    failed_task_start = j
+                    break
+            break
+    if failed_task_start == -1:
+        task_name_short = task_name.split(' - ')[1] if ' - ' in task_name else task_name
+        for i, line in enumerate(lines):
+            if f"task{task_name_short}" in line and "====" in line:
+                failed_task_start = i
+                break
+        if failed_task_start == -1:
+            return cleaned_output[:2000]
+    task_lines = []
+    for i in range(failed_task_start, len(lines)):
+        task_lines.append(lines[i])
+        if i + 1 < len(lines) and "====" in lines[i + 1] and "task" in lines[i + 1].lower():
+            break
+    filtered_lines = []
+    in_execution_section = False
+    for line in task_lines:
+        if "# Executing all tests..." in line:
+            in_execution_section = True
+            filtered_lines.append(line)
+        elif in_execution_section and not line.startswith(("# Building...", "# Checking for forbidden functions...")):
+            filtered_lines.append(line)
+    result = '\n'.join(filtered_lines)
+    return result[:2000] + "\n... (tronqué)" if len(result) > 2000 else result
+
+
+def make_trace(size_mb: float, seed: int = 42) -> str:
+    """Génère une trace réaliste: tâches réussies, puis une tâche en échec en fin de trace"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    chunks = []
+    length = 0
+    task = 0
+    while length < target:
+        task += 1
+        lines = [f"==== task{task:02d} ====", "# Building...", "# Checking for forbidden functions...", "# Executing all tests..."]
+        for test in range(rng.randint(20, 60)):
+            lines.append(f"\x1b[32mtest_{task}_{test}: SUCCESS\x1b[0m " + "x" * rng.randint(20, 120))
+        chunk = "\n".join(lines)
+        chunks.append(chunk)
+        length += len(chunk) + 1
+    chunks.append("\n".join([
+        f"==== task{task + 1:02d} ====",
+        "# Building...",
+        "# Executing all tests...",
+        "\x1b[1;31mtest_final: FAILURE\x1b[0m",
+        "Expected 42, got 0",
+    ]))
+    return "\n".join(chunks)
+
+
+def timed(func, repeat: int) -> float:
+    """Retourne la durée moyenne d'un appel, en millisecondes"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1, 4, 8]
+    print(f"{'Taille':>8} | {'Ancien (ms)':>12} | {'Index (ms)':>11} | {'Extraction (ms)':>16}")
+    for size in sizes:
+        trace = make_trace(size)
+        cache = TraceIndexCache()
+        legacy = timed(lambda: legacy_extract(trace, "task"), 5)
+        build = timed(lambda: TraceIndex(trace), 5)
+        cache.get("run", trace)
+        lookup = timed(lambda: cache.get("run", trace).extract("task"), 200)
+        print(f"{size:>6.1f}Mo | {legacy:>12.2f} | {build:>11.2f} | {lookup:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Test de charge du cog contre l'API Epitech simulée (mock_epitech_server.py)
+
+Des workers concurrents exécutent les slash commands et les callbacks des
+menus/boutons avec une fausse interaction Discord. Le rapport donne le débit,
+les percentiles de latence par scénario et le nombre d'appels reçus par l'API.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 8 --duration 20
+    python benchmarks/load_test.py --latency 150 --jitter 50 --forbidden-rate 0.05
+    python benchmarks/load_test.py --mix results=3,logs=2,history=2,stats=1 --output charge.json
+    python benchmarks/load_test.py --mix logs=1,history=1 --think-time 1500   # sélection → embed
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from mock_epitech_server import FaultConfig, MockDataset, MockEpitechServer  # noqa: E402
+
+DEFAULT_MIX = "results=3,refresh=1,stats=1,status=1,logs=2,history=2,poll=1"
+
+
+class FakeResponse:
+    """Équivalent minimal de discord.InteractionResponse"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_message(self, content=None, **kwargs):
+        self._done = True
+        self._interaction.record(content, **kwargs)
+
+    async def edit_message(self, content=None, **kwargs):
+        self._done = True
+        self._interaction.record(content, **kwargs)
+
+
+class FakeFollowup:
+    """Équivalent minimal du webhook interaction.followup"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        self._interaction.record(content, **kwargs)
+
+
+class FakeInteraction:
+    """Fausse interaction: conserve les messages envoyés (embeds, vues) pour la suite du scénario"""
+
+    def __init__(self, command=None):
+        self.command = command
+        self.extras: Dict = {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.messages: List[Dict] = []
+
+    def record(self, content=None, embed=None, view=None, **kwargs):
+        self.messages.append({"content": content, "embed": embed, "view": view})
+
+    async def edit_original_response(self, content=None, **kwargs):
+        self.record(content, **kwargs)
+
+    @property
+    def failed(self) -> bool:
+        """Vrai si la dernière réponse est un embed d'erreur (titre « ❌ ... »)"""
+        embed = self.messages[-1]["embed"] if self.messages else None
+        return embed is not None and (embed.title or "").startswith("❌")
+
+    def last_view(self):
+        for message in reversed(self.messages):
+            if message["view"] is not None:
+                return message["view"]
+        return None
+
+
+class FakeBot:
+    latency = 0.042
+
+
+class LoadTest:
+    """Scénarios exécutés contre les cogs (une instance de chaque, comme en production)"""
+
+    def __init__(self, cog, logs_cog, rng: random.Random, samples: Optional[Dict[str, List]] = None,
+                 think_time: float = 0.0):
+        self.cog = cog
+        self.logs_cog = logs_cog
+        self.rng = rng
+        # Durées des callbacks de menu seuls (sélection → embed), par scénario
+        self.samples = samples if samples is not None else {}
+        self.think_time = think_time
+
+    async def _command(self, command, cog=None, **kwargs) -> FakeInteraction:
+        interaction = FakeInteraction(command)
+        await command.callback(cog or self.cog, interaction, **kwargs)
+        return interaction
+
+    async def _select(self, name: str, view, select_type) -> Optional[FakeInteraction]:
+        """
+        Choisit une option dans le menu de la vue et exécute son callback
+
+        Après un temps de lecture (--think-time), l'utilisateur simulé choisit
+        le plus souvent l'une des premières options (les plus récentes).
+        """
+        select = next((item for item in getattr(view, "children", []) if isinstance(item, select_type)), None)
+        if select is None or not select.options:
+            return None
+        if self.think_time:
+            await asyncio.sleep(self.think_time * self.rng.uniform(0.5, 1.5))
+        options = select.options[:3] if self.rng.random() < 0.7 else select.options
+        select._values = [self.rng.choice(options).value]
+        interaction = FakeInteraction()
+        start = time.perf_counter()
+        await select.callback(interaction)
+        self.samples.setdefault(f"{name}.select", []).append((time.perf_counter() - start, not interaction.failed))
+        return interaction
+
+    async def results(self) -> bool:
+        return not (await self._command(self.cog.results_slash, nombre=self.rng.randint(1, 20))).failed
+
+    async def refresh(self) -> bool:
+        from slash_commands import RefreshView
+        interaction = await self._command(self.cog.results_slash, nombre=5)
+        view = interaction.last_view()
+        if not isinstance(view, RefreshView):
+            return False
+        button = FakeInteraction()
+        await view.refresh_button.callback(button)
+        return not button.failed
+
+    async def stats(self) -> bool:
+        return not (await self._command(self.cog.stats_slash)).failed
+
+    async def status(self) -> bool:
+        return not (await self._command(self.cog.status_slash)).failed
+
+    async def logs(self) -> bool:
+        from logs_commands import LogsMoulinetteSelect
+        interaction = await self._command(self.logs_cog.logs_slash, self.logs_cog)
+        selected = await self._select("logs", interaction.last_view(), LogsMoulinetteSelect)
+        return selected is not None and not selected.failed
+
+    async def history(self) -> bool:
+        from slash_commands import HistoryProjectSelect
+        interaction = await self._command(self.cog.history_slash)
+        selected = await self._select("history", interaction.last_view(), HistoryProjectSelect)
+        return selected is not None and not selected.failed
+
+    async def poll(self) -> bool:
+        # Même appel que la surveillance automatique de bot.py
+        self.cog.epitech_api.get_new_results()
+        return True
+
+
+def _parse_mix(mix: str) -> Dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+async def run_load(cog, logs_cog, weights: Dict[str, int], concurrency: int, duration: float, seed: int,
+                   think_time: float = 0.0) -> Dict[str, List]:
+    """
+    Exécute les scénarios pendant `duration` secondes
+
+    Returns:
+        {scénario: [(durée, succès)]}, plus "<scénario>.select" pour la seule sélection dans un menu
+    """
+    samples: Dict[str, List] = {name: [] for name in weights}
+    names = list(weights)
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed + index)
+        load = LoadTest(cog, logs_cog, rng, samples, think_time)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            start = time.perf_counter()
+            try:
+                ok = await getattr(load, name)()
+            except Exception as e:
+                print(f"❌ {name}: {type(e).__name__}: {e}")
+                ok = False
+            samples[name].append((time.perf_counter() - start, ok))
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return samples
+
+
+def build_report(samples: Dict[str, List], wall: float, upstream: Dict[str, Dict[str, int]]) -> Dict:
+    from metrics import percentile
+
+    scenarios = {}
+    for name, values in samples.items():
+        durations = [duration for duration, _ in values]
+        if not durations:
+            continue
+        scenarios[name] = {
+            "count": len(durations),
+            "errors": sum(1 for _, ok in values if not ok),
+            "throughput": len(durations) / wall,
+            "p50": percentile(durations, 0.50),
+            "p95": percentile(durations, 0.95),
+            "p99": percentile(durations, 0.99),
+            "max": max(durations)
+        }
+    # Les sélections (".select") font partie d'un scénario déjà compté
+    total = sum(scenario["count"] for name, scenario in scenarios.items() if "." not in name)
+    upstream_total = sum(sum(statuses.values()) for statuses in upstream.values())
+    return {
+        "wall_seconds": wall,
+        "operations": total,
+        "throughput": total / wall if wall else 0.0,
+        "upstream_calls": upstream,
+        "upstream_calls_total": upstream_total,
+        "upstream_calls_per_operation": upstream_total / total if total else 0.0,
+        "scenarios": scenarios
+    }
+
+
+def print_report(report: Dict):
+    print(f"\n{'Scénario':<15} {'n':>6} {'err':>5} {'op/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, stats in report["scenarios"].items():
+        print(f"{name:<15} {stats['count']:>6} {stats['errors']:>5} {stats['throughput']:>8.2f}"
+              + "".join(f" {stats[key] * 1000:>7.0f}ms" for key in ("p50", "p95", "p99", "max")))
+    print(f"\n⚡ Débit total: {report['throughput']:.2f} op/s ({report['operations']} opérations en {report['wall_seconds']:.1f}s)")
+    print(f"📡 Appels API: {report['upstream_calls_total']} ({report['upstream_calls_per_operation']:.2f} par opération)")
+    for endpoint, statuses in sorted(report["upstream_calls"].items()):
+        detail = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+        print(f"   • {endpoint}: {detail}")
+    for name, stats in report.get("prefetch", {}).items():
+        print(f"🔮 Préchargement {name}: {stats['hit_ratio']:.0%} servis d'avance "
+              f"({stats['hits']} en mémoire, {stats['inflight_hits']} en cours, {stats['misses']} miss), "
+              f"{stats['fetched']} préchargés, {stats['wasted']} inutilisés")
+
+
+async def main_async(args):
+    server = MockEpitechServer(
+        dataset=MockDataset(args.projects, args.runs, args.trace_mb, seed=args.seed),
+        faults=FaultConfig(args.latency / 1000, args.jitter / 1000, args.error_rate, args.forbidden_rate, seed=args.seed),
+        growth_interval=args.growth_interval
+    ).start()
+    os.environ["EPITECH_API_BASE_URL"] = server.url
+
+    # Fichiers du bot (historique, index, délais...) créés dans un répertoire temporaire
+    workdir = tempfile.mkdtemp(prefix="moulicord_load_")
+    os.chdir(workdir)
+    from epitech_api import EpitechAPI
+    from logs_commands import LogsCommands
+    from prefetch import details_prefetcher, history_prefetcher
+    from slash_commands import MouliCordSlashCommands
+
+    cog = MouliCordSlashCommands(FakeBot(), EpitechAPI(synthetic.make_token(), "results_history.json"))
+    logs_cog = LogsCommands(FakeBot(), cog)
+    print(f"🧪 API simulée sur {server.url} • {args.concurrency} workers • {args.duration:.0f}s • fichiers dans {workdir}")
+    if args.warmup:
+        cog.epitech_api.get_new_results()
+    server.reset_stats()
+
+    start = time.perf_counter()
+    samples = await run_load(cog, logs_cog, _parse_mix(args.mix), args.concurrency, args.duration, args.seed,
+                             args.think_time / 1000)
+    wall = time.perf_counter() - start
+    server.stop()
+
+    report = build_report(samples, wall, server.stats())
+    report["prefetch"] = {"details": details_prefetcher.stats(), "history": history_prefetcher.stats()}
+    report["config"] = vars(args)
+    print_report(report)
+    if args.output:
+        output = os.path.join(ROOT_DIR, args.output) if not os.path.isabs(args.output) else args.output
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRapport enregistré dans {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de MouliCord contre l'API Epitech simulée")
+    parser.add_argument("--concurrency", type=int, default=8, help="Nombre d'utilisateurs simultanés")
+    parser.add_argument("--duration", type=float, default=20.0, help="Durée du test (s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Poids des scénarios (nom=poids,...)")
+    parser.add_argument("--projects", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=10, help="Passages par projet")
+    parser.add_argument("--trace-mb", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, default=80.0, help="Latence de l'API simulée (ms)")
+    parser.add_argument("--jitter", type=float, default=20.0, help="Gigue de latence (± ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--forbidden-rate", type=float, default=0.0)
+    parser.add_argument("--think-time", type=float, default=0.0, help="Temps de lecture moyen d'un menu avant sélection (ms)")
+    parser.add_argument("--growth-interval", type=float, help="Nouveaux passages toutes les N secondes")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false", help="Ne pas initialiser l'historique avant le test")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
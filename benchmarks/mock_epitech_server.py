@@ -0,0 +1,282 @@
+"""
+Serveur local imitant l'API Epitech (api.epitest.eu) pour les tests hors ligne
+
+Routes servies (données synthétiques, voir synthetic.py):
+- GET /me/{year}                      dernier passage de chaque projet
+- GET /me/{year}/{module}/{project}   historique complet d'un projet
+- GET /me/details/{id}                détails d'un passage (tests et trace)
+- GET /_stats                         compteurs d'appels par route et statut (JSON)
+
+Injection de fautes: latence (+ gigue), erreurs 500, 403 aléatoires ou après
+un délai (expiration du token simulée). Croissance: de nouveaux passages
+apparaissent périodiquement.
+
+Usage:
+    python benchmarks/mock_epitech_server.py --port 8765 --latency 120 --error-rate 0.02
+    EPITECH_API_BASE_URL=http://127.0.0.1:8765 python bot.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+
+
+class MockDataset:
+    """Passages synthétiques indexés par projet et par identifiant, avec croissance"""
+
+    def __init__(self, project_count: int = 40, runs_per_project: int = 10, trace_mb: float = 0.5, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.trace_mb = trace_mb
+        self.project_count = project_count
+        self.runs: Dict[str, List[Dict]] = {}
+        self.by_id: Dict[int, Dict] = {}
+        self._details: Dict[int, bytes] = {}
+        self._next_id = 3_000_000
+        self._lock = threading.Lock()
+        start = synthetic.BASE_DATE
+        for index in range(project_count):
+            for run in range(runs_per_project):
+                self._add_run(index, start + timedelta(hours=index + 24 * run))
+
+    @staticmethod
+    def project_id(result: Dict) -> str:
+        project = result["project"]
+        return f"{project['module']['code']}/{project['slug']}"
+
+    def _add_run(self, project_index: int, date: datetime) -> Dict:
+        result = synthetic.make_result(self.rng, project_index, self._next_id, date)
+        self._next_id += 1
+        self.runs.setdefault(self.project_id(result), []).append(result)
+        self.by_id[result["results"]["testRunId"]] = result
+        return result
+
+    def grow(self, count: int = 1) -> List[Dict]:
+        """Ajoute `count` nouveaux passages datés de maintenant"""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            return [self._add_run(self.rng.randrange(self.project_count), now) for _ in range(count)]
+
+    def latest(self) -> List[Dict]:
+        with self._lock:
+            return [runs[-1] for runs in self.runs.values()]
+
+    def history(self, project_id: str) -> Optional[List[Dict]]:
+        with self._lock:
+            runs = self.runs.get(project_id)
+            return list(runs) if runs is not None else None
+
+    def details(self, run_id: int) -> Optional[bytes]:
+        """Réponse /me/details/{id} sérialisée (générée une fois par passage)"""
+        with self._lock:
+            result = self.by_id.get(run_id)
+            cached = self._details.get(run_id)
+        if result is None:
+            return None
+        if cached is None:
+            cached = json.dumps(synthetic.make_details(result, trace_mb=self.trace_mb, seed=run_id)).encode()
+            with self._lock:
+                self._details[run_id] = cached
+        return cached
+
+
+class FaultConfig:
+    """Paramètres d'injection de fautes (modifiables pendant l'exécution)"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 forbidden_rate: float = 0.0, forbidden_after: Optional[float] = None, seed: int = 7,
+                 throttle_rate: float = 0.0, retry_after: float = 5.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.forbidden_rate = forbidden_rate
+        self.forbidden_after = forbidden_after
+        # Réponses 429 avec l'en-tête Retry-After (secondes)
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        # Tokens expirés: toutes leurs requêtes reçoivent un 401 (voir expire)
+        self.expired_tokens = set()
+        self.rng = random.Random(seed)
+
+    def expire(self, token: str):
+        """Simule l'expiration d'un token (les autres tokens restent acceptés)"""
+        self.expired_tokens.add(token)
+
+    def delay(self) -> float:
+        return max(0.0, self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0))
+
+    def status(self, uptime: float) -> Optional[int]:
+        """Statut d'erreur à injecter (None si la requête doit réussir)"""
+        if self.forbidden_after is not None and uptime >= self.forbidden_after:
+            return 403
+        draw = self.rng.random()
+        if draw < self.forbidden_rate:
+            return 403
+        if draw < self.forbidden_rate + self.error_rate:
+            return 500
+        if draw < self.forbidden_rate + self.error_rate + self.throttle_rate:
+            return 429
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_MockHTTPServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self) -> Tuple[str, Optional[bytes]]:
+        """Retourne (modèle de route, corps JSON ou None si introuvable)"""
+        dataset = self.server.mock.dataset
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if len(parts) == 3 and parts[:2] == ["me", "details"] and parts[2].isdigit():
+            return "/me/details/{id}", dataset.details(int(parts[2]))
+        if len(parts) == 2 and parts[0] == "me":
+            return "/me/{year}", json.dumps(dataset.latest()).encode()
+        if len(parts) == 4 and parts[0] == "me":
+            history = dataset.history(f"{parts[2]}/{parts[3]}")
+            return "/me/{year}/{module}/{project}", json.dumps(history).encode() if history is not None else None
+        return "inconnue", None
+
+    def do_GET(self):
+        mock = self.server.mock
+        if self.path == "/_stats":
+            self._send(200, json.dumps(mock.stats()).encode())
+            return
+
+        endpoint, body = self._route()
+        time.sleep(mock.faults.delay())
+        authorization = self.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer ") or authorization[7:] in mock.faults.expired_tokens:
+            status = 401
+        else:
+            status = mock.faults.status(time.monotonic() - mock.started_at) or (200 if body is not None else 404)
+        mock.count(endpoint, status)
+        if status == 200:
+            self._send(200, body)
+        else:
+            headers = {"Retry-After": f"{mock.faults.retry_after:g}"} if status == 429 else None
+            self._send(status, json.dumps({"message": f"Erreur simulée {status}"}).encode(), headers)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockEpitechServer"
+
+
+class MockEpitechServer:
+    """
+    Serveur HTTP imitant l'API Epitech, exécuté dans un thread
+
+    Utilisable depuis un script (start/stop) ou en ligne de commande.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, dataset: Optional[MockDataset] = None,
+                 faults: Optional[FaultConfig] = None, growth_interval: Optional[float] = None, growth_runs: int = 1):
+        self.dataset = dataset or MockDataset()
+        self.faults = faults or FaultConfig()
+        self.growth_interval = growth_interval
+        self.growth_runs = growth_runs
+        self.started_at = time.monotonic()
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._counts_lock = threading.Lock()
+        self._httpd = _MockHTTPServer((host, port), _Handler)
+        self._httpd.mock = self
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, endpoint: str, status: int):
+        with self._counts_lock:
+            self._counts[(endpoint, status)] = self._counts.get((endpoint, status), 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Appels reçus: route -> statut -> nombre"""
+        with self._counts_lock:
+            result: Dict[str, Dict[str, int]] = {}
+            for (endpoint, status), count in self._counts.items():
+                result.setdefault(endpoint, {})[str(status)] = count
+            return result
+
+    def reset_stats(self):
+        with self._counts_lock:
+            self._counts.clear()
+
+    def _grow(self):
+        while not self._stopped.wait(self.growth_interval):
+            self.dataset.grow(self.growth_runs)
+
+    def start(self) -> "MockEpitechServer":
+        self.started_at = time.monotonic()
+        self._threads.append(threading.Thread(target=self._httpd.serve_forever, name="mock-epitech", daemon=True))
+        if self.growth_interval:
+            self._threads.append(threading.Thread(target=self._grow, name="mock-epitech-growth", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local imitant l'API Epitech")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--projects", type=int, default=40, help="Nombre de projets")
+    parser.add_argument("--runs", type=int, default=10, help="Passages initiaux par projet")
+    parser.add_argument("--trace-mb", type=float, default=0.5, help="Taille des traces trace-pool en Mo")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence ajoutée par requête (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Gigue de latence (± ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Proportion de réponses 500")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="Proportion de réponses 403")
+    parser.add_argument("--forbidden-after", type=float, help="Toutes les réponses en 403 après N secondes")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Proportion de réponses 429")
+    parser.add_argument("--retry-after", type=float, default=5.0, help="En-tête Retry-After des réponses 429 (s)")
+    parser.add_argument("--growth-interval", type=float, help="Ajoute des passages toutes les N secondes")
+    parser.add_argument("--growth-runs", type=int, default=1, help="Passages ajoutés à chaque croissance")
+    args = parser.parse_args()
+
+    server = MockEpitechServer(
+        args.host, args.port,
+        dataset=MockDataset(args.projects, args.runs, args.trace_mb),
+        faults=FaultConfig(args.latency / 1000, args.jitter / 1000, args.error_rate,
+                           args.forbidden_rate, args.forbidden_after,
+                           throttle_rate=args.throttle_rate, retry_after=args.retry_after),
+        growth_interval=args.growth_interval, growth_runs=args.growth_runs
+    ).start()
+    print(f"🧪 API Epitech simulée sur {server.url} (EPITECH_API_BASE_URL={server.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+        print("\n📊 Appels reçus:", json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Rejeu d'une capture de trafic (EPITECH_API_CAPTURE) contre la version courante du code
+
+Chaque requête enregistrée est réémise à son instant d'origine (divisé par --speed)
+via la méthode d'EpitechAPI correspondante; les réponses viennent de l'archive avec
+leur latence d'origine. Le rapport donne le débit, la latence par route et le retard
+pris sur le calendrier d'origine, et peut être comparé à un rapport précédent.
+
+Usage:
+    EPITECH_API_CAPTURE=capture.jsonl.gz python bot.py         # capture d'une journée
+    python benchmarks/replay_traffic.py capture.jsonl.gz --speed 60 --output avant.json
+    python benchmarks/replay_traffic.py capture.jsonl.gz --speed 60 --compare avant.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+import api_capture  # noqa: E402
+from metrics import percentile  # noqa: E402
+
+
+def _call(api, entry: Dict):
+    """Réémet une requête capturée via la méthode publique qui l'avait produite"""
+    parts = [part for part in entry["path"].split("/") if part]
+    if entry["endpoint"] == "/me/details/{id}":
+        return api.get_detailed_results(int(parts[2]))
+    if entry["endpoint"] == "/me/{year}/{module}/{project}":
+        return api.get_project_history(f"{parts[2]}/{parts[3]}", int(parts[1]))
+    return api.get_moulinette_results(int(parts[1]))
+
+
+async def replay(api, entries: List[Dict], speed: float) -> Dict[str, List]:
+    """Rejoue les requêtes selon leur calendrier; retourne {route: [(durée, retard)]}"""
+    samples: Dict[str, List] = {}
+    origin = entries[0]["t"] if entries else 0.0
+    start = time.perf_counter()
+
+    async def _one(entry: Dict):
+        scheduled = (entry["t"] - origin) / speed
+        await asyncio.sleep(max(0.0, scheduled - (time.perf_counter() - start)))
+        issued = time.perf_counter()
+        await asyncio.to_thread(_call, api, entry)
+        samples.setdefault(entry["endpoint"], []).append((time.perf_counter() - issued, issued - start - scheduled))
+
+    await asyncio.gather(*(_one(entry) for entry in entries))
+    return samples
+
+
+def build_report(samples: Dict[str, List], wall: float, replay: "api_capture.UpstreamReplay") -> Dict:
+    endpoints = {}
+    for endpoint, values in samples.items():
+        durations = [duration for duration, _ in values]
+        endpoints[endpoint] = {
+            "count": len(values),
+            "p50": percentile(durations, 0.50),
+            "p95": percentile(durations, 0.95),
+            "p99": percentile(durations, 0.99),
+            "max_lag": max(lag for _, lag in values)
+        }
+    total = sum(endpoint["count"] for endpoint in endpoints.values())
+    return {
+        "wall_seconds": wall,
+        "requests": total,
+        "throughput": total / wall if wall else 0.0,
+        "served": replay.served,
+        "missing": replay.missing,
+        "endpoints": endpoints
+    }
+
+
+def print_report(report: Dict, baseline: Dict = None):
+    print(f"\n{'Route':<32} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'retard max':>11}")
+    for endpoint, stats in sorted(report["endpoints"].items()):
+        line = f"{endpoint:<32} {stats['count']:>6}" + "".join(
+            f" {stats[key] * 1000:>7.0f}ms" for key in ("p50", "p95", "p99")) + f" {stats['max_lag'] * 1000:>9.0f}ms"
+        before = (baseline or {}).get("endpoints", {}).get(endpoint)
+        if before and before["p95"]:
+            line += f"  (p95 {(stats['p95'] - before['p95']) / before['p95']:+.1%})"
+        print(line)
+    print(f"\n⚡ {report['requests']} requêtes en {report['wall_seconds']:.1f}s ({report['throughput']:.2f} req/s)"
+          f" • {report['missing']} absentes de la capture")
+    if baseline:
+        print(f"   Référence: {baseline['requests']} requêtes, {baseline['throughput']:.2f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue une capture de trafic vers l'API Epitech")
+    parser.add_argument("archive", help="Archive produite avec EPITECH_API_CAPTURE")
+    parser.add_argument("--speed", type=float, default=1.0, help="Accélération (1 = temps réel, 60 = une heure par minute)")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    parser.add_argument("--compare", help="Rapport JSON de référence")
+    args = parser.parse_args()
+
+    archive = os.path.abspath(args.archive)
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    api_capture.upstream_capture = None
+    api_capture.upstream_replay = replay_source = api_capture.UpstreamReplay(archive, args.speed)
+    entries = replay_source.entries
+    span = entries[-1]["t"] - entries[0]["t"] if entries else 0.0
+    print(f"🔁 {len(entries)} requêtes capturées sur {span:.0f}s, rejeu x{args.speed:g} (~{span / args.speed:.0f}s)")
+
+    # Historique local du rejeu dans un répertoire temporaire
+    os.chdir(tempfile.mkdtemp(prefix="moulicord_replay_"))
+    from epitech_api import EpitechAPI
+    api = EpitechAPI(synthetic.make_token(), "results_history.json")
+
+    start = time.perf_counter()
+    samples = asyncio.run(replay(api, entries, args.speed))
+    report = build_report(samples, time.perf_counter() - start, replay_source)
+    report["config"] = {"archive": archive, "speed": args.speed}
+
+    print_report(report, baseline)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRapport enregistré dans {output}")
+
+
+if __name__ == "__main__":
+    main()
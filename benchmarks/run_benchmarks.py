@@ -0,0 +1,290 @@
+"""
+Suite de benchmarks du chemin de données (données synthétiques, aucune connexion)
+
+Couvre get_new_results, _load_storage/_save_storage, format_project_summary,
+format_detailed_summary, _extract_failed_task_output, le calcul de /stats,
+render_pdf et get_token_info. Les résultats sont écrits en JSON pour
+comparer deux versions.
+
+L'autocomplétion de /history (project_index.search) doit répondre en moins de
+AUTOCOMPLETE_BUDGET sur PROJECT_INDEX_SIZE projets.
+
+Le démarrage (import de bot.py, puis chargement des extensions de commandes) est
+mesuré dans un interpréteur neuf et doit tenir dans STARTUP_BUDGETS, sans importer
+les dépendances lourdes (Selenium, ReportLab, PyArrow).
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # tailles 1k et 10k
+    python benchmarks/run_benchmarks.py --sizes 1000,10000,100000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/avant.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from epitech_api import EpitechAPI  # noqa: E402
+from export_worker import iter_export_rows, render_pdf  # noqa: E402
+from project_index import ProjectIndex  # noqa: E402
+from run_store import run_store  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Budgets de démarrage (secondes, médiane): import de bot.py et prêt à servir les commandes
+STARTUP_BUDGETS = {"startup.import": 0.5, "startup.ready": 0.7}
+LAZY_MODULES = ("selenium", "reportlab", "pyarrow")
+# Autocomplétion de /history projet: (secondes, médiane) sur un index de PROJECT_INDEX_SIZE projets
+AUTOCOMPLETE_BUDGET = 0.005
+PROJECT_INDEX_SIZE = 5000
+AUTOCOMPLETE_QUERIES = {"empty": "", "prefix": "G-CPE", "words": "sokoban 1", "fuzzy": "sknb12", "none": "zzzz"}
+
+_STARTUP_SCRIPT = """
+import asyncio, contextlib, io, json, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import bot
+    imported = time.perf_counter()
+    asyncio.run(bot._load_extensions())
+ready = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "ready": ready - start,
+    "commands": len(bot.bot.tree.get_commands()),
+    "heavy": sorted({name.split(".")[0] for name in sys.modules} & set(%r))
+}))
+""" % (LAZY_MODULES,)
+
+
+class OfflineAPI(EpitechAPI):
+    """EpitechAPI dont la réponse /me/{year} est fournie par le générateur synthétique"""
+
+    def __init__(self, bearer_token: str, storage_file: str, current_results: List[Dict]):
+        super().__init__(bearer_token, storage_file)
+        self.current_results = current_results
+
+    def get_moulinette_results(self, year: int = 2025) -> List[Dict]:
+        return self.current_results
+
+
+def measure(function: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """Exécute `function` `repeat` fois (après `setup`, non mesuré) et retourne les durées"""
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations)
+    }
+
+
+def measure_startup(repeat: int) -> Dict[str, Dict]:
+    """Mesure l'import de bot.py et le chargement des extensions dans des interpréteurs neufs"""
+    samples: Dict[str, List[float]] = {"startup.import": [], "startup.ready": []}
+    heavy: set = set()
+    workdir = tempfile.mkdtemp(prefix="moulicord_startup_")
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR, DISCORD_BOT_TOKEN="benchmark", CHANNEL_ID="1")
+    try:
+        for _ in range(repeat):
+            output = subprocess.check_output([sys.executable, "-c", _STARTUP_SCRIPT], cwd=workdir, env=env, text=True)
+            result = json.loads(output.strip().splitlines()[-1])
+            samples["startup.import"].append(result["import"])
+            samples["startup.ready"].append(result["ready"])
+            heavy.update(result["heavy"])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    cases = {}
+    for name, durations in samples.items():
+        cases[name] = {
+            "repeat": repeat,
+            "min": min(durations),
+            "median": statistics.median(durations),
+            "mean": statistics.fmean(durations),
+            "budget": STARTUP_BUDGETS[name],
+            "heavy_modules": sorted(heavy)
+        }
+        print(f"{name:<45} médiane {cases[name]['median'] * 1000:>10.2f} ms (budget {STARTUP_BUDGETS[name] * 1000:.0f} ms)")
+    return cases
+
+
+def check_budgets(cases: Dict[str, Dict]) -> List[str]:
+    """Retourne les dépassements de budget (démarrage, autocomplétion)"""
+    failures = []
+    for name, stats in cases.items():
+        budget = stats.get("budget")
+        if budget is None:
+            continue
+        if stats["median"] > budget:
+            failures.append(f"{name}: {stats['median'] * 1000:.2f} ms > budget {budget * 1000:.0f} ms")
+        if stats.get("heavy_modules"):
+            failures.append(f"{name}: dépendances lourdes importées au démarrage ({', '.join(stats['heavy_modules'])})")
+    return sorted(set(failures))
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnu"
+
+
+def run_suite(sizes: List[int], repeat: int, trace_sizes: List[float]) -> Dict[str, Dict]:
+    """Exécute tous les cas et retourne {nom du cas: mesures}"""
+    # Import différé: le cog charge discord.py
+    from logs_commands import LogsMoulinetteSelect
+    from slash_commands import MouliCordSlashCommands
+    import trace_parser
+
+    workdir = tempfile.mkdtemp(prefix="moulicord_bench_")
+    cases: Dict[str, Dict] = {}
+    token = synthetic.make_token()
+
+    def run(name: str, function: Callable, setup: Optional[Callable] = None, repeat_count: Optional[int] = None):
+        cases[name] = measure(function, repeat_count or repeat, setup)
+        print(f"{name:<45} médiane {cases[name]['median'] * 1000:>10.2f} ms")
+
+    try:
+        current_results = synthetic.make_results(40)
+        cog_api = OfflineAPI(token, os.path.join(workdir, "cog.json"), current_results)
+        cog = MouliCordSlashCommands(None, cog_api)
+        logs_select = LogsMoulinetteSelect(cog_api, run_store.put_many(current_results))
+
+        for size in sizes:
+            storage_file = os.path.join(workdir, f"history_{size}.json")
+            template_file = storage_file + ".template"
+            storage = synthetic.make_storage(size)
+            with open(template_file, 'w', encoding='utf-8') as f:
+                json.dump(storage, f, indent=2, ensure_ascii=False)
+            shutil.copyfile(template_file, storage_file)
+
+            api = OfflineAPI(token, storage_file, current_results)
+            run(f"storage.load[{size}]", api._load_storage)
+            run(f"storage.save[{size}]", lambda: api._save_storage(storage))
+            run(f"get_new_results[{size}]", api.get_new_results,
+                setup=lambda: shutil.copyfile(template_file, storage_file))
+            run(f"stats.compute[{size}]", lambda: cog._compute_stats(storage["results"]))
+            if size <= 10000:
+                rows = list(iter_export_rows(storage["results"]))
+                run(f"pdf_report[{size}]", lambda: render_pdf(rows, io.BytesIO()), repeat_count=max(1, repeat // 3))
+
+        api = cog_api
+        run("format_project_summary[40]", lambda: [api.format_project_summary(result) for result in current_results])
+        run("get_token_info", api.get_token_info, repeat_count=repeat * 100)
+
+        for trace_mb in trace_sizes:
+            details = synthetic.make_details(current_results[0], trace_mb=trace_mb)
+            trace = details["externalItems"][-1]["comment"]
+            run(f"format_detailed_summary[{trace_mb}MB]", lambda: api.format_detailed_summary(details))
+            run(f"extract_failed_task_output.cold[{trace_mb}MB]",
+                lambda: logs_select._extract_failed_task_output(trace, "task03"))
+            trace_parser.trace_index_cache.get("bench", trace)
+            run(f"extract_failed_task_output.cached[{trace_mb}MB]",
+                lambda: logs_select._extract_failed_task_output(trace, "task03", "bench"))
+
+        projects = synthetic.make_results(PROJECT_INDEX_SIZE)
+        run(f"project_index.observe[{PROJECT_INDEX_SIZE}]", lambda: ProjectIndex().observe(projects))
+        index = ProjectIndex()
+        index.observe(projects)
+        for label, query in AUTOCOMPLETE_QUERIES.items():
+            name = f"project_index.search.{label}[{PROJECT_INDEX_SIZE}]"
+            run(name, lambda: index.search(query, 25), repeat_count=repeat * 20)
+            cases[name]["budget"] = AUTOCOMPLETE_BUDGET
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return cases
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> int:
+    """Affiche l'écart de médiane par cas; retourne le nombre de régressions au-delà du seuil"""
+    regressions = 0
+    print(f"\nComparaison avec {baseline['meta']['revision']} ({baseline['meta']['date']})")
+    for name, stats in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if not before:
+            print(f"{name:<45} (nouveau)")
+            continue
+        delta = (stats["median"] - before["median"]) / before["median"] if before["median"] else 0.0
+        flag = ""
+        if delta > threshold:
+            flag = "  ⚠️ régression"
+            regressions += 1
+        print(f"{name:<45} {before['median'] * 1000:>10.2f} → {stats['median'] * 1000:>10.2f} ms ({delta:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du chemin de données de MouliCord")
+    parser.add_argument("--sizes", default="1000,10000", help="Tailles d'historique (ex: 1000,10000,100000)")
+    parser.add_argument("--traces", default="2,8", help="Tailles des traces trace-pool en Mo")
+    parser.add_argument("--repeat", type=int, default=5, help="Répétitions par cas")
+    parser.add_argument("--output", help="Fichier JSON de sortie (défaut: benchmarks/results/<date>_<révision>.json)")
+    parser.add_argument("--compare", help="Fichier JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Seuil de régression (0.2 = +20%%)")
+    parser.add_argument("--skip-startup", action="store_true", help="Ne pas mesurer le démarrage du bot")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    trace_sizes = [float(size) for size in args.traces.split(",") if size]
+    revision = _git_revision()
+    results = {
+        "meta": {
+            "revision": revision,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "traces_mb": trace_sizes,
+            "repeat": args.repeat
+        },
+        "cases": run_suite(sizes, args.repeat, trace_sizes)
+    }
+    if not args.skip_startup:
+        results["cases"].update(measure_startup(args.repeat))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nRésultats enregistrés dans {output}")
+
+    failed = False
+    budget_failures = check_budgets(results["cases"])
+    if budget_failures:
+        print("\n❌ Budget dépassé:")
+        for failure in budget_failures:
+            print(f"   • {failure}")
+        failed = True
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
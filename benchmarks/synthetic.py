@@ -0,0 +1,149 @@
+"""
+Générateur de données synthétiques reproductibles (graine fixe)
+
+Produit des charges au format de l'API Epitech:
+- résultats /me/{year} (un passage par projet)
+- historiques de 1k à 100k passages (fichier results_history.json)
+- détails /me/details/{id} avec une trace `trace-pool` de plusieurs Mo
+- tokens JWT (non signés) pour get_token_info
+"""
+import base64
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+MODULES = ["G-CPE-100", "G-CPE-110", "G-PSU-100", "G-MUL-100", "G-AIA-200", "G-SEC-210", "G-DOP-400"]
+PROJECT_WORDS = ["pool", "day", "mini", "shell", "printf", "lib", "my", "ls", "top", "radar",
+                 "sokoban", "bsq", "navy", "matchstick", "corewar", "hunter", "runner", "paint"]
+ANSI_COLORS = ["\x1b[31m", "\x1b[32m", "\x1b[33m", "\x1b[1m", "\x1b[0m"]
+BASE_DATE = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+def _project(rng: random.Random, index: int) -> Dict:
+    """Projet synthétique (nom, slug et module stables pour un index donné)"""
+    slug = f"{PROJECT_WORDS[index % len(PROJECT_WORDS)]}{index // len(PROJECT_WORDS):02d}"
+    return {
+        "name": f"{slug.capitalize()} {index}",
+        "slug": slug,
+        "module": {"code": MODULES[index % len(MODULES)]}
+    }
+
+
+def _skills(rng: random.Random, task_count: int) -> Dict[str, Dict]:
+    """Compétences (tâches) avec compteurs cohérents"""
+    skills = {}
+    for task in range(task_count):
+        count = rng.randint(1, 15)
+        passed = count if rng.random() < 0.5 else rng.randint(0, count)
+        skills[f"task{task:02d}"] = {
+            "count": count,
+            "passed": passed,
+            "crashed": rng.randint(0, count - passed) if passed < count and rng.random() < 0.3 else 0,
+            "mandatoryFailed": 1 if passed < count and rng.random() < 0.1 else 0
+        }
+    return skills
+
+
+def make_result(rng: random.Random, project_index: int, run_id: int, date: datetime) -> Dict:
+    """Un passage au format /me/{year}"""
+    return {
+        "date": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "project": _project(rng, project_index),
+        "results": {
+            "testRunId": run_id,
+            "logins": ["student@epitech.eu"],
+            "prerequisites": 2,
+            "mandatoryFailed": 0,
+            "skills": _skills(rng, rng.randint(3, 14)),
+            "externalItems": [
+                {"type": "lint.major", "value": rng.randint(0, 5)},
+                {"type": "lint.minor", "value": rng.randint(0, 20)},
+                {"type": "lint.info", "value": rng.randint(0, 10)}
+            ]
+        }
+    }
+
+
+def make_results(project_count: int = 40, seed: int = 42) -> List[Dict]:
+    """Réponse /me/{year}: dernier passage de chaque projet"""
+    rng = random.Random(seed)
+    return [
+        make_result(rng, index, 1_000_000 + index, BASE_DATE + timedelta(hours=rng.randint(0, 24 * 120)))
+        for index in range(project_count)
+    ]
+
+
+def make_history(run_count: int, project_count: int = 200, seed: int = 42) -> List[Dict]:
+    """Historique de `run_count` passages répartis sur `project_count` projets"""
+    rng = random.Random(seed)
+    return [
+        make_result(rng, rng.randrange(project_count), 2_000_000 + run_id, BASE_DATE + timedelta(minutes=7 * run_id))
+        for run_id in range(run_count)
+    ]
+
+
+def make_storage(run_count: int, seed: int = 42) -> Dict:
+    """Contenu d'un fichier results_history.json"""
+    return {
+        "last_update": BASE_DATE.isoformat(),
+        "results": make_history(run_count, seed=seed),
+        "metadata": {"version": "1.0", "description": "Historique des résultats de moulinette Epitech"}
+    }
+
+
+def make_trace(size_mb: float, task_count: int = 12, seed: int = 42) -> str:
+    """Trace `trace-pool` avec codes ANSI, sections de tâches et échecs"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    chunks: List[str] = []
+    size = 0
+    task = 0
+    while size < target:
+        lines = [f"==================== task{task % task_count:02d} ====================",
+                 "# Building...", "# Checking for forbidden functions...", "# Executing all tests..."]
+        for test in range(rng.randint(20, 80)):
+            color = rng.choice(ANSI_COLORS)
+            if rng.random() < 0.05:
+                lines.append(f"{color}test_{task}_{test}: FAILURE\x1b[0m expected {rng.randint(0, 99)} got {rng.randint(0, 99)}")
+            else:
+                lines.append(f"{color}test_{task}_{test}: OK\x1b[0m ({rng.random():.3f}s)")
+        chunk = "\n".join(lines) + "\n"
+        chunks.append(chunk)
+        size += len(chunk)
+        task += 1
+    return "".join(chunks)
+
+
+def make_details(result: Dict, trace_mb: float = 2.0, seed: int = 42) -> Dict:
+    """Réponse /me/details/{id} pour un passage, avec tests individuels et trace"""
+    rng = random.Random(seed)
+    skills = {}
+    for name, skill in result["results"]["skills"].items():
+        tests = [
+            {"name": f"{name}_test{i:02d}", "passed": i < skill["passed"], "crashed": False,
+             "output": "" if i < skill["passed"] else f"Expected {rng.randint(0, 9)}, got {rng.randint(0, 9)}"}
+            for i in range(skill["count"])
+        ]
+        skills[name] = dict(skill, tests=tests)
+    return {
+        "date": result["date"],
+        "project": result["project"],
+        "results": dict(result["results"], skills=skills),
+        "externalItems": result["results"]["externalItems"] + [
+            {"type": "trace-pool", "comment": make_trace(trace_mb, seed=seed)}
+        ]
+    }
+
+
+def make_token(expires_in: int = 3600, issued_at: Optional[int] = None) -> str:
+    """Token JWT non signé (en-tête, payload, signature factice)"""
+    issued_at = int(time.time()) if issued_at is None else issued_at
+
+    def _encode(data: Dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    header = _encode({"alg": "RS256", "typ": "JWT"})
+    payload = _encode({"sub": "student@epitech.eu", "iat": issued_at, "exp": issued_at + expires_in})
+    return f"{header}.{payload}.c2lnbmF0dXJl"
@@ -0,0 +1,85 @@
+"""
+Mémoire retenue par les vues Discord ouvertes simultanément (/history et /logs)
+
+Chaque invocation simulée décode sa propre réponse JSON (comme get_project_history
+et get_moulinette_results), puis construit la vue comme le fait la commande. Les
+vues restent ouvertes jusqu'à la mesure (tracemalloc), comme pendant leurs 5
+minutes de timeout; le rapport donne la mémoire retenue au total et par vue.
+
+Usage:
+    python benchmarks/view_memory.py --views 200 --runs 60
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+
+
+def _history_payload(runs: int) -> str:
+    """Réponse /me/{year}/{module}/{project}: `runs` passages d'un même projet"""
+    return json.dumps(synthetic.make_history(runs, project_count=1))
+
+
+async def measure(kind: str, views: int, runs: int) -> dict:
+    from epitech_api import EpitechAPI
+    from logs_commands import LogsSelectionView
+    from run_store import run_store as store
+    from slash_commands import HistoryView
+
+    # Magasin vierge pour chaque mesure
+    store._runs.clear()
+
+    api = EpitechAPI(synthetic.make_token(), os.devnull)
+    payload = _history_payload(runs) if kind == "history" else json.dumps(synthetic.make_results(40))
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    opened = []
+    for _ in range(views):
+        results = json.loads(payload)
+        if kind == "history":
+            opened.append(HistoryView(api, "G-CPE-100/pool00", store.put_many(results)))
+        else:
+            results.sort(key=lambda x: x.get("date", ""), reverse=True)
+            opened.append(LogsSelectionView(api, store.put_many(results[:25])))
+        del results
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return {"views": len(opened), "runs": runs if kind == "history" else 25, "retained_bytes": retained,
+            "per_view_bytes": retained / len(opened), "stored_runs": len(store)}
+
+
+async def main_async(args):
+    report = {}
+    for kind in ("history", "logs"):
+        report[kind] = await measure(kind, args.views, args.runs)
+        stats = report[kind]
+        print(f"{kind:<8} {stats['views']} vues × {stats['runs']} passages: "
+              f"{stats['retained_bytes'] / 1024 / 1024:.2f} Mo retenus, "
+              f"{stats['per_view_bytes'] / 1024:.1f} Ko par vue ({stats['stored_runs']} passages en magasin)")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire retenue par les vues /history et /logs ouvertes")
+    parser.add_argument("--views", type=int, default=200, help="Vues ouvertes simultanément")
+    parser.add_argument("--runs", type=int, default=60, help="Passages dans l'historique du projet")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
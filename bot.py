@@ -1,12 +1,31 @@
 import discord
 from discord.ext import commands, tasks
+import asyncio
 import os
 import time
 import json
 from datetime import datetime, timedelta, timezone
+from typing import Dict
 from dotenv import load_dotenv
+from circuit_breaker import upstream_breakers
+from command_sync import command_tree_sync
 from epitech_api import EpitechAPI
+from loop_watchdog import loop_watchdog
+from metrics import cache_hit_ratio, notification_latency, poll_duration, start_metrics_server
+from notify_tracker import notify_tracker
+from outcome_store import outcome_store
+from prefetch import history_prefetcher
+from project_index import project_id_of, project_index
+from render_cache import embed_cache
+from results_snapshot import results_snapshot
+from run_store import run_id_of
+from run_diff import format_diff, run_diff_store
+from search_index import trace_search_index
+from shared_token import shared_token
+from startup_pipeline import startup_pipeline
 from token_refresher import auto_refresh_token
+from trace_parser import trace_index_cache
+from tracing import traced
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -15,6 +34,14 @@ load_dotenv()
 current_token = None
 epitech_api = None
 
+# Serveur HTTP des métriques (démarré une seule fois)
+metrics_server = None
+
+# Indexation en arrière-plan des passages déjà ingérés (un passage par seconde, sauvegarde tous les 20)
+backfill_task = None
+BACKFILL_DELAY = 1.0
+BACKFILL_SAVE_EVERY = 20
+
 # --- Journalisation unifiée ---
 def _log_info(message: str):
     print(f"[INFO] {message}")
@@ -30,6 +57,14 @@ def _log_ok(message: str):
 
 def _propagate_api_to_cogs():
     """Propage l'instance EpitechAPI actualisée aux cogs (slash commands)."""
+    # Le renouvellement tourne dans un thread (shared_token): les cogs sont mis à jour sur la boucle d'événements
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        loop = getattr(bot, "loop", None)
+        if isinstance(loop, asyncio.AbstractEventLoop) and loop.is_running():
+            loop.call_soon_threadsafe(_propagate_api_to_cogs)
+            return
     try:
         from discord.ext import commands as _commands  # local import to avoid type checkers
         if bot:
@@ -40,6 +75,113 @@ def _propagate_api_to_cogs():
     except Exception as e:
         _log_warn(f"Impossible de propager l'API aux cogs: {e}")
 
+async def _record_run_diffs(new_results: list):
+    """Compare chaque nouveau passage au précédent du même projet (avant les notifications)"""
+    for result in sorted(new_results, key=lambda x: x.get("date", "")):
+        run_diff_store.record(result)
+    await run_diff_store.save_async()
+
+async def _ingest_new_results(new_results: list):
+    """Post-traitement des nouveaux résultats: indexation des traces et différences au niveau des tests"""
+    if not epitech_api or not new_results:
+        return
+    
+    indexed = 0
+    for result in new_results:
+        test_run_id = run_id_of(result)
+        if not test_run_id:
+            continue
+        # Requêtes, tokenisation des traces et écritures hors de la boucle d'événements
+        details = await asyncio.to_thread(epitech_api.get_detailed_results, test_run_id)
+        if not details:
+            continue
+        run_diff_store.enrich_with_details(result, details)
+        outcome_store.record(result, details)
+        if await trace_search_index.index_run_async(result, details):
+            indexed += 1
+    
+    await run_diff_store.save_async()
+    await asyncio.to_thread(outcome_store.save)
+    if indexed:
+        await asyncio.to_thread(trace_search_index.save)
+        _log_info(f"{indexed} passage(s) indexé(s) pour la recherche ({len(trace_search_index)} au total)")
+
+async def _backfill_search_index():
+    """Indexe en arrière-plan les passages déjà ingérés absents de l'index de recherche ou des résultats par test"""
+    pending = [result for result in results_snapshot.results or []
+               if run_id_of(result) is not None
+               and (run_id_of(result) not in trace_search_index or run_id_of(result) not in outcome_store)]
+    if not pending:
+        return
+    _log_info(f"Indexation en arrière-plan de {len(pending)} passage(s) déjà ingéré(s)…")
+    breaker = upstream_breakers.get("/me/details/{id}")
+    indexed = 0
+    for position, result in enumerate(pending, 1):
+        # API indisponible: la suite sera reprise après la prochaine vérification
+        if not epitech_api or breaker.is_open:
+            break
+        details = await asyncio.to_thread(epitech_api.get_detailed_results, run_id_of(result))
+        if details:
+            outcome_store.record(result, details)
+        if details and await trace_search_index.index_run_async(result, details):
+            indexed += 1
+        if position % BACKFILL_SAVE_EVERY == 0:
+            await asyncio.to_thread(trace_search_index.save)
+            await asyncio.to_thread(outcome_store.save)
+        await asyncio.sleep(BACKFILL_DELAY)
+    await asyncio.to_thread(trace_search_index.save)
+    await asyncio.to_thread(outcome_store.save)
+    _log_info(f"Indexation en arrière-plan: {indexed} passage(s) ajouté(s) ({len(trace_search_index)} au total)")
+
+def _schedule_search_backfill():
+    """Lance l'indexation en arrière-plan (une seule à la fois)"""
+    global backfill_task
+    if backfill_task is None or backfill_task.done():
+        backfill_task = asyncio.get_running_loop().create_task(_backfill_search_index())
+
+def _refresh_project_histories(new_results: list):
+    """Recharge en arrière-plan l'historique /history des projets qui viennent d'avoir un passage"""
+    project_ids = list(dict.fromkeys(filter(None, (project_id_of(result) for result in new_results))))
+    if epitech_api and project_ids:
+        history_prefetcher.schedule(project_ids, epitech_api.get_project_history, refresh=True)
+
+async def _start_metrics():
+    """Démarre l'endpoint /metrics et la surveillance de la boucle d'événements"""
+    global metrics_server
+    
+    cache_hit_ratio.set_function(lambda: embed_cache.hit_ratio, cache="render")
+    cache_hit_ratio.set_function(lambda: trace_index_cache.hit_ratio, cache="trace_index")
+    
+    loop_watchdog.start()
+    if metrics_server is None:
+        try:
+            metrics_server = await start_metrics_server()
+            if metrics_server:
+                host, port = metrics_server.sockets[0].getsockname()[:2]
+                _log_ok(f"Métriques exposées sur http://{host}:{port}/metrics")
+        except OSError as e:
+            _log_warn(f"Impossible de démarrer le serveur de métriques: {e}")
+
+def _poll_interval_label() -> str:
+    """Intervalle courant de la vérification automatique (label des mesures de délai)"""
+    seconds = int(check_new_results.hours * 3600 + check_new_results.minutes * 60 + check_new_results.seconds)
+    return f"{seconds}s"
+
+async def _notify_new_results(new_results: list, poll: dict):
+    """Envoie les notifications des nouveaux résultats (et retente les échecs précédents) en mesurant le délai de bout en bout"""
+    queue = notify_tracker.take_pending() + list(zip(notify_tracker.enqueue(poll, new_results), new_results))
+    if not queue:
+        return
+    for record, result in queue:
+        # La notification simple n'est envoyée qu'une fois: un nouvel essai ne renvoie que la détaillée
+        if not notify_tracker.simple_sent(record) and await moulibot.send_simple_notification(result):
+            notify_tracker.mark_simple_sent(record)
+        if await moulibot.send_moulinette_notification(result):
+            notify_tracker.complete(record)
+        else:
+            notify_tracker.fail(record, result)
+    notify_tracker.save()
+
 # (Gestion du topic supprimée)
 
 def get_fresh_token():
@@ -103,6 +245,7 @@ def get_fresh_token():
                     # Token valide, l'utiliser
                     current_token = clean_token
                     epitech_api = test_api
+                    shared_token.publish(clean_token)
                     
                     _log_ok("Nouveau token récupéré et validé (validité ~1h)")
                     # Propager immédiatement aux cogs pour que toutes les commandes utilisent le nouveau token
@@ -136,33 +279,43 @@ def get_fresh_token():
     _log_error("Échec définitif après 3 tentatives")
     return False
 
+def _refresh_token_for_clients():
+    """Renouvellement demandé via shared_token (un seul pour toutes les requêtes en attente, dans son thread)"""
+    return current_token if get_fresh_token() else None
+
+shared_token.set_refresher(_refresh_token_for_clients)
+
 def init_token_from_env():
     """(Désactivé) Toujours générer un token au démarrage; ne jamais lire depuis .env"""
     return False
 
-def ensure_valid_token():
-    """S'assure que le token est valide, le renouvelle si nécessaire"""
-    global current_token, epitech_api
-    
+def _token_needs_refresh() -> bool:
+    """Vrai s'il n'y a pas de token utilisable (absent, expiré ou illisible)"""
     # Toujours générer un token si aucun n'est disponible
     if not current_token or not epitech_api:
-        return get_fresh_token()
+        return True
     
     try:
         # Vérifier si le token actuel est encore valide
         token_info = epitech_api.get_token_info()
-        
-        if token_info.get("is_expired", True):
-            print("⏰ Token expiré (durée de vie: 1h), renouvellement automatique...")
-            return get_fresh_token()
-        
-        # Token valide
-        return True
-        
     except Exception as e:
         print(f"⚠️ Erreur lors de la vérification du token: {e}")
         print("🔄 Tentative de récupération d'un nouveau token...")
-        return get_fresh_token()
+        return True
+    
+    if token_info.get("is_expired", True):
+        print("⏰ Token expiré (durée de vie: 1h), renouvellement automatique...")
+        return True
+    return False
+
+def ensure_valid_token():
+    """S'assure que le token est valide, le renouvelle si nécessaire (bloquant: hors de la boucle d'événements)"""
+    # Coalescé avec un renouvellement déjà lancé par une commande
+    return not _token_needs_refresh() or shared_token.refresh(current_token) is not None
+
+async def ensure_valid_token_async():
+    """Comme ensure_valid_token, sans bloquer la boucle d'événements pendant le renouvellement"""
+    return not _token_needs_refresh() or await shared_token.refresh_async(current_token) is not None
 
 def validate_environment():
     """Valide que toutes les variables d'environnement nécessaires sont présentes"""
@@ -209,6 +362,7 @@ class InfoView(discord.ui.View):
         super().__init__(timeout=300)  # 5 minutes timeout
     
     @discord.ui.button(label="🏓 Ping", style=discord.ButtonStyle.secondary)
+    @traced("InfoView.ping_button")
     async def ping_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Bouton pour tester la latence"""
         await interaction.response.defer()
@@ -252,6 +406,7 @@ class InfoView(discord.ui.View):
         await interaction.followup.send(embed=embed, ephemeral=True)
     
     @discord.ui.button(label="📊 Status", style=discord.ButtonStyle.primary)
+    @traced("InfoView.status_button")
     async def status_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Bouton pour afficher le statut du système"""
         await interaction.response.defer()
@@ -259,7 +414,7 @@ class InfoView(discord.ui.View):
         try:
             # Vérifier l'état de l'API
             try:
-                results = epitech_api.get_moulinette_results(2025) if epitech_api else None
+                results = await asyncio.to_thread(epitech_api.get_moulinette_results, 2025) if epitech_api else None
                 api_status = "✅ Connectée et fonctionnelle"
                 
                 # Vérifier le token
@@ -355,8 +510,8 @@ class MouliCordBot:
         print("🚀 MouliCord v2.0 - Full Slash Commands Edition")
         print("🕒 Surveillance initialisée avec stockage JSON")
     
-    async def send_to_channel(self, message: str, embed: discord.Embed | None = None):
-        """Envoie un message dans le canal configuré"""
+    async def send_to_channel(self, message: str, embed: discord.Embed | None = None) -> bool:
+        """Envoie un message dans le canal configuré (False si le canal est introuvable)"""
         channel = bot.get_channel(channel_id)
         if channel and isinstance(channel, discord.TextChannel):
             if embed:
@@ -364,11 +519,12 @@ class MouliCordBot:
                 await channel.send(message, embed=embed, allowed_mentions=discord.AllowedMentions(everyone=True))
             else:
                 await channel.send(message, allowed_mentions=discord.AllowedMentions(everyone=True))
-        else:
-            print(f"Canal {channel_id} non trouvé ou non compatible")
+            return True
+        print(f"Canal {channel_id} non trouvé ou non compatible")
+        return False
     
-    async def send_simple_notification(self, result: dict):
-        """Envoie une notification simple avec nom du projet, heure et ping du rôle"""
+    async def send_simple_notification(self, result: dict) -> bool:
+        """Envoie une notification simple avec nom du projet, heure et ping du rôle (True si envoyée)"""
         try:
             # Extraire les informations du résultat
             project_name = result.get("project", {}).get("name", "Projet inconnu")
@@ -406,29 +562,36 @@ class MouliCordBot:
                 simple_channel_id = int(simple_channel_id)
             except ValueError:
                 print(f"❌ SIMPLE_NOTIFICATION_CHANNEL_ID invalide: {simple_channel_id}")
-                return
+                return False
                 
             channel = bot.get_channel(simple_channel_id)
             if channel and isinstance(channel, discord.TextChannel):
-                sent_message = await channel.send(message, embed=embed, allowed_mentions=discord.AllowedMentions(everyone=True))
-                
-                # Ajouter les réactions
-                await sent_message.add_reaction("✅")  # Coche pour "vu/réussi"
-                await sent_message.add_reaction("❌")  # Croix pour "échec/attention"
+                with notification_latency.time(kind="simple"):
+                    sent_message = await channel.send(message, embed=embed, allowed_mentions=discord.AllowedMentions(everyone=True))
+                    
+                    # Ajouter les réactions
+                    await sent_message.add_reaction("✅")  # Coche pour "vu/réussi"
+                    await sent_message.add_reaction("❌")  # Croix pour "échec/attention"
                 
                 print(f"📨 Notification simple avec embed et réactions envoyée dans le canal {simple_channel_id} pour: {project_name} à {time_str}")
-            else:
-                print(f"❌ Canal {simple_channel_id} non trouvé pour la notification simple")
+                return True
+            print(f"❌ Canal {simple_channel_id} non trouvé pour la notification simple")
+            return False
             
         except Exception as e:
             print(f"❌ Erreur lors de l'envoi de la notification simple: {e}")
+            return False
 
-    async def send_moulinette_notification(self, result: dict):
-        """Envoie une notification pour un nouveau résultat de moulinette"""
+    async def send_moulinette_notification(self, result: dict) -> bool:
+        """
+        Envoie la notification détaillée d'un nouveau résultat de moulinette
+        
+        La notification simple est envoyée séparément (une seule fois, voir _notify_new_results).
+        
+        Returns:
+            True si la notification détaillée a été envoyée (sinon elle sera retentée)
+        """
         try:
-            # Envoyer d'abord la notification simple
-            await self.send_simple_notification(result)
-            
             # Extraire les informations du résultat
             project_name = result.get("project", {}).get("name", "Projet inconnu")
             project_slug = result.get("project", {}).get("slug", "")
@@ -496,6 +659,15 @@ class MouliCordBot:
                     inline=True
                 )
             
+            # Ce qui a changé depuis le passage précédent du même projet
+            changes = format_diff(run_diff_store.get(test_run_id)) if test_run_id else ""
+            if changes:
+                embed.add_field(
+                    name="🔀 Changements",
+                    value=changes[:1024],
+                    inline=False
+                )
+            
             # Informations supplémentaires avec lien vers le projet
             if project_url:
                 embed.add_field(
@@ -515,119 +687,187 @@ class MouliCordBot:
             # Envoyer la notification détaillée avec @everyone pour les nouveaux résultats
             message = f"<@&1424827053508657252> 🚨 **NOUVEAU RÉSULTAT DE MOULINETTE !**"
             
-            await self.send_to_channel(message, embed)
-            print(f"📨 Notification détaillée envoyée pour: {project_name} ({percentage}%)")
+            with notification_latency.time(kind="detailed"):
+                sent = await self.send_to_channel(message, embed)
+            if sent:
+                print(f"📨 Notification détaillée envoyée pour: {project_name} ({percentage}%)")
+            return sent
             
         except Exception as e:
             print(f"❌ Erreur lors de l'envoi de la notification: {e}")
+            return False
 
 
 moulibot = MouliCordBot()
 
 
-@bot.event
-async def on_ready():
-    """Événement déclenché quand le bot est prêt"""
-    # Enregistrer le temps de démarrage pour l'uptime
+# Extensions de commandes, dans l'ordre de chargement (le cog principal d'abord)
+EXTENSIONS = ("slash_commands", "logs_commands", "export_commands")
+
+
+async def _load_extensions() -> Dict[str, float]:
+    """Charge les extensions de commandes et retourne la durée de chargement de chacune"""
+    durations = {}
+    for extension in EXTENSIONS:
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(extension)
+            durations[extension] = time.perf_counter() - start
+        except Exception as e:
+            _log_error(f"Erreur lors du chargement de {extension}: {e}")
+    if durations:
+        details = ", ".join(f"{name} {duration * 1000:.0f}ms" for name, duration in durations.items())
+        _log_ok(f"Commandes slash chargées ({details})")
+    return durations
+
+
+@startup_pipeline.phase("métriques")
+async def _startup_metrics():
     bot.start_time = time.time()
-    
-    _log_ok(f"Connecté à Discord en tant que {bot.user}")
-    _log_info(f"Canal configuré: {channel_id}")
-    
-    # Pas d'activité configurée
-    _log_info("Bot démarré sans activité personnalisée")
-    
-    # (Topic du salon désactivé)
-    
-    # Récupération automatique du token au démarrage
-    # Charger les Slash Commands d'abord
-    try:
-        await bot.load_extension('slash_commands')
-        _log_ok('Commandes slash chargées')
-    except Exception as e:
-        _log_error(f"Erreur lors du chargement des commandes slash: {e}")
-    
+    await _start_metrics()
+
+
+@startup_pipeline.phase("cache")
+async def _startup_cache():
+    """
+    Charge l'instantané local en mémoire: les commandes en lecture y répondent avant
+    le premier token, et il sert de point de comparaison des différences
+    """
+    # Journaux locaux lus hors de la boucle d'événements
+    await asyncio.to_thread(outcome_store.load)
+    await asyncio.to_thread(trace_search_index.load)
+    count = results_snapshot.load()
+    # Génération de données des rendus en cache = contenu de l'instantané
+    embed_cache.observe_results(results_snapshot.results)
+    run_diff_store.seed(results_snapshot.results)
+    project_index.observe(results_snapshot.results)
+    if count:
+        _log_info(f"Instantané local chargé ({count} résultats, {results_snapshot.staleness()})")
+    else:
+        _log_info("Aucun instantané local, les commandes attendront le premier token")
+
+
+@startup_pipeline.phase("extensions")
+async def _startup_extensions():
+    await _load_extensions()
+
+
+@startup_pipeline.phase("token")
+async def _startup_token():
     _log_info("Initialisation du token Epitech…")
-    if not ensure_valid_token():
+    if not await ensure_valid_token_async():
         _log_error("Impossible de récupérer le token Epitech")
         _log_warn("Le bot continue sans les fonctionnalités Epitech")
+        return
+    _log_ok("Token Epitech configuré")
+    _propagate_api_to_cogs()
+
+
+@startup_pipeline.phase("synchronisation")
+async def _startup_command_sync():
+    # Synchroniser les commandes avec Discord (seulement si elles ont changé)
+    force_sync = os.getenv('FORCE_COMMAND_SYNC', '').lower() in ('1', 'true', 'yes')
+    sync_result = await command_tree_sync.sync(bot, force=force_sync)
+    if sync_result["synced"]:
+        _log_ok(f"{sync_result['count']} commandes slash synchronisées en {sync_result['duration']:.2f}s ({sync_result['reason']})")
     else:
-        _log_ok("Token Epitech configuré")
-        
-        # Mettre à jour l'API dans le Cog des slash commands
-        try:
-            slash_commands_cog = bot.get_cog('MouliCordSlashCommands')
-            if slash_commands_cog and hasattr(slash_commands_cog, 'update_epitech_api'):
-                slash_commands_cog.update_epitech_api(epitech_api)
-                _log_info("API mise à jour dans les commandes slash")
-        except Exception as e:
-            _log_warn(f"Impossible de mettre à jour l'API dans les commandes: {e}")
-    
-    # Synchroniser les commandes avec Discord
-    try:
-        synced = await bot.tree.sync()
-        _log_ok(f"{len(synced)} commandes slash synchronisées")
-    except Exception as e:
-        _log_error(f"Erreur lors de la synchronisation des commandes: {e}")
+        _log_info(f"Commandes slash inchangées, synchronisation ignorée ({sync_result['duration'] * 1000:.0f}ms)")
+
+
+@startup_pipeline.phase("vérification initiale")
+async def _startup_scan():
+    """Vérification immédiate des nouveaux résultats (avec le token obtenu à la phase précédente)"""
+    if not epitech_api or not current_token:
+        _log_warn("Token indisponible, vérification au démarrage ignorée")
+        return
     
-    # Vérification immédiate au démarrage pour les nouveaux résultats
-    try:
-        _log_info("Vérification des nouveaux résultats au démarrage…")
-        
-        if not ensure_valid_token():
-            _log_warn("Token indisponible, vérification au démarrage ignorée")
-            return
-        
-        if epitech_api:
-            new_results_at_startup = epitech_api.get_new_results(2025)
-        else:
-            new_results_at_startup = []
-            _log_warn("API non initialisée au démarrage")
-        
-        if new_results_at_startup:
-            _log_ok(f"{len(new_results_at_startup)} nouveau(x) résultat(s) détecté(s) au démarrage")
-            for result in new_results_at_startup:
-                await moulibot.send_moulinette_notification(result)
-        else:
-            _log_ok("Aucun nouveau résultat au démarrage")
-    except Exception as e:
-        _log_warn(f"Erreur lors de la vérification au démarrage: {e}")
+    _log_info("Vérification des nouveaux résultats au démarrage…")
+    poll = notify_tracker.start_poll("startup")
+    new_results_at_startup = await asyncio.to_thread(epitech_api.get_new_results, 2025)
+    notify_tracker.mark_detected(poll)
     
+    if new_results_at_startup:
+        _log_ok(f"{len(new_results_at_startup)} nouveau(x) résultat(s) détecté(s) au démarrage")
+        await _record_run_diffs(new_results_at_startup)
+        await _notify_new_results(new_results_at_startup, poll)
+        await _ingest_new_results(new_results_at_startup)
+    else:
+        _log_ok("Aucun nouveau résultat au démarrage")
+        # Notifications restées en échec avant l'arrêt
+        await _notify_new_results([], poll)
+
+
+@startup_pipeline.phase("planificateur")
+def _startup_scheduler():
     # Démarrer les tâches automatiques
-    check_new_results.start()
-    check_token_expiration.start()
+    for loop in (check_new_results, check_token_expiration):
+        if not loop.is_running():
+            loop.start()
+    # Compléter l'index de recherche avec les passages ingérés avant son existence
+    _schedule_search_backfill()
+
+
+@bot.event
+async def on_ready():
+    """Événement déclenché quand le bot est prêt (aussi après chaque reconnexion à la passerelle)"""
+    if startup_pipeline.started:
+        _log_info(f"Reconnecté à Discord en tant que {bot.user} (démarrage déjà effectué)")
+        await startup_pipeline.run()
+        return
+    
+    _log_ok(f"Connecté à Discord en tant que {bot.user}")
+    _log_info(f"Canal configuré: {channel_id}")
+    
+    await startup_pipeline.run()
+    _log_ok(f"Démarrage terminé: {startup_pipeline.format_stats()}")
 
 
 @tasks.loop(minutes=5)
 async def check_new_results():
     """Tâche de vérification automatique des nouveaux résultats"""
+    poll_start = time.perf_counter()
     try:
         _log_info(f"Vérification automatique - {datetime.now().strftime('%H:%M:%S')}")
         
         # S'assurer que le token est valide avant de vérifier
-        if not ensure_valid_token():
+        if not await ensure_valid_token_async():
             _log_warn("Token indisponible, vérification ignorée")
             return
         
         # Vérifier les nouveaux résultats
+        poll = notify_tracker.start_poll(_poll_interval_label())
         if epitech_api:
-            new_results = epitech_api.get_new_results(2025)
+            new_results = await asyncio.to_thread(epitech_api.get_new_results, 2025)
+            notify_tracker.mark_detected(poll)
         else:
             _log_warn("API non initialisée")
             return
         
         if new_results:
             _log_ok(f"{len(new_results)} nouveau(x) résultat(s) détecté(s)")
+            await _record_run_diffs(new_results)
             
             # Envoyer une notification pour chaque nouveau résultat
-            for result in new_results:
-                await moulibot.send_moulinette_notification(result)
+            await _notify_new_results(new_results, poll)
+            
+            # Indexer les nouveaux passages après les notifications (ne retarde pas l'envoi)
+            await _ingest_new_results(new_results)
+            
+            # Rafraîchir en arrière-plan l'historique des projets concernés (consulté après une notification)
+            _refresh_project_histories(new_results)
                 
         else:
             _log_info("Aucun nouveau résultat détecté")
+            # Retenter les notifications dont l'envoi a échoué
+            await _notify_new_results([], poll)
+        
+        # Reprendre l'indexation en arrière-plan si elle a été interrompue (API indisponible)
+        _schedule_search_backfill()
             
     except Exception as e:
         _log_error(f"Erreur lors de la vérification automatique: {e}")
+    finally:
+        poll_duration.observe(time.perf_counter() - poll_start)
 
 
 @check_new_results.before_loop
@@ -647,12 +887,12 @@ async def check_token_expiration():
             
             if token_info.get("is_expired", False):
                 _log_info("Token expiré détecté, renouvellement automatique…")
-                ensure_valid_token()
+                await ensure_valid_token_async()
             else:
                 _log_ok("Token valide")
         else:
             _log_warn("Aucun token configuré, tentative de récupération…")
-            ensure_valid_token()
+            await ensure_valid_token_async()
             
     except Exception as e:
         _log_error(f"Erreur lors de la vérification du token: {e}")
@@ -726,13 +966,13 @@ async def test_notification_command(ctx):
     """Commande pour tester les notifications de moulinette"""
     try:
         # S'assurer que le token est valide
-        if not ensure_valid_token():
+        if not await ensure_valid_token_async():
             await ctx.send("❌ **Erreur:** Token Epitech indisponible")
             return
         
         # Récupérer le premier résultat pour test
         if epitech_api:
-            results = epitech_api.get_moulinette_results(2025)
+            results = await asyncio.to_thread(epitech_api.get_moulinette_results, 2025)
         else:
             await ctx.send("❌ **Erreur:** API non initialisée")
             return
@@ -742,6 +982,7 @@ async def test_notification_command(ctx):
             test_result = results[0]
             
             await ctx.send("🧪 **Test de notification en cours...**")
+            await moulibot.send_simple_notification(test_result)
             await moulibot.send_moulinette_notification(test_result)
             
             await ctx.send("✅ **Notification de test envoyée !**\nVérifiez le canal configuré.")
@@ -0,0 +1,198 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+from metrics import registry
+from notify_tracker import format_duration
+
+
+circuit_breaker_state = registry.gauge(
+    "moulicord_circuit_breaker_state", "État du disjoncteur de l'API Epitech (0 fermé, 1 semi-ouvert, 2 ouvert)", ("breaker",))
+circuit_breaker_rejections = registry.counter(
+    "moulicord_circuit_breaker_rejected_total", "Requêtes non émises car le disjoncteur est ouvert", ("breaker",))
+
+CLOSED = "fermé"
+HALF_OPEN = "semi-ouvert"
+OPEN = "ouvert"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Requête non émise: le disjoncteur de la route est ouvert (les appelants servent leurs données en cache)"""
+
+    def __init__(self, breaker: str, retry_in: float):
+        super().__init__(f"API suspendue sur {breaker}, nouvel essai dans {format_duration(retry_in)}")
+        self.breaker = breaker
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """En-tête Retry-After en secondes (nombre de secondes ou date HTTP), None s'il est absent ou invalide"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur autour d'une route de l'API Epitech
+
+    Après `failure_threshold` échecs consécutifs (ou une réponse 429) il s'ouvre:
+    les appels échouent aussitôt (CircuitOpenError) et les commandes servent
+    leurs données en cache. Le délai d'ouverture double à chaque réouverture
+    (de `base_timeout` à `max_timeout`, avec une gigue de ±20% pour ne pas
+    relancer toutes les routes au même instant) et respecte Retry-After s'il est
+    plus long. Le disjoncteur passe ensuite semi-ouvert: un seul appel d'essai
+    est autorisé, qui le referme s'il réussit ou le rouvre s'il échoue.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, base_timeout: float = 5.0, max_timeout: float = 300.0,
+                 jitter: float = 0.2):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.jitter = jitter
+        self.consecutive_failures = 0
+        # Nombre d'ouvertures successives sans succès (exposant du délai)
+        self.trips = 0
+        self.reset_timeout = base_timeout
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.rejected = 0
+        self._probe_in_flight = False
+        # Les appels à l'API sont faits depuis des threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        circuit_breaker_state.set(0, breaker=name)
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    @property
+    def is_open(self) -> bool:
+        """Vrai si les appels sont refusés en ce moment (ne consomme pas l'appel d'essai)"""
+        return self.state == OPEN
+
+    def retry_in(self) -> float:
+        """Secondes avant le prochain appel d'essai (0 si le disjoncteur est fermé)"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.time())
+
+    def allow_request(self) -> bool:
+        """Vrai si l'appel peut être émis (disjoncteur fermé, ou appel d'essai en semi-ouvert)"""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                circuit_breaker_state.set(_STATE_VALUES[HALF_OPEN], breaker=self.name)
+                return True
+            self.rejected += 1
+        circuit_breaker_rejections.inc(breaker=self.name)
+        return False
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is None and not self.consecutive_failures:
+                return
+            self.consecutive_failures = 0
+            self.trips = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+        circuit_breaker_state.set(_STATE_VALUES[CLOSED], breaker=self.name)
+
+    def record_failure(self, error: str = "", retry_after: Optional[float] = None):
+        """
+        Compte un échec (erreur réseau, 5xx, 429)
+
+        Args:
+            error: Description de l'erreur (affichée dans /status)
+            retry_after: Délai demandé par l'API (en-tête Retry-After); ouvre immédiatement
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error or self.last_error
+            reopen = (self._probe_in_flight or retry_after is not None
+                      or self.consecutive_failures >= self.failure_threshold)
+            self._probe_in_flight = False
+            if reopen:
+                backoff = min(self.max_timeout, self.base_timeout * 2 ** self.trips)
+                backoff *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+                self.reset_timeout = max(backoff, retry_after or 0.0)
+                self.trips += 1
+                self.opened_at = time.time()
+        if reopen:
+            circuit_breaker_state.set(_STATE_VALUES[OPEN], breaker=self.name)
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "retry_in": self.retry_in(),
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
+
+    def format_stats(self) -> str:
+        """État lisible pour /status"""
+        state = self.state
+        if state == CLOSED:
+            summary = "🟢 Fermé"
+            if self.consecutive_failures:
+                summary += f" ({self.consecutive_failures}/{self.failure_threshold} échecs consécutifs)"
+        elif state == HALF_OPEN:
+            summary = "🟡 Semi-ouvert (appel d'essai)"
+        else:
+            summary = f"🔴 Ouvert: nouvel essai dans {format_duration(self.retry_in())}"
+        if self.rejected:
+            summary += f" • {self.rejected} requête(s) évitée(s)"
+        if state != CLOSED and self.last_error:
+            summary += f"\nDernière erreur: {self.last_error[:100]}"
+        return summary
+
+
+class CircuitBreakers:
+    """Un disjoncteur par route de l'API (créé au premier appel)"""
+
+    def __init__(self, **options):
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(endpoint, CircuitBreaker(endpoint, **self.options))
+        return breaker
+
+    def format_stats(self) -> str:
+        """Une ligne par route (pour /status)"""
+        if not self._breakers:
+            return "🟢 Fermé (aucun appel)"
+        return "\n".join(f"`{name}` {breaker.format_stats()}" for name, breaker in sorted(self._breakers.items()))
+
+
+# Instance partagée par toutes les instances d'EpitechAPI (survit au renouvellement du token)
+upstream_breakers = CircuitBreakers()
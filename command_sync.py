@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from metrics import registry
+
+
+command_sync_duration = registry.histogram(
+    "moulicord_command_sync_seconds", "Durée de la synchronisation des commandes slash avec Discord", ("outcome",),
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+
+
+def command_tree_hash(tree, application_id: Optional[int] = None) -> str:
+    """
+    Empreinte stable des commandes enregistrées (noms, descriptions, paramètres, permissions)
+
+    Calculée sur la représentation envoyée à Discord, triée par type et par nom.
+    """
+    payloads = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda payload: (payload.get("type", 1), payload["name"])
+    )
+    data = json.dumps({"application_id": application_id, "commands": payloads}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class CommandTreeSync:
+    """
+    Synchronise l'arbre des commandes slash uniquement quand il a changé
+
+    L'empreinte de la dernière synchronisation réussie est persistée: les
+    redémarrages et reconnexions sans changement de commandes ne renvoient
+    rien à Discord (limite de débit des commandes globales).
+    """
+
+    def __init__(self, state_file: str = "command_sync.json"):
+        self.state_file = state_file
+        self.last_result: Dict = {}
+
+    def _load_state(self) -> Dict:
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  État de synchronisation des commandes illisible: {e}")
+            return {}
+
+    def _save_state(self, state: Dict):
+        try:
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            print(f"❌ Erreur lors de la sauvegarde de l'état de synchronisation: {e}")
+
+    async def sync(self, bot, force: bool = False) -> Dict:
+        """
+        Synchronise les commandes si leur empreinte a changé (ou si `force`)
+
+        Returns:
+            Dict avec 'synced' (bool), 'count', 'hash', 'duration' (s) et 'reason'
+        """
+        start = time.perf_counter()
+        digest = command_tree_hash(bot.tree, bot.application_id)
+        state = self._load_state()
+        count = len(bot.tree.get_commands())
+
+        if not force and state.get("hash") == digest:
+            self.last_result = {"synced": False, "count": count, "hash": digest,
+                                "duration": time.perf_counter() - start, "reason": "inchangé",
+                                "synced_at": state.get("synced_at")}
+            return self.last_result
+
+        reason = "forcée" if force else ("première synchronisation" if not state else "commandes modifiées")
+        try:
+            synced = await bot.tree.sync()
+        except Exception:
+            command_sync_duration.observe(time.perf_counter() - start, outcome="error")
+            raise
+        duration = time.perf_counter() - start
+        command_sync_duration.observe(duration, outcome="synced")
+
+        synced_at = datetime.now().isoformat()
+        self._save_state({"hash": digest, "synced_at": synced_at, "commands": len(synced)})
+        self.last_result = {"synced": True, "count": len(synced), "hash": digest, "duration": duration,
+                            "reason": reason, "synced_at": synced_at}
+        return self.last_result
+
+
+# Instance partagée entre le démarrage du bot et la commande /sync
+command_tree_sync = CommandTreeSync()
@@ -2,23 +2,151 @@ import requests
 import json
 import os
 import base64
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Dict, Optional
+import api_capture
+from circuit_breaker import CircuitOpenError, parse_retry_after, upstream_breakers
+from metrics import cache_hit_ratio, upstream_errors, upstream_latency
+from project_index import project_index
+from render_cache import embed_cache
+from results_snapshot import results_snapshot
+from run_store import run_store
+from shared_token import shared_token
+from tracing import span
+
+
+@lru_cache(maxsize=1024)
+def _cached_progress_bar(passed: int, total: int, length: int) -> str:
+    """Construit une barre de progression (mise en cache: peu de combinaisons distinctes)"""
+    if total == 0:
+        return "⬜" * length + " 0%"
+    
+    percentage = (passed / total) * 100
+    filled_length = int(length * passed / total)
+    
+    # Choix des emoji selon le pourcentage
+    if percentage >= 90:
+        fill_char = "🟩"  # Vert - Excellent
+    elif percentage >= 70:
+        fill_char = "🟨"  # Jaune - Bien
+    elif percentage >= 50:
+        fill_char = "🟧"  # Orange - Moyen
+    else:
+        fill_char = "🟥"  # Rouge - Insuffisant
+    
+    empty_char = "⬜"
+    
+    # Construction de la barre
+    bar = fill_char * filled_length + empty_char * (length - filled_length)
+    return f"{bar} {percentage:.1f}%"
+
+
+def _progress_bar_hit_ratio() -> float:
+    """Ratio de succès du cache des barres de progression"""
+    info = _cached_progress_bar.cache_info()
+    total = info.hits + info.misses
+    return info.hits / total if total else 0.0
+
+
+cache_hit_ratio.set_function(_progress_bar_hit_ratio, cache="progress_bar")
 
 
 class EpitechAPI:
     """Client pour interagir avec l'API Epitech"""
     
     def __init__(self, bearer_token: str, storage_file: str = "results_history.json"):
-        self.bearer_token = bearer_token
-        self.base_url = "https://api.epitest.eu"
+        # EPITECH_API_BASE_URL permet de viser un serveur local (benchmarks/mock_epitech_server.py)
+        self.base_url = os.getenv("EPITECH_API_BASE_URL", "https://api.epitest.eu").rstrip("/")
         self.storage_file = storage_file
+        self.set_token(bearer_token)
+        # Initialiser le stockage
+        self._init_storage()
+    
+    def set_token(self, bearer_token: str):
+        """Remplace le token utilisé pour les requêtes suivantes"""
+        self.bearer_token = bearer_token
         self.headers = {
             "Authorization": f"Bearer {bearer_token}",
             "Content-Type": "application/json"
         }
-        # Initialiser le stockage
-        self._init_storage()
+    
+    def _get(self, endpoint: str, url: str) -> requests.Response:
+        """
+        Effectue une requête GET vers l'API en mesurant sa latence
+        
+        Avec EPITECH_API_CAPTURE la réponse est aussi archivée; avec EPITECH_API_REPLAY
+        elle est lue depuis une archive au lieu d'interroger l'API (voir api_capture.py).
+        
+        Chaque route a son disjoncteur (circuit_breaker.py): les erreurs réseau, 5xx
+        et 429 l'ouvrent, et tant qu'il est ouvert la requête n'est pas émise.
+        
+        Sur un 401 (ou un 403 de /me/{year}, que tout token valide peut lire), le token
+        est renouvelé une seule fois pour toutes les requêtes concurrentes (shared_token.py)
+        et la requête est rejouée une fois avec le nouveau. Un 403 sur une autre route
+        est un refus d'accès à cette ressource: il ne déclenche pas de renouvellement.
+        
+        Args:
+            endpoint: Modèle de route, utilisé comme label de métrique (ex: "/me/{year}")
+            url: URL complète
+            
+        Returns:
+            Réponse HTTP (les erreurs HTTP sont comptées mais pas levées ici)
+            
+        Raises:
+            CircuitOpenError: Disjoncteur ouvert, les appelants se replient sur leur cache
+        """
+        breaker = upstream_breakers.get(endpoint)
+        if not breaker.allow_request():
+            upstream_errors.inc(endpoint=endpoint, status="circuit_open")
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        
+        # Token déjà renouvelé par une autre instance: l'adopter sans attendre un 401
+        if shared_token.current and shared_token.current != self.bearer_token:
+            self.set_token(shared_token.current)
+        try:
+            response = self._send(endpoint, url)
+            if response.status_code == 401 or (response.status_code == 403 and endpoint == "/me/{year}"):
+                new_token = shared_token.refresh(self.bearer_token)
+                if new_token:
+                    self.set_token(new_token)
+                    response = self._send(endpoint, url)
+        except requests.exceptions.RequestException as e:
+            breaker.record_failure(str(e))
+            raise
+        
+        # 401/403/404 sont des réponses de l'API: seules les pannes et la limitation de débit ouvrent le disjoncteur
+        if response.status_code == 429:
+            breaker.record_failure(f"429 Too Many Requests sur {endpoint}",
+                                   retry_after=parse_retry_after(response.headers.get("Retry-After")) or 0.0)
+        elif response.status_code >= 500:
+            breaker.record_failure(f"{response.status_code} {response.reason} sur {endpoint}")
+        else:
+            breaker.record_success()
+        return response
+    
+    def _send(self, endpoint: str, url: str) -> requests.Response:
+        """Une requête GET (ou sa relecture), comptée dans les métriques et éventuellement archivée"""
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        start = time.perf_counter()
+        try:
+            with span(f"upstream {endpoint}"):
+                if api_capture.upstream_replay is not None:
+                    response = api_capture.upstream_replay.get(path, url)
+                else:
+                    response = requests.get(url, headers=self.headers)
+        except requests.exceptions.RequestException:
+            upstream_errors.inc(endpoint=endpoint, status="network")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            upstream_latency.observe(elapsed, endpoint=endpoint)
+        if api_capture.upstream_capture is not None and api_capture.upstream_replay is None:
+            api_capture.upstream_capture.record(endpoint, path, response, elapsed, self.bearer_token)
+        if response.status_code >= 400:
+            upstream_errors.inc(endpoint=endpoint, status=str(response.status_code))
+        return response
     
     def get_moulinette_results(self, year: int = 2025) -> List[Dict]:
         """
@@ -32,9 +160,16 @@ class EpitechAPI:
         """
         try:
             url = f"{self.base_url}/me/{year}"
-            response = requests.get(url, headers=self.headers)
+            response = self._get("/me/{year}", url)
             response.raise_for_status()
-            return response.json()
+            results = response.json()
+            # Nouvelle génération de données si le contenu a changé (invalide les embeds en cache)
+            if isinstance(results, list):
+                embed_cache.observe_results(results)
+                results_snapshot.swap(results)
+                project_index.observe(results)
+                run_store.put_many(results)
+            return results
         except requests.exceptions.RequestException as e:
             print(f"Erreur lors de la récupération des résultats: {e}")
             return []
@@ -51,7 +186,7 @@ class EpitechAPI:
         """
         try:
             url = f"{self.base_url}/me/details/{run_id}"
-            response = requests.get(url, headers=self.headers)
+            response = self._get("/me/details/{id}", url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -71,7 +206,7 @@ class EpitechAPI:
         """
         try:
             url = f"{self.base_url}/me/{year}/{project_id}"
-            response = requests.get(url, headers=self.headers)
+            response = self._get("/me/{year}/{module}/{project}", url)
             response.raise_for_status()
             history = response.json()
             
@@ -79,12 +214,15 @@ class EpitechAPI:
             if isinstance(history, list):
                 history.sort(key=lambda x: x.get("date", ""), reverse=True)
             
-            return history if isinstance(history, list) else [history]
+            history = history if isinstance(history, list) else [history]
+            run_store.put_many(history)
+            return history
         except requests.exceptions.RequestException as e:
             print(f"Erreur lors de la récupération de l'historique du projet {project_id}: {e}")
             return []
     
-    def _generate_progress_bar(self, passed: int, total: int, length: int = 20) -> str:
+    @staticmethod
+    def _generate_progress_bar(passed: int, total: int, length: int = 20) -> str:
         """
         Génère une barre de progression visuelle
         
@@ -96,27 +234,7 @@ class EpitechAPI:
         Returns:
             Barre de progression avec pourcentage
         """
-        if total == 0:
-            return "⬜" * length + " 0%"
-        
-        percentage = (passed / total) * 100
-        filled_length = int(length * passed / total)
-        
-        # Choix des emoji selon le pourcentage
-        if percentage >= 90:
-            fill_char = "🟩"  # Vert - Excellent
-        elif percentage >= 70:
-            fill_char = "🟨"  # Jaune - Bien
-        elif percentage >= 50:
-            fill_char = "🟧"  # Orange - Moyen
-        else:
-            fill_char = "🟥"  # Rouge - Insuffisant
-        
-        empty_char = "⬜"
-        
-        # Construction de la barre
-        bar = fill_char * filled_length + empty_char * (length - filled_length)
-        return f"{bar} {percentage:.1f}%"
+        return _cached_progress_bar(passed, total, length)
 
     def format_project_summary(self, project_data: Dict) -> str:
         """
@@ -222,7 +340,7 @@ class EpitechAPI:
     def _load_storage(self) -> Dict:
         """Charge les données du fichier de stockage"""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
+            with span("storage load"), open(self.storage_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 # Si le fichier contient une liste au lieu d'un dict, le réinitialiser
                 if isinstance(data, list):
@@ -236,7 +354,7 @@ class EpitechAPI:
     def _save_storage(self, data: Dict):
         """Sauvegarde les données dans le fichier de stockage"""
         try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
+            with span("storage save"), open(self.storage_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
@@ -441,6 +559,11 @@ class EpitechAPI:
         except Exception as e:
             return {"error": f"Erreur lors de l'analyse du token: {str(e)}"}
     
+    def has_valid_token(self) -> bool:
+        """Vrai si le token est un JWT décodable et non expiré (aucune requête réseau)"""
+        token_info = self.get_token_info()
+        return "error" not in token_info and not token_info.get("is_expired", True)
+    
     def check_token_expiration(self) -> str:
         """
         Vérifie l'expiration du token et retourne des informations formatées pour Discord
@@ -0,0 +1,146 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime
+from typing import Optional
+import asyncio
+from export_worker import COLUMNAR_FORMATS, MIME_TYPES, collect_test_outcomes, export_manager
+from outcome_store import outcome_store
+from render_cache import embed_cache
+from run_diff import format_diff_inline, run_diff_store
+from slash_commands import MouliCordExtension
+from tracing import traced
+
+
+class ExportCommands(MouliCordExtension):
+    """Commande /export (CSV, JSON, PDF, Parquet, Arrow)"""
+    
+    @app_commands.command(name="export", description="📊 Exporte vos données en CSV, JSON, PDF, Parquet ou Arrow")
+    @app_commands.choices(format=[
+        app_commands.Choice(name="CSV", value="csv"),
+        app_commands.Choice(name="JSON", value="json"),
+        app_commands.Choice(name="PDF", value="pdf"),
+        app_commands.Choice(name="Parquet (historique complet, par tâche et par test)", value="parquet"),
+        app_commands.Choice(name="Arrow (historique complet, par tâche et par test)", value="arrow")
+    ])
+    @app_commands.describe(
+        debut="Date de début incluse (AAAA-MM-JJ)",
+        fin="Date de fin incluse (AAAA-MM-JJ)",
+        module="Code du module (ex: G-CPE-100)",
+        projet="Slug ou nom du projet"
+    )
+    @traced("/export")
+    async def export_slash(self, interaction: discord.Interaction, format: str = "csv",
+                           debut: Optional[str] = None, fin: Optional[str] = None,
+                           module: Optional[str] = None, projet: Optional[str] = None):
+        """Slash command pour exporter les données"""
+        await interaction.response.defer(thinking=True)
+        
+        try:
+            # Valider les filtres avant tout accès aux données
+            filters = {}
+            for key, value in (("date_from", debut), ("date_to", fin)):
+                if value:
+                    try:
+                        filters[key] = datetime.strptime(value.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+                    except ValueError:
+                        embed = discord.Embed(
+                            title="❌ Date invalide",
+                            description=f"`{value}` n'est pas au format **AAAA-MM-JJ**",
+                            color=discord.Color.red()
+                        )
+                        await interaction.followup.send(embed=embed, ephemeral=True)
+                        return
+            if module and module.strip():
+                filters["module"] = module.strip()
+            if projet and projet.strip():
+                filters["project"] = projet.strip()
+            
+            export_format = format.lower() if format.lower() in MIME_TYPES else "json"
+            if export_format in COLUMNAR_FORMATS:
+                # Export en colonnes: l'historique local est lu directement par le processus d'export
+                results, error_msg, changes = None, None, None
+                # La version du magasin entre dans la clé: un export en cache ne survit pas à de nouveaux détails
+                outcome_version, outcome_entries = outcome_store.entries()
+                test_outcomes = collect_test_outcomes(outcome_entries, filters)
+            else:
+                # Récupérer les résultats
+                results, error_msg = await self.get_results_with_fallback(2025)
+                outcome_version, test_outcomes = None, None
+                
+                if not results:
+                    embed = discord.Embed(
+                        title="❌ Aucun résultat disponible",
+                        description="• ⚠️ Token expiré (validité ~1h)\n• 📡 API inaccessible (403 Forbidden)\n• 💾 Aucune donnée locale disponible\n\n💡 Utilisez `/token` puis cliquez sur 'Actualiser Token'",
+                        color=discord.Color.red()
+                    )
+                    await interaction.followup.send(embed=embed, ephemeral=True)
+                    return
+                
+                # Résumé des changements par passage (colonne "Changements")
+                changes = {}
+                for result in results:
+                    test_run_id = result.get("results", {}).get("testRunId")
+                    summary = format_diff_inline(run_diff_store.get(test_run_id))
+                    if summary:
+                        changes[str(test_run_id)] = summary
+            
+            # Générer le fichier dans le pool de processus (la boucle d'événements reste libre)
+            export = await export_manager.export(
+                export_format,
+                embed_cache.generation,
+                results,
+                changes,
+                cache_key=(bool(error_msg), outcome_version),
+                filters=filters,
+                test_outcomes=test_outcomes
+            )
+            
+            if not export["rows"]:
+                embed = discord.Embed(
+                    title="📭 Export vide",
+                    description="Aucun passage ne correspond aux filtres demandés",
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            # Créer le fichier Discord directement depuis le fichier temporaire
+            file = discord.File(export["path"], 
+                              filename=f"moulicord_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}")
+            
+            if export_format in COLUMNAR_FORMATS:
+                content = (f"🏃 **{export['runs']}** passages, **{export['rows']}** lignes (passage/tâche/test)\n"
+                           f"🧪 Détail par test disponible pour **{len(test_outcomes)}** passages indexés")
+            else:
+                content = f"📈 **{export['rows']}** entrées exportées"
+            description = (f"Vos données ont été exportées en format **{export_format.upper()}**\n\n"
+                           f"{content}\n"
+                           f"📅 Du {export['last_date']} au {export['first_date']}")
+            if filters:
+                labels = {"date_from": "depuis", "date_to": "jusqu'au", "module": "module", "project": "projet"}
+                description += "\n🔎 Filtres: " + ", ".join(f"{labels[key]} `{value}`" for key, value in filters.items())
+            
+            embed = discord.Embed(
+                title="📊 Export terminé",
+                description=description,
+                color=discord.Color.green()
+            )
+            embed.set_footer(text=f"Généré en {export['duration']:.2f}s ({export['size'] / 1024:.0f} Ko)" if not export["cached"] else "Export réutilisé (données inchangées)")
+            
+            await interaction.followup.send(embed=embed, file=file, ephemeral=True)
+            
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Erreur d'export",
+                description=f"Erreur lors de l'export: {str(e)}",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    """Fonction pour charger l'extension (après slash_commands)"""
+    # Fichiers d'export d'avant le redémarrage (le cache qui les référençait est perdu)
+    await asyncio.to_thread(export_manager.purge)
+    await ExportCommands.setup_extension(bot)
@@ -0,0 +1,570 @@
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "moulicord_exports")
+PDF_TABLE_ROWS = 50  # Limiter le tableau pour éviter les PDF trop longs
+COLUMNAR_BATCH_ROWS = 10000  # Lignes par lot écrit dans les fichiers Parquet/Arrow
+STORAGE_FILE = "results_history.json"
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "pdf": "application/pdf",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file"
+}
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Schéma des exports en colonnes: une ligne par passage, par tâche et par test
+COLUMNAR_FIELDS = [
+    ("level", "string"),
+    ("run_id", "int64"),
+    ("date", "string"),
+    ("module", "string"),
+    ("project_slug", "string"),
+    ("project_name", "string"),
+    ("skill", "string"),
+    ("test", "string"),
+    ("count", "int32"),
+    ("passed", "int32"),
+    ("crashed", "int32"),
+    ("mandatory_failed", "int32"),
+    ("success", "bool_")
+]
+
+
+def matches_filters(date: str, module: str, slug: str, name: str, filters: Optional[Dict]) -> bool:
+    """
+    Indique si un passage correspond aux filtres d'export
+
+    Args:
+        date: Date ISO du passage
+        module: Code du module (ex: "G-CPE-100")
+        slug: Slug du projet
+        name: Nom du projet
+        filters: Dict optionnel avec 'date_from', 'date_to' (AAAA-MM-JJ, inclus), 'module' et 'project'
+    """
+    if not filters:
+        return True
+    day = (date or "")[:10]
+    if filters.get("date_from") and day < filters["date_from"]:
+        return False
+    if filters.get("date_to") and day > filters["date_to"]:
+        return False
+    if filters.get("module") and (module or "").lower() != filters["module"].lower():
+        return False
+    if filters.get("project"):
+        wanted = filters["project"].lower()
+        if (slug or "").lower() != wanted and wanted not in (name or "").lower():
+            return False
+    return True
+
+
+def filter_results(results: Iterable[Dict], filters: Optional[Dict]) -> List[Dict]:
+    """Ne conserve que les résultats correspondant aux filtres"""
+    if not filters:
+        return list(results)
+    filtered = []
+    for result in results:
+        project = result.get("project", {})
+        if matches_filters(result.get("date", ""), project.get("module", {}).get("code", ""),
+                           project.get("slug", ""), project.get("name", ""), filters):
+            filtered.append(result)
+    return filtered
+
+
+def collect_test_outcomes(entries: Dict[str, Dict], filters: Optional[Dict]) -> Dict[str, List]:
+    """
+    Résultats par test des passages enregistrés correspondant aux filtres
+
+    Args:
+        entries: Passages du magasin des résultats par test (testRunId -> entrée)
+        filters: Filtres d'export
+
+    Returns:
+        Dict testRunId -> liste de [tâche, test, réussi, crashé]
+    """
+    return {
+        run_id: entry["outcomes"]
+        for run_id, entry in entries.items()
+        if entry.get("outcomes") and matches_filters(entry.get("date", ""), entry.get("module", ""),
+                                                     entry.get("slug", ""), entry.get("project", ""), filters)
+    }
+
+
+def load_stored_results(storage_file: str = STORAGE_FILE) -> List[Dict]:
+    """Lit l'historique local des résultats (liste vide si absent ou illisible)"""
+    try:
+        with open(storage_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get("results", []) if isinstance(data, dict) else []
+    except (OSError, json.JSONDecodeError):
+        return []
+
+
+def iter_export_rows(results: List[Dict], changes: Optional[Dict[str, str]] = None) -> Iterator[Dict]:
+    """
+    Produit les lignes d'export une par une, de la plus récente à la plus ancienne
+
+    Args:
+        results: Résultats bruts (format /me/{year})
+        changes: Résumé des changements par testRunId (colonne "Changements")
+    """
+    changes = changes or {}
+    for result in sorted(results, key=lambda x: x.get("date", "N/A"), reverse=True):
+        # Extraire les informations de base depuis différentes structures possibles
+        project_name = result.get("projectName") or result.get("project", {}).get("name") or "N/A"
+        module_code = result.get("moduleCode") or result.get("project", {}).get("module", {}).get("code") or "N/A"
+        date = result.get("date", "N/A")
+        status = result.get("status", "N/A")
+
+        # Extraire les détails des skills
+        skills = result.get("results", {}).get("skills", {})
+        total_tasks = 0
+        passed_tasks = 0
+        failed_tasks = 0
+        for skill_data in skills.values():
+            if isinstance(skill_data, dict):
+                count = skill_data.get("count", 0)
+                passed = skill_data.get("passed", 0)
+                total_tasks += count
+                passed_tasks += passed
+                failed_tasks += (count - passed)
+
+        # Score explicite, sinon calculé depuis les skills
+        score = result.get("score", 0)
+        if score == 0 and total_tasks > 0:
+            score = int((passed_tasks / total_tasks) * 100)
+
+        yield {
+            "Date": date,
+            "Module": module_code,
+            "Projet": project_name,
+            "Score": score,
+            "Statut": status,
+            "Tâches Total": total_tasks,
+            "Tâches Réussies": passed_tasks,
+            "Tâches Échouées": failed_tasks,
+            "Taux de Réussite": f"{(passed_tasks/total_tasks*100):.1f}%" if total_tasks > 0 else "0%",
+            "Changements": changes.get(str(result.get("results", {}).get("testRunId")), "")
+        }
+
+
+def _write_csv(rows: Iterable[Dict], f) -> Dict:
+    """Écrit les lignes en CSV au fil de l'eau"""
+    writer = None
+    summary = {"rows": 0, "first_date": None, "last_date": None}
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(f, fieldnames=row.keys())
+            writer.writeheader()
+            summary["first_date"] = row["Date"]
+        writer.writerow(row)
+        summary["rows"] += 1
+        summary["last_date"] = row["Date"]
+    return summary
+
+
+def _write_json(rows: Iterable[Dict], f) -> Dict:
+    """Écrit les lignes en JSON au fil de l'eau (même rendu que json.dumps(indent=2))"""
+    summary = {"rows": 0, "first_date": None, "last_date": None}
+    f.write("[")
+    for row in rows:
+        f.write(",\n" if summary["rows"] else "\n")
+        f.write("\n".join("  " + line for line in json.dumps(row, indent=2, ensure_ascii=False).split("\n")))
+        if not summary["rows"]:
+            summary["first_date"] = row["Date"]
+        summary["rows"] += 1
+        summary["last_date"] = row["Date"]
+    f.write("\n]" if summary["rows"] else "]")
+    return summary
+
+
+def render_pdf(rows: Iterable[Dict], output) -> Dict:
+    """
+    Génère le rapport PDF en un seul parcours des lignes
+
+    Seules les agrégations et les 50 premières lignes sont conservées en mémoire.
+
+    Args:
+        rows: Lignes d'export (les plus récentes d'abord)
+        output: Chemin ou objet fichier binaire de destination
+    """
+    # Import différé: ReportLab n'est chargé que dans le processus qui génère le PDF
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+
+    summary = {"rows": 0, "first_date": None, "last_date": None}
+    score_total = 0
+    scored = 0
+    buckets = {"excellent": 0, "good": 0, "average": 0, "poor": 0}
+    table_rows = []
+
+    for row in rows:
+        if not summary["rows"]:
+            summary["first_date"] = row["Date"]
+        summary["rows"] += 1
+        summary["last_date"] = row["Date"]
+
+        score = int(row["Score"]) if row["Score"] != "N/A" else None
+        if score is not None:
+            score_total += score
+            scored += 1
+            if score >= 90:
+                buckets["excellent"] += 1
+            elif score >= 70:
+                buckets["good"] += 1
+            elif score >= 50:
+                buckets["average"] += 1
+            else:
+                buckets["poor"] += 1
+
+        if len(table_rows) < PDF_TABLE_ROWS:
+            date_str = row["Date"][:10] if row["Date"] != "N/A" else "N/A"
+            module = row["Module"][:15] + "..." if len(row["Module"]) > 15 else row["Module"]
+            project = row["Projet"][:20] + "..." if len(row["Projet"]) > 20 else row["Projet"]
+            score_str = str(row["Score"]) + "%" if row["Score"] != "N/A" else "N/A"
+            tasks = f"{row['Tâches Réussies']}/{row['Tâches Total']}"
+            table_rows.append([date_str, module, project, score_str, tasks, row["Taux de Réussite"]])
+
+    doc = SimpleDocTemplate(output, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=1,  # Centré
+        textColor=colors.HexColor('#2E86AB')
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.HexColor('#A23B72')
+    )
+
+    # Contenu du PDF
+    story = []
+    story.append(Paragraph("📊 Rapport MouliCord", title_style))
+    story.append(Spacer(1, 12))
+
+    # Informations générales
+    total_entries = summary["rows"]
+    if total_entries:
+        avg_score = score_total / scored if scored else 0
+        date_range = f"Du {summary['last_date'][:10]} au {summary['first_date'][:10]}"
+    else:
+        avg_score = 0
+        date_range = "Aucune donnée"
+
+    story.append(Paragraph("<b>Résumé des performances</b>", heading_style))
+    story.append(Paragraph(f"• <b>Total des entrées:</b> {total_entries}", styles['Normal']))
+    story.append(Paragraph(f"• <b>Score moyen:</b> {avg_score:.1f}%", styles['Normal']))
+    story.append(Paragraph(f"• <b>Période:</b> {date_range}", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    if total_entries:
+        # Tableau des données
+        story.append(Paragraph("<b>Détails des moulinettes</b>", heading_style))
+        table_data = [["Date", "Module", "Projet", "Score", "Tâches", "Réussite"]] + table_rows
+        table = Table(table_data, colWidths=[1.2*inch, 1.2*inch, 1.8*inch, 0.8*inch, 0.8*inch, 1*inch])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ]))
+        story.append(table)
+        story.append(Spacer(1, 20))
+
+        # Statistiques par performance
+        story.append(Paragraph("<b>Répartition par performance</b>", heading_style))
+        stats_data = [
+            ["Performance", "Nombre", "Pourcentage"],
+            ["🟢 Excellent (≥90%)", str(buckets["excellent"]), f"{(buckets['excellent']/total_entries*100):.1f}%"],
+            ["🟡 Bon (70-89%)", str(buckets["good"]), f"{(buckets['good']/total_entries*100):.1f}%"],
+            ["🟠 Moyen (50-69%)", str(buckets["average"]), f"{(buckets['average']/total_entries*100):.1f}%"],
+            ["🔴 À améliorer (<50%)", str(buckets["poor"]), f"{(buckets['poor']/total_entries*100):.1f}%"]
+        ]
+        stats_table = Table(stats_data, colWidths=[2*inch, 1*inch, 1*inch])
+        stats_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#A23B72')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 9)
+        ]))
+        story.append(stats_table)
+
+    # Pied de page
+    story.append(Spacer(1, 30))
+    story.append(Paragraph(f"<i>Rapport généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')} par MouliCord</i>", styles['Normal']))
+
+    doc.build(story)
+    return summary
+
+
+def iter_columnar_records(results: List[Dict], test_outcomes: Optional[Dict[str, List]] = None) -> Iterator[Dict]:
+    """
+    Produit les lignes de l'export en colonnes, de la plus récente à la plus ancienne
+
+    Chaque passage donne une ligne "run", une ligne "skill" par tâche et, si les
+    résultats par test sont connus localement, une ligne "test" par test.
+    """
+    test_outcomes = test_outcomes or {}
+    for result in sorted(results, key=lambda x: x.get("date", ""), reverse=True):
+        project = result.get("project", {})
+        run_results = result.get("results", {})
+        run_id = run_results.get("testRunId")
+        base = {
+            "run_id": run_id,
+            "date": result.get("date", ""),
+            "module": project.get("module", {}).get("code", ""),
+            "project_slug": project.get("slug", ""),
+            "project_name": project.get("name", "")
+        }
+
+        skill_rows = []
+        totals = {"count": 0, "passed": 0, "crashed": 0, "mandatory_failed": 0}
+        for skill_name, skill_data in run_results.get("skills", {}).items():
+            if not isinstance(skill_data, dict):
+                continue
+            counters = {
+                "count": skill_data.get("count", 0),
+                "passed": skill_data.get("passed", 0),
+                "crashed": skill_data.get("crashed", 0),
+                "mandatory_failed": skill_data.get("mandatoryFailed", 0)
+            }
+            for key, value in counters.items():
+                totals[key] += value
+            skill_rows.append(dict(base, level="skill", skill=skill_name, test=None,
+                                   success=counters["count"] > 0 and counters["passed"] == counters["count"],
+                                   **counters))
+
+        yield dict(base, level="run", skill=None, test=None,
+                   success=totals["count"] > 0 and totals["passed"] == totals["count"], **totals)
+        yield from skill_rows
+        for skill_name, test_name, passed, crashed in test_outcomes.get(str(run_id), []):
+            yield dict(base, level="test", skill=skill_name, test=test_name, count=1,
+                       passed=int(passed), crashed=int(crashed), mandatory_failed=None, success=passed)
+
+
+def _write_columnar(export_format: str, records: Iterable[Dict], path: str) -> Dict:
+    """
+    Écrit les lignes par lots dans un fichier Parquet ou Arrow IPC
+
+    Seul le lot courant est conservé en mémoire (COLUMNAR_BATCH_ROWS lignes).
+    """
+    # Import différé: pyarrow est optionnel et n'est chargé que par le processus d'export
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow n'est pas installé (pip install pyarrow) : export Parquet/Arrow indisponible")
+
+    schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in COLUMNAR_FIELDS])
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+    summary = {"rows": 0, "runs": 0, "first_date": None, "last_date": None}
+    batch = {name: [] for name, _ in COLUMNAR_FIELDS}
+
+    def flush():
+        if batch["level"]:
+            writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+            for column in batch.values():
+                column.clear()
+
+    try:
+        for record in records:
+            for name, column in batch.items():
+                column.append(record[name])
+            summary["rows"] += 1
+            if record["level"] == "run":
+                if not summary["runs"]:
+                    summary["first_date"] = record["date"]
+                summary["runs"] += 1
+                summary["last_date"] = record["date"]
+            if len(batch["level"]) >= COLUMNAR_BATCH_ROWS:
+                flush()
+        flush()
+    finally:
+        writer.close()
+    return summary
+
+
+def write_export(export_format: str, results: Optional[List[Dict]], changes: Optional[Dict[str, str]] = None,
+                 filters: Optional[Dict] = None, test_outcomes: Optional[Dict[str, List]] = None) -> Dict:
+    """
+    Produit un fichier d'export complet (exécuté dans un processus du pool)
+
+    Les lignes sont écrites au fil de l'eau dans un fichier temporaire: la liste
+    complète des lignes n'est jamais matérialisée en mémoire.
+
+    Args:
+        export_format: "csv", "json", "pdf", "parquet" ou "arrow"
+        results: Résultats à exporter; None pour lire l'historique local dans le processus
+        changes: Résumé des changements par testRunId (exports tabulaires)
+        filters: Filtres de date, module et projet (voir matches_filters)
+        test_outcomes: Résultats par test, par testRunId (exports en colonnes)
+
+    Returns:
+        Dict avec 'path', 'format', 'rows', 'first_date', 'last_date' et 'duration'
+    """
+    start = time.perf_counter()
+    if results is None:
+        results = load_stored_results()
+    results = filter_results(results, filters)
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="export_", suffix=f".{export_format}", dir=EXPORT_DIR)
+    rows = iter_export_rows(results, changes)
+    try:
+        if export_format in COLUMNAR_FORMATS:
+            os.close(fd)
+            summary = _write_columnar(export_format, iter_columnar_records(results, test_outcomes), path)
+        elif export_format == "pdf":
+            os.close(fd)
+            summary = render_pdf(rows, path)
+        else:
+            writer = _write_csv if export_format == "csv" else _write_json
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                summary = writer(rows, f)
+    except Exception:
+        os.remove(path)
+        raise
+
+    summary.update({
+        "path": path,
+        "format": export_format,
+        "size": os.path.getsize(path),
+        "duration": time.perf_counter() - start
+    })
+    return summary
+
+
+class ExportManager:
+    """
+    Exécute les exports dans un pool de processus et met en cache les fichiers produits
+
+    Le cache est indexé par (format, génération de données) et les filtres,
+    plus la version du magasin des résultats par test pour les exports en
+    colonnes: deux exports identiques sur les mêmes données réutilisent le
+    même fichier.
+    """
+
+    def __init__(self, max_workers: int = 1, max_cached: int = 8):
+        self.max_workers = max_workers
+        self.max_cached = max_cached
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._pending: Dict[tuple, asyncio.Future] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crée le pool au premier export (aucun processus lancé au démarrage)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def export(self, export_format: str, generation: int, results: Optional[List[Dict]],
+                     changes: Optional[Dict[str, str]] = None, cache_key: tuple = (),
+                     filters: Optional[Dict] = None, test_outcomes: Optional[Dict[str, List]] = None) -> Dict:
+        """
+        Retourne le fichier d'export demandé, en le générant hors de la boucle si nécessaire
+
+        Args:
+            export_format: "csv", "json", "pdf", "parquet" ou "arrow"
+            generation: Génération de données courante
+            results: Résultats à exporter (None: historique local, lu par le processus d'export)
+            changes: Résumé des changements par testRunId
+            cache_key: Éléments supplémentaires qui distinguent l'export
+            filters: Filtres de date, module et projet
+            test_outcomes: Résultats par test, par testRunId
+        """
+        key = (export_format, generation) + tuple(cache_key) + tuple(sorted((filters or {}).items()))
+        cached = self._cache.get(key)
+        if cached and os.path.exists(cached["path"]):
+            self._cache.move_to_end(key)
+            return dict(cached, cached=True)
+
+        # Un seul rendu pour des demandes identiques simultanées
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(self._get_executor(), write_export, export_format, results,
+                                           changes, filters, test_outcomes)
+            self._pending[key] = pending
+        try:
+            summary = await asyncio.shield(pending)
+        finally:
+            self._pending.pop(key, None)
+
+        self._cache[key] = summary
+        while len(self._cache) > self.max_cached:
+            _, evicted = self._cache.popitem(last=False)
+            try:
+                os.remove(evicted["path"])
+            except OSError:
+                pass
+        return dict(summary, cached=False)
+
+    def purge(self):
+        """
+        Supprime les fichiers d'export laissés par un processus précédent
+
+        Le cache ne survit pas à un redémarrage: seuls ses fichiers sont conservés.
+        """
+        cached_paths = {summary["path"] for summary in self._cache.values()}
+        try:
+            names = os.listdir(EXPORT_DIR)
+        except OSError:
+            return
+        removed = 0
+        for name in names:
+            path = os.path.join(EXPORT_DIR, name)
+            if name.startswith("export_") and path not in cached_paths:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            print(f"🧹 {removed} fichier(s) d'export orphelin(s) supprimé(s)")
+
+    def shutdown(self):
+        """Arrête le pool de processus"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instance partagée par la commande /export
+export_manager = ExportManager()
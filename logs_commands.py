@@ -0,0 +1,561 @@
+import asyncio
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime
+from typing import Optional
+from epitech_api import EpitechAPI
+from prefetch import details_prefetcher
+from outcome_store import outcome_store
+from run_store import run_store
+from search_index import trace_search_index
+from slash_commands import MouliCordExtension
+from trace_parser import extract_failed_task_output
+from tracing import traced
+
+
+# Préchargement des détails pendant l'affichage du menu /logs
+PREFETCH_RECENT = 3
+PREFETCH_MAX = 8
+
+
+def _prefetch_candidates(results: list) -> list:
+    """
+    testRunId les plus susceptibles d'être choisis dans le menu /logs
+
+    Les passages les plus récents d'abord, puis ceux en échec (les logs
+    d'erreur sont la raison d'être de la commande), dans l'ordre du menu.
+    """
+    run_ids = []
+    for index, result in enumerate(results):
+        run_id = result.get("results", {}).get("testRunId")
+        if not run_id or run_id in run_ids:
+            continue
+        skills = result.get("results", {}).get("skills", {})
+        failing = any(
+            skill.get("passed", 0) < skill.get("count", 0) or skill.get("crashed", 0) or skill.get("mandatoryFailed", 0)
+            for skill in skills.values()
+        )
+        if index < PREFETCH_RECENT or failing:
+            run_ids.append(run_id)
+        if len(run_ids) >= PREFETCH_MAX:
+            break
+    return run_ids
+
+
+class LogsCommands(MouliCordExtension):
+    """Commandes /logs et /search (traces des moulinettes)"""
+    
+    @app_commands.command(name="logs", description="📋 Affiche les logs d'erreur des dernières moulinettes")
+    @traced("/logs")
+    async def logs_slash(self, interaction: discord.Interaction):
+        """Slash command pour afficher les logs d'erreur des moulinettes"""
+        await interaction.response.defer(thinking=True)
+        
+        try:
+            # Récupérer tous les résultats avec fallback automatique
+            results, error_msg = await self.get_results_with_fallback(2025)
+            
+            if not results:
+                embed = discord.Embed(
+                    title="❌ Aucun résultat disponible",
+                    description="• ⚠️ Token expiré (validité ~1h)\n• 📡 API inaccessible (403 Forbidden)\n• 💾 Aucune donnée locale disponible\n\n💡 Utilisez `/token` puis cliquez sur 'Actualiser Token'",
+                    color=discord.Color.red()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            # Trier par date (plus récent en premier) et limiter à 25 pour le menu
+            results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
+            limited_results = results_sorted[:25]
+            
+            # Créer l'embed de sélection
+            embed = discord.Embed(
+                title="📋 Logs d'Erreur des Moulinettes",
+                description=f"**Sélectionnez une moulinette** pour voir les détails des erreurs.\n\n📊 **{len(limited_results)} moulinettes** disponibles",
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            
+            embed.add_field(
+                name="🔍 Fonctionnalités",
+                value="• Messages d'erreur détaillés\n• Première tâche qui échoue\n• Détails des tests",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="📊 Informations",
+                value="• Troncature des erreurs\n• Navigation interactive\n• Détails complets",
+                inline=True
+            )
+            
+            # Précharger les détails des choix probables pendant que le menu est affiché (pas avant le premier token)
+            if self.epitech_api is not None and self.epitech_api.has_valid_token():
+                details_prefetcher.schedule(_prefetch_candidates(limited_results), self.epitech_api.get_detailed_results)
+            
+            # Créer la vue de sélection (elle ne garde que les testRunId, relus dans le magasin partagé)
+            logs_view = LogsSelectionView(self.epitech_api, run_store.put_many(limited_results))
+            await interaction.followup.send(embed=embed, view=logs_view, ephemeral=True)
+            
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Erreur",
+                description=f"Erreur lors de la récupération des logs:\n```{str(e)}```",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="search", description="🔎 Recherche dans les traces des moulinettes (erreurs, noms de tests)")
+    @app_commands.describe(
+        recherche="Texte à rechercher (ex: Segmentation fault, nom d'un test)",
+        nombre="Nombre de résultats à afficher (par défaut: 5)"
+    )
+    @traced("/search")
+    async def search_slash(self, interaction: discord.Interaction, recherche: str, nombre: Optional[int] = 5):
+        """Slash command de recherche plein texte dans les traces indexées"""
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        
+        try:
+            nombre = max(1, min(nombre or 5, 10))
+            matches, elapsed_ms = await trace_search_index.timed_search_async(recherche, nombre)
+            
+            if not matches:
+                embed = discord.Embed(
+                    title="🔎 Aucun résultat",
+                    description=f"Aucune moulinette ne contient `{recherche[:100]}`\n\n"
+                                f"📚 {len(trace_search_index)} passages indexés",
+                    color=discord.Color.orange()
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            embed = discord.Embed(
+                title=f"🔎 Recherche: {recherche[:100]}",
+                description=f"**{len(matches)}** passage(s) affiché(s), du plus récent au plus ancien",
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            
+            for match in matches:
+                date = match.get("date", "")
+                try:
+                    date_str = f"<t:{int(datetime.fromisoformat(date.replace('Z', '+00:00')).timestamp())}:R>"
+                except ValueError:
+                    date_str = date or "Date inconnue"
+                
+                # Éviter de casser le bloc de code Discord
+                snippet = match.get("snippet", "")[:300].replace("```", "`\u200b``")
+                value = f"📅 {date_str} • `{match['module']}/{match['slug']}` • #{match['run_id']}"
+                if snippet:
+                    value += f"\n```\n{snippet}\n```"
+                
+                embed.add_field(
+                    name=f"📋 {match['project']}",
+                    value=value[:1024],
+                    inline=False
+                )
+            
+            embed.set_footer(text=f"Recherche en {elapsed_ms:.1f}ms sur {len(trace_search_index)} passages indexés")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Erreur de recherche",
+                description=f"```{str(e)}```",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+class LogsSelectionView(discord.ui.View):
+    """Vue pour la sélection de moulinette dans /logs"""
+    
+    def __init__(self, epitech_api: EpitechAPI, run_ids: list):
+        super().__init__(timeout=300)
+        self.epitech_api = epitech_api
+        
+        # Ajouter le menu de sélection des moulinettes
+        self.add_item(LogsMoulinetteSelect(epitech_api, run_ids))
+
+
+class LogsMoulinetteSelect(discord.ui.Select):
+    """Menu déroulant pour sélectionner une moulinette dans /logs"""
+    
+    def __init__(self, epitech_api: EpitechAPI, run_ids: list):
+        self.epitech_api = epitech_api
+        
+        # Créer les options pour le menu (max 25), valeur = testRunId
+        options = []
+        for run_id, result in zip(run_ids[:25], run_store.get_many(run_ids[:25])):
+            if result is None:
+                continue
+            project = result.get("project", {})
+            project_name = project.get("name", "Projet inconnu")
+            date = result.get("date", "")
+            
+            # Formater la date
+            try:
+                dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
+                date_str = dt.strftime("%d/%m/%Y %H:%M")
+            except:
+                date_str = date[:16] if len(date) > 16 else date
+            
+            # Calculer le score
+            skills = result.get("results", {}).get("skills", {})
+            total_tests = sum(skill.get("count", 0) for skill in skills.values())
+            total_passed = sum(skill.get("passed", 0) for skill in skills.values())
+            rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
+            
+            # Tronquer le nom si trop long
+            display_name = project_name[:50] + "..." if len(project_name) > 50 else project_name
+            
+            # Choisir l'emoji selon le score
+            if rate >= 100:
+                emoji = "✅"
+            elif rate >= 80:
+                emoji = "🟡"
+            elif rate >= 50:
+                emoji = "🟠"
+            else:
+                emoji = "❌"
+            
+            options.append(discord.SelectOption(
+                label=f"{emoji} {display_name}",
+                description=f"{date_str} • {rate:.1f}%",
+                value=str(run_id)
+            ))
+        
+        super().__init__(
+            placeholder="📋 Choisissez une moulinette...",
+            options=options,
+            min_values=1,
+            max_values=1
+        )
+    
+    @traced("LogsMoulinetteSelect")
+    async def callback(self, interaction: discord.Interaction):
+        """Traite la sélection de la moulinette"""
+        try:
+            test_run_id = int(self.values[0])
+            moulinette_data = run_store.get(test_run_id)
+            
+            await interaction.response.defer()
+            
+            if moulinette_data is None:
+                raise LookupError(test_run_id)
+            
+            # Détails préchargés à l'affichage du menu, sinon récupérés via l'API (logs de base sans token utilisable)
+            details = None
+            if self.epitech_api is not None and self.epitech_api.has_valid_token():
+                details = await details_prefetcher.get(test_run_id, self.epitech_api.get_detailed_results)
+            
+            # Profiter des détails téléchargés pour compléter l'index de recherche et les résultats par test
+            if details and await trace_search_index.index_run_async(moulinette_data, details):
+                await asyncio.to_thread(trace_search_index.save)
+            if details and outcome_store.record(moulinette_data, details):
+                await asyncio.to_thread(outcome_store.save)
+            
+            if not details:
+                # Fallback: utiliser les données de base
+                await self._show_basic_logs(interaction, moulinette_data)
+                return
+            
+            # Afficher les logs détaillés
+            await self._show_detailed_logs(interaction, moulinette_data, details)
+            
+        except (ValueError, LookupError):
+            embed = discord.Embed(
+                title="❌ Moulinette introuvable",
+                description="Impossible de récupérer les détails pour cette moulinette",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+                
+        except Exception as e:
+            embed = discord.Embed(
+                title="❌ Erreur",
+                description=f"Erreur lors de la récupération des logs:\n```{str(e)}```",
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    async def _show_basic_logs(self, interaction: discord.Interaction, moulinette_data: dict):
+        """Affiche les logs basiques quand les détails ne sont pas disponibles"""
+        project = moulinette_data.get("project", {})
+        project_name = project.get("name", "Projet inconnu")
+        skills = moulinette_data.get("results", {}).get("skills", {})
+        
+        # Trouver la première tâche qui échoue
+        first_failed_task = None
+        for task_name, task_data in skills.items():
+            task_passed = task_data.get("passed", 0)
+            task_count = task_data.get("count", 0)
+            task_crashed = task_data.get("crashed", 0)
+            task_mandatory_failed = task_data.get("mandatoryFailed", 0)
+            
+            # Une tâche échoue si : pas tous les tests passés, ou des tests crashés, ou des échecs obligatoires
+            if (task_passed < task_count and task_count > 0) or task_crashed > 0 or task_mandatory_failed > 0:
+                first_failed_task = {
+                    "name": task_name,
+                    "passed": task_passed,
+                    "count": task_count,
+                    "crashed": task_crashed,
+                    "mandatory_failed": task_mandatory_failed
+                }
+                break
+        
+        embed = discord.Embed(
+            title=f"📋 Logs - {project_name}",
+            description="Détails des erreurs de la moulinette",
+            color=discord.Color.orange(),
+            timestamp=datetime.now()
+        )
+        
+        if first_failed_task:
+            # Construire le message d'erreur selon le type d'échec
+            error_details = f"**{first_failed_task['name']}**\n"
+            error_details += f"Tests: {first_failed_task['passed']}/{first_failed_task['count']}\n"
+            
+            if first_failed_task['crashed'] > 0:
+                error_details += f"💥 **Crashed:** {first_failed_task['crashed']}\n"
+            if first_failed_task['mandatory_failed'] > 0:
+                error_details += f"🚫 **Mandatory Failed:** {first_failed_task['mandatory_failed']}\n"
+            
+            # Déterminer l'icône selon le type d'échec
+            if first_failed_task['crashed'] > 0:
+                icon = "💥"
+                error_type = "Tâche crashée"
+            elif first_failed_task['mandatory_failed'] > 0:
+                icon = "🚫"
+                error_type = "Échec obligatoire"
+            else:
+                icon = "❌"
+                error_type = "Tests échoués"
+            
+            embed.add_field(
+                name=f"{icon} {error_type}",
+                value=error_details,
+                inline=False
+            )
+            
+            # Ajouter un message pour les logs détaillés
+            embed.add_field(
+                name="🔍 Logs d'erreur",
+                value="Les logs détaillés ne sont pas disponibles en mode basique.\n"
+                      "Utilisez `/token` pour actualiser et obtenir les détails complets.",
+                inline=False
+            )
+        else:
+            embed.add_field(
+                name="✅ Aucune erreur",
+                value="Toutes les tâches ont réussi",
+                inline=False
+            )
+        
+        # Résumé des compétences
+        skills_summary = []
+        for task_name, task_data in list(skills.items())[:10]:  # Limiter à 10
+            task_passed = task_data.get("passed", 0)
+            task_count = task_data.get("count", 0)
+            task_crashed = task_data.get("crashed", 0)
+            
+            if task_passed == task_count and task_count > 0:
+                icon = "✅"
+            elif task_crashed > 0:
+                icon = "💥"
+            elif task_passed > 0:
+                icon = "⚠️"
+            else:
+                icon = "❌"
+            
+            skills_summary.append(f"{icon} **{task_name}**: {task_passed}/{task_count}")
+        
+        if skills_summary:
+            embed.add_field(
+                name="📊 Résumé des tâches",
+                value="\n".join(skills_summary),
+                inline=False
+            )
+        
+        embed.set_footer(text="MouliCord • Logs basiques (détails non disponibles)")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    
+    def _get_performance_color(self, score: int) -> discord.Color:
+        """Retourne une couleur selon le score de performance"""
+        if score >= 90:
+            return discord.Color.green()
+        elif score >= 70:
+            return discord.Color.yellow()
+        elif score >= 50:
+            return discord.Color.orange()
+        else:
+            return discord.Color.red()
+    
+    def _get_performance_emoji(self, score: int) -> str:
+        """Retourne un emoji selon le score de performance"""
+        if score >= 90:
+            return "🟢"
+        elif score >= 70:
+            return "🟡"
+        elif score >= 50:
+            return "🟠"
+        else:
+            return "🔴"
+
+    def _extract_failed_task_output(self, output: str, task_name: str, run_id=None) -> str:
+        """Extrait uniquement la partie pertinente des logs d'erreur d'une tâche"""
+        # Index de la trace construit en une passe et mis en cache par testRunId
+        return extract_failed_task_output(output, task_name, run_id)
+
+    async def _show_detailed_logs(self, interaction: discord.Interaction, moulinette_data: dict, details: dict):
+        """Affiche les logs détaillés avec les messages d'erreur"""
+        project = moulinette_data.get("project", {})
+        project_name = project.get("name", "Projet inconnu")
+        
+        # Utiliser les données de moulinette_data en priorité (comme les autres commandes)
+        skills = moulinette_data.get("results", {}).get("skills", {})
+        
+        # Si pas de skills dans moulinette_data, essayer de récupérer depuis les détails
+        if not skills:
+            results = details.get("results", {})
+            skills = results.get("skills", {})
+        
+        # Trouver la première tâche qui échoue
+        first_failed_task = None
+        for task_name, task_data in skills.items():
+            task_passed = task_data.get("passed", 0)
+            task_count = task_data.get("count", 0)
+            task_crashed = task_data.get("crashed", 0)
+            task_mandatory_failed = task_data.get("mandatoryFailed", 0)
+            
+            # Une tâche échoue si : pas tous les tests passés, ou des tests crashés, ou des échecs obligatoires
+            if (task_passed < task_count and task_count > 0) or task_crashed > 0 or task_mandatory_failed > 0:
+                first_failed_task = {
+                    "name": task_name,
+                    "passed": task_passed,
+                    "count": task_count,
+                    "crashed": task_crashed,
+                    "mandatory_failed": task_mandatory_failed,
+                    "tests": task_data.get("tests", [])
+                }
+                break
+        
+        embed = discord.Embed(
+            title=f"📋 Logs Détaillés - {project_name}",
+            description="Messages d'erreur de la moulinette",
+            color=discord.Color.red() if first_failed_task else discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        
+        if first_failed_task:
+            # Construire le message d'erreur selon le type d'échec
+            error_details = f"**{first_failed_task['name']}**\n"
+            error_details += f"Tests: {first_failed_task['passed']}/{first_failed_task['count']}\n"
+            
+            if first_failed_task['crashed'] > 0:
+                error_details += f"💥 **Crashed:** {first_failed_task['crashed']}\n"
+            if first_failed_task['mandatory_failed'] > 0:
+                error_details += f"🚫 **Mandatory Failed:** {first_failed_task['mandatory_failed']}\n"
+            
+            # Déterminer l'icône selon le type d'échec
+            if first_failed_task['crashed'] > 0:
+                icon = "💥"
+                error_type = "Tâche crashée"
+            elif first_failed_task['mandatory_failed'] > 0:
+                icon = "🚫"
+                error_type = "Échec obligatoire"
+            else:
+                icon = "❌"
+                error_type = "Tests échoués"
+            
+            # Afficher les détails de la première tâche échouée
+            embed.add_field(
+                name=f"{icon} {error_type}",
+                value=error_details,
+                inline=False
+            )
+            
+            # Afficher les détails des tests échoués de la première tâche
+            failed_tests = []
+            
+            # Essayer de récupérer les logs depuis les détails de l'API
+            if details and "externalItems" in details:
+                external_items = details.get("externalItems", [])
+                
+                # Chercher l'item de type "trace-pool" qui contient les logs
+                for item in external_items:
+                    if item.get("type") == "trace-pool":
+                        trace_content = item.get("comment", "")
+                        
+                        # Extraire les logs de la tâche échouée
+                        test_run_id = moulinette_data.get("results", {}).get("testRunId")
+                        cleaned_output = self._extract_failed_task_output(trace_content, first_failed_task['name'], test_run_id)
+                        if cleaned_output:
+                            failed_tests.append(f"```\n{cleaned_output}\n```")
+                        break
+            
+            # Si pas de logs trouvés, essayer depuis moulinette_data
+            if not failed_tests:
+                for test in first_failed_task.get("tests", []):
+                    if not test.get("passed", False):
+                        test_output = test.get("output", "")
+                        if test_output:
+                            cleaned_output = self._extract_failed_task_output(test_output, first_failed_task['name'])
+                            if cleaned_output:
+                                failed_tests.append(f"```\n{cleaned_output}\n```")
+                                break
+            
+            if failed_tests:
+                embed.add_field(
+                    name="🔍 Logs d'erreur de la première tâche",
+                    value="\n\n".join(failed_tests),
+                    inline=False
+                )
+            else:
+                # Si pas de détails de tests, afficher un message générique
+                embed.add_field(
+                    name="🔍 Détails de l'échec",
+                    value=f"Tâche **{first_failed_task['name']}** échouée\n"
+                          f"Tests passés: {first_failed_task['passed']}/{first_failed_task['count']}\n"
+                          f"Pour plus de détails, consultez le rapport complet sur EpiTest",
+                    inline=False
+                )
+        else:
+            embed.add_field(
+                name="✅ Aucune erreur",
+                value="Toutes les tâches ont réussi",
+                inline=False
+            )
+        
+        # Résumé des compétences
+        skills_summary = []
+        for task_name, task_data in list(skills.items())[:10]:  # Limiter à 10
+            task_passed = task_data.get("passed", 0)
+            task_count = task_data.get("count", 0)
+            task_crashed = task_data.get("crashed", 0)
+            
+            if task_passed == task_count and task_count > 0:
+                icon = "✅"
+            elif task_crashed > 0:
+                icon = "💥"
+            elif task_passed > 0:
+                icon = "⚠️"
+            else:
+                icon = "❌"
+            
+            skills_summary.append(f"{icon} **{task_name}**: {task_passed}/{task_count}")
+        
+        if skills_summary:
+            embed.add_field(
+                name="📊 Résumé des tâches",
+                value="\n".join(skills_summary),
+                inline=False
+            )
+        
+        embed.set_footer(text="MouliCord • Logs détaillés avec messages d'erreur")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    """Fonction pour charger l'extension (après slash_commands)"""
+    await LogsCommands.setup_extension(bot)
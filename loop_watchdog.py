@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+from metrics import event_loop_lag, registry
+
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+STACK_DEPTH = 8  # Nombre de frames conservées pour chaque site bloquant
+
+loop_blocked = registry.counter(
+    "moulicord_event_loop_blocked_total", "Blocages de la boucle d'événements, par site d'appel", ("site",))
+loop_block_duration = registry.histogram(
+    "moulicord_event_loop_block_duration_seconds", "Durée des blocages de la boucle d'événements, par site d'appel", ("site",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+
+
+def _is_project_frame(filename: str) -> bool:
+    """Indique si une frame appartient au code du bot (hors bibliothèques installées)"""
+    return filename.startswith(PROJECT_DIR) and "site-packages" not in filename
+
+
+def attribute_stack(frame) -> Tuple[str, List[str]]:
+    """
+    Détermine le site d'appel responsable d'un blocage à partir de la frame courante
+
+    Le site retenu est la frame du projet la plus profonde, suivie de la fonction
+    réellement en cours (ex: "epitech_api.py:70 in _get → ssl.py:recv_into").
+
+    Returns:
+        (site, pile résumée)
+    """
+    stack = traceback.extract_stack(frame)
+    if not stack:
+        return "inconnu", []
+
+    innermost = stack[-1]
+    blocking_call = f"{os.path.basename(innermost.filename)}:{innermost.name}"
+    project_frames = [entry for entry in stack if _is_project_frame(entry.filename)]
+    if project_frames:
+        caller = project_frames[-1]
+        site = f"{os.path.relpath(caller.filename, PROJECT_DIR)}:{caller.lineno} in {caller.name}"
+        if caller is not innermost:
+            site += f" → {blocking_call}"
+    else:
+        site = blocking_call
+
+    summary = [
+        f"{os.path.basename(entry.filename)}:{entry.lineno} in {entry.name}" + (f" | {entry.line}" if entry.line else "")
+        for entry in stack[-STACK_DEPTH:]
+    ]
+    return site, summary
+
+
+class LoopWatchdog:
+    """
+    Surveille le retard de planification de la boucle d'événements
+
+    Une tâche « battement » se réveille toutes les `interval` secondes. Un thread
+    séparé vérifie ces battements: si la boucle ne s'est pas réveillée depuis plus
+    de `threshold` secondes, il capture la pile du thread de la boucle, c'est-à-dire
+    l'appel bloquant en cours. Quand la boucle reprend, la durée réelle du blocage
+    est attribuée à ce site (compteur + histogramme).
+    """
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.sites: Dict[str, Dict] = {}
+        self._last_beat = 0.0
+        self._captured_beat = 0.0
+        self._pending: Optional[Tuple[str, List[str]]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Démarre la surveillance (à appeler depuis la boucle; sans effet si déjà démarrée)"""
+        if self._task is None or self._task.done():
+            self._loop_thread_id = threading.get_ident()
+            self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Arrête la tâche battement et le thread de surveillance"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._thread = None
+
+    async def _heartbeat(self):
+        """Mesure le retard à chaque réveil et clôt les blocages détectés"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            event_loop_lag.observe(lag)
+            if lag >= self.threshold:
+                self._record(lag)
+
+    def _watch(self):
+        """Thread de surveillance: capture la pile de la boucle pendant un blocage"""
+        while not self._stopped.wait(self.interval):
+            beat = self._last_beat
+            if not beat or beat == self._captured_beat:
+                continue
+            if time.monotonic() - beat > self.interval + self.threshold:
+                self._captured_beat = beat
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._pending = attribute_stack(frame)
+
+    def _record(self, lag: float):
+        """Attribue un blocage terminé à son site d'appel et le journalise"""
+        pending, self._pending = self._pending, None
+        site, stack = pending if pending else ("inconnu (non capturé)", [])
+
+        entry = self.sites.get(site)
+        first_time = entry is None
+        if first_time:
+            entry = self.sites[site] = {"count": 0, "total": 0.0, "max": 0.0, "stack": stack}
+        entry["count"] += 1
+        entry["total"] += lag
+        entry["max"] = max(entry["max"], lag)
+        loop_blocked.inc(site=site)
+        loop_block_duration.observe(lag, site=site)
+
+        print(f"[WARN] Boucle d'événements bloquée {lag * 1000:.0f}ms — {site} ({entry['count']}x)")
+        if first_time and stack:
+            print("       " + "\n       ".join(stack))
+
+    def top_sites(self, limit: int = 5) -> List[Tuple[str, Dict]]:
+        """Sites les plus coûteux (durée cumulée décroissante)"""
+        return sorted(self.sites.items(), key=lambda item: item[1]["total"], reverse=True)[:limit]
+
+    def format_stats(self, limit: int = 3) -> str:
+        """Résumé des blocages pour /status"""
+        if not self.sites:
+            return f"✅ Aucun blocage > {self.threshold * 1000:.0f}ms"
+        lines = [
+            f"• `{site[:80]}` — {entry['count']}x, max {entry['max'] * 1000:.0f}ms"
+            for site, entry in self.top_sites(limit)
+        ]
+        return "\n".join(lines)
+
+
+# Instance partagée (seuil configurable via LOOP_LAG_THRESHOLD_MS)
+loop_watchdog = LoopWatchdog(threshold=float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250")) / 1000)
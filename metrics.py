@@ -0,0 +1,269 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    """Percentile par rang le plus proche (liste non vide)"""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(ratio * len(ordered))) - 1]
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label selon le format texte Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    """Formate un ensemble de labels ({a="x",b="y"}), éventuellement complété (le="...")"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Formate un nombre (entiers sans décimales, infini en +Inf)"""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """Base commune: nom, aide, labels et verrou (les observations peuvent venir de threads)"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée, fixée explicitement ou lue via une fonction au moment du rendu"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float], **labels):
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                values[key] = float(function())
+            except Exception:
+                continue
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """Histogramme cumulatif à seaux fixes"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Par série: [compteurs par seau (+Inf en dernier), somme, nombre]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """Mesure la durée d'un bloc `with` et l'enregistre dans l'histogramme"""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2])) for key, series in self._series.items())
+        lines = []
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                bucket_label = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, bucket_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class _Timer:
+    """Context manager utilisé par Histogram.time()"""
+
+    def __init__(self, histogram: Histogram, labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Ensemble des métriques exposées sur /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        # Réutiliser la métrique existante (rechargement de module, cogs rechargés...)
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Rendu au format texte Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Registre partagé par le bot, l'API, les commandes et le renouvellement du token
+registry = MetricsRegistry()
+
+poll_duration = registry.histogram(
+    "moulicord_poll_duration_seconds", "Durée d'une vérification automatique des nouveaux résultats")
+upstream_latency = registry.histogram(
+    "moulicord_upstream_request_duration_seconds", "Latence des requêtes vers l'API Epitech", ("endpoint",))
+upstream_errors = registry.counter(
+    "moulicord_upstream_errors_total", "Réponses en erreur de l'API Epitech (statut HTTP ou network)", ("endpoint", "status"))
+token_refresh_duration = registry.histogram(
+    "moulicord_token_refresh_duration_seconds", "Durée d'un renouvellement du token Epitech", ("outcome",),
+    buckets=(1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0))
+notification_latency = registry.histogram(
+    "moulicord_notification_dispatch_duration_seconds", "Durée d'envoi d'une notification Discord", ("kind",))
+command_latency = registry.histogram(
+    "moulicord_command_duration_seconds", "Durée de traitement des slash commands", ("command", "outcome"))
+cache_hit_ratio = registry.gauge(
+    "moulicord_cache_hit_ratio", "Ratio de succès des caches internes", ("cache",))
+event_loop_lag = registry.histogram(
+    "moulicord_event_loop_lag_seconds", "Retard de planification de la boucle d'événements", buckets=LAG_BUCKETS)
+
+
+async def _handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Répond à une requête HTTP: GET /metrics uniquement"""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        # Ignorer les en-têtes
+        while True:
+            header = await asyncio.wait_for(reader.readline(), timeout=5)
+            if header in (b"\r\n", b"\n", b""):
+                break
+
+        parts = request_line.decode("latin-1").split()
+        path = parts[1].split("?")[0] if len(parts) > 1 else "/"
+        if len(parts) > 1 and parts[0] == "GET" and path == "/metrics":
+            status, content_type, body = "200 OK", "text/plain; version=0.0.4; charset=utf-8", registry.render().encode("utf-8")
+        else:
+            status, content_type, body = "404 Not Found", "text/plain; charset=utf-8", b"Not Found\n"
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+            + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> Optional[asyncio.AbstractServer]:
+    """
+    Démarre le serveur HTTP des métriques
+
+    Args:
+        host: Adresse d'écoute (défaut: METRICS_HOST ou 127.0.0.1)
+        port: Port d'écoute (défaut: METRICS_PORT ou 9108; 0 pour désactiver)
+
+    Returns:
+        Le serveur démarré, ou None si désactivé
+    """
+    host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+    port = port if port is not None else int(os.getenv("METRICS_PORT", "9108"))
+    if not port:
+        return None
+    return await asyncio.start_server(_handle_request, host, port)
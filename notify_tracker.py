@@ -0,0 +1,199 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from metrics import percentile, registry
+
+
+time_to_notify = registry.histogram(
+    "moulicord_time_to_notify_seconds", "Délai entre la date du passage et l'envoi de la notification", ("poll_interval",),
+    buckets=(30.0, 60.0, 120.0, 300.0, 600.0, 900.0, 1800.0, 3600.0, 7200.0, 21600.0))
+notify_stage = registry.histogram(
+    "moulicord_notify_stage_seconds", "Durée de chaque étape avant notification (wait, fetch, prepare, send)", ("stage",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0))
+
+def _parse_run_date(date: str) -> Optional[float]:
+    """Convertit la date ISO d'un passage en timestamp (None si absente ou invalide)"""
+    if not date:
+        return None
+    try:
+        dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except ValueError:
+        return None
+
+
+def format_duration(seconds: float) -> str:
+    """Formate une durée (ex: 42s, 4m12s, 1h05m, 3j04h)"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    if seconds < 86400:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m"
+    return f"{seconds // 86400}j{(seconds % 86400) // 3600:02d}h"
+
+
+class NotifyTracker:
+    """
+    Suivi du délai de bout en bout entre un passage de moulinette et sa notification
+
+    Chaque notification enregistre la date du passage, la vérification qui l'a
+    détecté (identifiant, début, intervalle), l'heure de mise en file et l'heure
+    de fin d'envoi. Les derniers enregistrements sont persistés sur disque.
+    """
+
+    def __init__(self, records_file: str = "notify_latency.json", max_records: int = 2000, max_attempts: int = 5):
+        self.records_file = records_file
+        self.max_records = max_records
+        self.max_attempts = max_attempts
+        self.records: List[Dict] = []
+        # Notifications dont l'envoi a échoué, retentées à la vérification suivante: {"record", "result"}
+        self.pending: List[Dict] = []
+        self._poll_id = 0
+        self._load()
+
+    def _load(self):
+        """Charge les enregistrements précédents"""
+        if not os.path.exists(self.records_file):
+            return
+        try:
+            with open(self.records_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.records = data.get("records", [])
+            self.pending = data.get("pending", [])
+            self._poll_id = max((record.get("poll_id", 0) for record in self.records), default=0)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Historique des délais de notification illisible, réinitialisation: {e}")
+
+    def save(self):
+        """Sauvegarde les derniers enregistrements"""
+        try:
+            tmp_file = f"{self.records_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"records": self.records[-self.max_records:], "pending": self.pending}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.records_file)
+        except Exception as e:
+            print(f"❌ Erreur lors de la sauvegarde des délais de notification: {e}")
+
+    def start_poll(self, interval: str) -> Dict:
+        """
+        Démarre le suivi d'une vérification
+
+        Args:
+            interval: Intervalle de vérification (ex: "300s", ou "startup")
+        """
+        self._poll_id += 1
+        return {"poll_id": self._poll_id, "poll_interval": interval, "poll_started_at": time.time(), "detected_at": None}
+
+    def mark_detected(self, poll: Dict):
+        """Note la fin de la récupération des nouveaux résultats"""
+        poll["detected_at"] = time.time()
+
+    def enqueue(self, poll: Dict, results: List[Dict]) -> List[Dict]:
+        """Crée un enregistrement par résultat au moment de sa mise en file d'envoi"""
+        enqueued_at = time.time()
+        records = []
+        for result in results:
+            records.append({
+                "run_id": result.get("results", {}).get("testRunId"),
+                "project": result.get("project", {}).get("name", "Projet inconnu"),
+                "run_date": result.get("date", ""),
+                "poll_id": poll["poll_id"],
+                "poll_interval": poll["poll_interval"],
+                "poll_started_at": poll["poll_started_at"],
+                "detected_at": poll["detected_at"] or enqueued_at,
+                "enqueued_at": enqueued_at,
+                "simple_sent_at": None,
+                "sent_at": None
+            })
+        return records
+
+    def complete(self, record: Dict):
+        """Note la fin d'envoi d'une notification et met à jour les métriques"""
+        record["sent_at"] = time.time()
+        run_ts = _parse_run_date(record["run_date"])
+        if run_ts is not None:
+            record["time_to_notify"] = max(0.0, record["sent_at"] - run_ts)
+            time_to_notify.observe(record["time_to_notify"], poll_interval=record["poll_interval"])
+            notify_stage.observe(max(0.0, record["poll_started_at"] - run_ts), stage="wait")
+        notify_stage.observe(record["detected_at"] - record["poll_started_at"], stage="fetch")
+        notify_stage.observe(record["enqueued_at"] - record["detected_at"], stage="prepare")
+        notify_stage.observe(record["sent_at"] - record["enqueued_at"], stage="send")
+
+        self.records.append(record)
+        if len(self.records) > self.max_records:
+            del self.records[:len(self.records) - self.max_records]
+
+    def mark_simple_sent(self, record: Dict):
+        """Note l'envoi de la notification simple (jamais renvoyée lors d'un nouvel essai)"""
+        record["simple_sent_at"] = time.time()
+
+    @staticmethod
+    def simple_sent(record: Dict) -> bool:
+        return record.get("simple_sent_at") is not None
+
+    def fail(self, record: Dict, result: Dict) -> bool:
+        """
+        Note l'échec d'envoi d'une notification et la garde pour un nouvel essai
+
+        Returns:
+            True si elle sera retentée, False si le nombre maximum d'essais est atteint
+        """
+        record["attempts"] = record.get("attempts", 0) + 1
+        if record["attempts"] >= self.max_attempts:
+            print(f"❌ Notification abandonnée après {record['attempts']} essais: {record['project']}")
+            return False
+        self.pending.append({"record": record, "result": result})
+        return True
+
+    def take_pending(self) -> List[Tuple[Dict, Dict]]:
+        """Retire les notifications en attente de nouvel essai: [(enregistrement, résultat)]"""
+        pending, self.pending = self.pending, []
+        return [(entry["record"], entry["result"]) for entry in pending]
+
+    def percentiles_by(self, key: str, ratios=(0.5, 0.9, 0.99)) -> Dict[str, Dict]:
+        """
+        Percentiles du délai de notification groupés par jour ou par intervalle
+
+        Args:
+            key: "day" (jour UTC du passage) ou "poll_interval"
+
+        Returns:
+            Dict groupe -> {"count": n, "p50": s, "p90": s, "p99": s}
+        """
+        groups: Dict[str, List[float]] = {}
+        for record in self.records:
+            if "time_to_notify" not in record:
+                continue
+            group = record["run_date"][:10] if key == "day" else record.get(key, "?")
+            groups.setdefault(group, []).append(record["time_to_notify"])
+        return {
+            group: dict({"count": len(values)}, **{f"p{round(ratio * 100)}": percentile(values, ratio) for ratio in ratios})
+            for group, values in groups.items()
+        }
+
+    def format_stats(self, days: int = 5) -> str:
+        """Résumé pour /status: derniers jours et intervalles de vérification"""
+        by_day = self.percentiles_by("day")
+        if not by_day:
+            return "Aucune notification mesurée"
+
+        def _line(label: str, stats: Dict) -> str:
+            return (f"• {label}: p50 {format_duration(stats['p50'])} • p90 {format_duration(stats['p90'])}"
+                    f" • p99 {format_duration(stats['p99'])} ({stats['count']})")
+
+        lines = [_line(day, by_day[day]) for day in sorted(by_day, reverse=True)[:days]]
+        by_interval = self.percentiles_by("poll_interval")
+        lines.append("**Par intervalle de vérification**")
+        lines.extend(_line(interval, stats) for interval, stats in sorted(by_interval.items()))
+        return "\n".join(lines)
+
+
+# Instance partagée entre la surveillance automatique et /status
+notify_tracker = NotifyTracker()
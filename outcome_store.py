@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+def test_outcomes(details: Dict) -> List[List]:
+    """Résultat de chaque test: [tâche, test, réussi, crashé]"""
+    outcomes = []
+    skills = details.get("results", {}).get("skills", {}) or details.get("skills", {})
+    for skill_name, skill_data in skills.items():
+        if isinstance(skill_data, dict):
+            for test in skill_data.get("tests", []) or []:
+                if isinstance(test, dict) and test.get("name"):
+                    outcomes.append([skill_name, test["name"], bool(test.get("passed", False)), bool(test.get("crashed", False))])
+    return outcomes
+
+
+class OutcomeStore:
+    """
+    Résultats test par test des passages dont les détails ont été récupérés
+
+    Source des lignes par test des exports en colonnes (Parquet/Arrow),
+    indépendante de l'index de recherche. Chaque passage est enregistré une
+    seule fois et ajouté à un journal JSON Lines; `version` augmente à chaque
+    ajout, ce qui invalide les exports en cache construits sans lui. Le journal
+    est chargé au premier accès (ou à la phase "cache" du démarrage).
+    """
+
+    def __init__(self, outcome_file: str = "test_outcomes.jsonl"):
+        self.outcome_file = outcome_file
+        self.version = 0
+        self._entries: Dict[str, Dict] = {}
+        self._unsaved: List[str] = []
+        self._loaded = False
+        # load() et save() sont appelés depuis des threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Charge le journal (une seule fois)"""
+        if self._loaded:
+            # Sans le verrou: une sauvegarde en cours dans un thread ne bloque pas la boucle
+            return
+        with self._lock:
+            if not self._loaded and os.path.exists(self.outcome_file):
+                self._read_journal()
+            # Marqué chargé seulement une fois le journal lu (la vérification sans verrou en dépend)
+            self._loaded = True
+
+    def _read_journal(self):
+        """Reconstruit les passages enregistrés à partir du journal"""
+        try:
+            with open(self.outcome_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Dernière ligne tronquée: le passage sera réenregistré
+                        continue
+                    self._entries[entry["run_id"]] = entry
+        except (OSError, KeyError) as e:
+            print(f"⚠️  Résultats par test illisibles, reconstruction: {e}")
+            self._entries = {}
+        self.version = len(self._entries)
+
+    def __contains__(self, run_id) -> bool:
+        self.load()
+        return str(run_id) in self._entries
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self._entries)
+
+    def record(self, result: Dict, details: Optional[Dict]) -> bool:
+        """
+        Enregistre les résultats par test d'un passage à partir de ses détails
+
+        Returns:
+            True si le passage a été ajouté, False s'il était déjà connu ou sans tests
+        """
+        self.load()
+        run_id = result.get("results", {}).get("testRunId")
+        outcomes = test_outcomes(details or {})
+        if run_id is None or not outcomes or str(run_id) in self._entries:
+            return False
+        project = result.get("project", {})
+        self._entries[str(run_id)] = {
+            "run_id": str(run_id),
+            "project": project.get("name", "Projet inconnu"),
+            "module": project.get("module", {}).get("code", ""),
+            "slug": project.get("slug", ""),
+            "date": result.get("date", ""),
+            "outcomes": outcomes
+        }
+        self._unsaved.append(str(run_id))
+        self.version += 1
+        return True
+
+    def entries(self) -> Tuple[int, Dict[str, Dict]]:
+        """(version, copie des passages enregistrés) pour un export"""
+        self.load()
+        return self.version, dict(self._entries)
+
+    def save(self):
+        """Ajoute au journal les passages enregistrés depuis la dernière sauvegarde"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            pending, self._unsaved = self._unsaved, []
+            try:
+                with open(self.outcome_file, 'a', encoding='utf-8') as f:
+                    for run_id in pending:
+                        f.write(json.dumps(self._entries[run_id], ensure_ascii=False) + "\n")
+            except Exception as e:
+                self._unsaved = pending + self._unsaved
+                print(f"❌ Erreur lors de la sauvegarde des résultats par test: {e}")
+
+
+# Instance partagée entre la surveillance automatique, /logs et /export
+outcome_store = OutcomeStore()
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from metrics import cache_hit_ratio, registry
+
+
+prefetch_outcomes = registry.counter(
+    "moulicord_prefetch_total", "Lectures et préchargements spéculatifs (hit, inflight, miss, fetched, wasted)",
+    ("cache", "outcome"))
+
+
+class Prefetcher:
+    """
+    Préchargement spéculatif en arrière-plan, à concurrence bornée
+
+    Une commande annonce les clés que l'utilisateur a le plus de chances de
+    choisir (schedule); elles sont récupérées dans des threads pendant que le
+    menu est affiché. Le callback du menu lit ensuite la valeur en mémoire,
+    attend le préchargement en cours, ou la récupère lui-même en dernier recours.
+    Une valeur préchargée expirée ou évincée sans avoir été lue compte comme
+    un préchargement gaspillé.
+    """
+
+    def __init__(self, name: str, max_entries: int = 32, concurrency: int = 3, ttl: float = 300.0):
+        self.name = name
+        self.max_entries = max_entries
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self.hits = 0
+        self.inflight_hits = 0
+        self.misses = 0
+        self.fetched = 0
+        self.wasted = 0
+        # clé -> (valeur, horodatage, déjà lue)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, bool]]" = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        cache_hit_ratio.set_function(lambda: self.hit_ratio, cache=f"prefetch_{name}")
+
+    def _count(self, outcome: str):
+        prefetch_outcomes.inc(cache=self.name, outcome=outcome)
+
+    def _discard(self, key: Hashable):
+        _, _, consumed = self._entries.pop(key)
+        if not consumed:
+            self.wasted += 1
+            self._count("wasted")
+
+    def _lookup(self, key: Hashable) -> Optional[Tuple[Any, float, bool]]:
+        """Entrée encore valide pour `key` (les entrées expirées sont retirées)"""
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry[1] > self.ttl:
+            self._discard(key)
+            return None
+        return entry
+
+    def _store(self, key: Hashable, value: Any, consumed: bool):
+        if key in self._entries:
+            self._entries.pop(key)
+        self._entries[key] = (value, time.time(), consumed)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def schedule(self, keys: Iterable[Hashable], fetch: Callable[[Hashable], Any], refresh: bool = False) -> int:
+        """
+        Lance le préchargement des clés absentes du cache (sans attendre)
+
+        Args:
+            keys: Clés à précharger, par ordre de priorité
+            fetch: Fonction bloquante qui récupère la valeur d'une clé (None = échec)
+            refresh: Récupérer aussi les clés déjà en mémoire (valeur périmée)
+
+        Returns:
+            Nombre de préchargements lancés
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        started = 0
+        for key in keys:
+            if key in self._pending or (not refresh and self._lookup(key) is not None):
+                continue
+            task = loop.create_task(self._prefetch(key, fetch))
+            self._pending[key] = task
+            task.add_done_callback(lambda _, key=key: self._pending.pop(key, None))
+            started += 1
+        return started
+
+    async def _prefetch(self, key: Hashable, fetch: Callable[[Hashable], Any]) -> Any:
+        async with self._semaphore:
+            try:
+                value = await asyncio.to_thread(fetch, key)
+            except Exception as e:
+                print(f"⚠️  Préchargement {self.name} {key} en échec: {e}")
+                return None
+        if value:
+            self.fetched += 1
+            self._count("fetched")
+            self._store(key, value, consumed=False)
+        return value
+
+    async def get(self, key: Hashable, fetch: Callable[[Hashable], Any]) -> Any:
+        """
+        Valeur de `key`: en mémoire, via le préchargement en cours, sinon récupérée directement
+
+        Args:
+            key: Clé demandée
+            fetch: Fonction bloquante utilisée si rien n'a été préchargé
+
+        Returns:
+            Valeur récupérée (None si la récupération a échoué)
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], entry[1], True)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._count("hit")
+            return entry[0]
+
+        task = self._pending.get(key)
+        if task is not None:
+            value = await asyncio.shield(task)
+            if value:
+                self._store(key, value, consumed=True)
+                self.inflight_hits += 1
+                self._count("inflight")
+                return value
+
+        self.misses += 1
+        self._count("miss")
+        value = await asyncio.to_thread(fetch, key)
+        if value:
+            self._store(key, value, consumed=True)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Oublie la valeur d'une clé (ex: historique d'un projet qui a un nouveau passage)"""
+        if key in self._entries:
+            self._discard(key)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Part des lectures servies par un préchargement (en mémoire ou en cours)"""
+        total = self.hits + self.inflight_hits + self.misses
+        return (self.hits + self.inflight_hits) / total if total else 0.0
+
+    def stats(self) -> Dict:
+        """Retourne les statistiques du préchargement"""
+        return {
+            "entries": len(self._entries),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "inflight_hits": self.inflight_hits,
+            "misses": self.misses,
+            "fetched": self.fetched,
+            "wasted": self.wasted,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def format_stats(self) -> str:
+        """Formate les statistiques pour un champ d'embed Discord"""
+        return (
+            f"🎯 {self.hit_ratio * 100:.1f}% servis d'avance "
+            f"({self.hits} en mémoire, {self.inflight_hits} en cours, {self.misses} miss)\n"
+            f"📥 {self.fetched} préchargés • 🗑️ {self.wasted} inutilisés • {len(self._entries)} en mémoire"
+        )
+
+
+# Instances partagées: détails des passages (/logs, par testRunId) et historiques (/history, par "module/projet")
+details_prefetcher = Prefetcher("details")
+history_prefetcher = Prefetcher("history")
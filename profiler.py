@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List
+
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACEMALLOC_FRAMES = 10
+
+
+def _frame_label(frame) -> str:
+    """Libellé d'une frame pour le format « collapsed stacks » (fonction (fichier:ligne))"""
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(PROJECT_DIR):
+        filename = os.path.relpath(filename, PROJECT_DIR)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{frame.f_lineno})".replace(";", ",")
+
+
+def _collapse(frame, thread_name: str) -> str:
+    """Pile d'appels de la plus externe à la plus interne, séparée par des points-virgules"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage, borné dans le temps, pour le processus en cours
+
+    Un thread lit périodiquement les piles de tous les threads (sys._current_frames)
+    et les agrège au format « collapsed stacks » (flamegraph.pl, speedscope...).
+    Aucun coût en dehors d'un profil: rien n'est installé ni démarré au repos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _sample(self, duration: float, interval: float) -> Dict:
+        """Échantillonne les piles pendant `duration` secondes (exécuté dans un thread)"""
+        stacks: Counter = Counter()
+        own_id = threading.get_ident()
+        samples = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    stacks[_collapse(frame, names.get(thread_id, f"thread-{thread_id}"))] += 1
+            samples += 1
+            time.sleep(interval)
+        return {"stacks": stacks, "samples": samples}
+
+    async def profile(self, duration: float = 15.0, interval: float = 0.01, top_allocations: int = 25) -> Dict:
+        """
+        Lance un profil CPU (échantillonnage) et mémoire (tracemalloc) de `duration` secondes
+
+        Returns:
+            Dict avec 'collapsed' (texte), 'allocations' (texte), 'samples',
+            'top_frames' et 'top_allocations'
+
+        Raises:
+            RuntimeError: si un profil est déjà en cours
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Un profil est déjà en cours")
+        started_tracemalloc = False
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                started_tracemalloc = True
+
+            result = await asyncio.get_running_loop().run_in_executor(None, self._sample, duration, interval)
+
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self._lock.release()
+
+        stacks: Counter = result["stacks"]
+        collapsed = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+        # Temps propre par fonction (dernière frame de chaque pile)
+        leaves: Counter = Counter()
+        for stack, count in stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(stacks.values()) or 1
+
+        stats = snapshot.statistics("traceback")[:top_allocations]
+        allocation_lines: List[str] = [
+            f"Top {len(stats)} des allocations vivantes pendant le profil ({duration:.0f}s)",
+            ""
+        ]
+        top_allocations_summary = []
+        for index, stat in enumerate(stats, 1):
+            # Site attribué: frame la plus récente appartenant au bot, sinon la plus récente
+            project_frames = [frame for frame in stat.traceback if frame.filename.startswith(PROJECT_DIR)]
+            frame = project_frames[-1] if project_frames else stat.traceback[-1]
+            filename = os.path.relpath(frame.filename, PROJECT_DIR) if project_frames else frame.filename
+            site = f"{filename}:{frame.lineno}"
+            top_allocations_summary.append((site, stat.size, stat.count))
+            allocation_lines.append(f"#{index} {stat.size / 1024:.1f} Ko en {stat.count} blocs — {site}")
+            allocation_lines.extend("    " + line for line in stat.traceback.format())
+            allocation_lines.append("")
+
+        return {
+            "collapsed": collapsed,
+            "allocations": "\n".join(allocation_lines),
+            "samples": result["samples"],
+            "top_frames": [(frame, count / total) for frame, count in leaves.most_common(10)],
+            "top_allocations": top_allocations_summary
+        }
+
+
+# Instance partagée par la commande /profile
+profiler = SamplingProfiler()
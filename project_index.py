@@ -0,0 +1,178 @@
+import re
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def project_id_of(result: Dict) -> Optional[str]:
+    """Identifiant "module/projet" d'un résultat, tel qu'attendu par get_project_history (None si incomplet)"""
+    project = result.get("project", {})
+    module_code = project.get("module", {}).get("code", "")
+    project_slug = project.get("slug", "")
+    return f"{module_code}/{project_slug}" if module_code and project_slug else None
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents (« Défi » et « defi » se retrouvent)"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _fuzzy_pattern(query: str) -> "re.Pattern":
+    """Sous-séquence: les caractères de la requête, dans l'ordre, avec des trous (« cpd9 » → cpoolday09)"""
+    chars = [re.escape(char) for char in query]
+    return re.compile(chars[0] + "".join(f"[^{char}]*{char}" for char in chars[1:]))
+
+
+class ProjectIndex:
+    """
+    Index résident des projets (code du module, slug et nom) pour l'autocomplétion
+
+    Alimenté à chaque ingestion de résultats /me/{year}, il répond sans parcourir
+    les résultats: préfixes de mots via une liste triée (bisect), puis sous-chaîne,
+    puis correspondance approximative par sous-séquence. À pertinence égale, les
+    projets au passage le plus récent viennent en premier.
+    """
+
+    def __init__(self):
+        # project_id -> {"name", "module", "slug", "date", "haystack", "tokens"}
+        self._projects: Dict[str, Dict] = {}
+        # (mot, project_id) triés, pour la recherche par préfixe
+        self._tokens: List[Tuple[str, str]] = []
+        # identifiant normalisé -> project_id (correspondance exacte)
+        self._normalized_ids: Dict[str, str] = {}
+        self._last_observed: Optional[List[Dict]] = None
+        # Projets du plus récent au plus ancien (recalculé après une ingestion)
+        self._recent_order: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._projects)
+
+    def __contains__(self, project_id: str) -> bool:
+        return project_id in self._projects
+
+    def get(self, project_id: str) -> Optional[Dict]:
+        return self._projects.get(project_id)
+
+    def observe(self, results: List[Dict]) -> int:
+        """
+        Ajoute les projets de résultats ingérés et met à jour la date de leur dernier passage
+
+        Un appel répété avec la même liste (instantané inchangé) ne coûte rien.
+
+        Returns:
+            Nombre de nouveaux projets
+        """
+        if results is self._last_observed:
+            return 0
+        self._last_observed = results
+        new_tokens = []
+        for result in results:
+            project_id = project_id_of(result)
+            if not project_id:
+                continue
+            date = result.get("date", "")
+            entry = self._projects.get(project_id)
+            if entry is not None:
+                if date > entry["date"]:
+                    entry["date"] = date
+                    self._recent_order = None
+                continue
+            project = result["project"]
+            name = project.get("name") or project["slug"]
+            haystack = normalize(f"{project_id} {name}")
+            tokens = set(TOKEN_RE.findall(haystack)) | {normalize(project["module"]["code"]), normalize(project["slug"])}
+            self._projects[project_id] = {
+                "name": name,
+                "module": project["module"]["code"],
+                "slug": project["slug"],
+                "date": date,
+                "haystack": haystack,
+                "tokens": tokens
+            }
+            self._normalized_ids[normalize(project_id)] = project_id
+            new_tokens.extend((token, project_id) for token in tokens)
+        if new_tokens:
+            self._recent_order = None
+            # Un seul tri par ingestion (liste déjà triée + ajouts: quasi linéaire)
+            self._tokens.extend(new_tokens)
+            self._tokens.sort()
+        return len({project_id for _, project_id in new_tokens})
+
+    def _prefix_matches(self, term: str) -> set:
+        """Projets dont un mot commence par `term` (tranche contiguë de la liste triée)"""
+        start = bisect_left(self._tokens, (term, ""))
+        end = bisect_right(self._tokens, (term + "\uffff", ""), start)
+        return {project_id for _, project_id in self._tokens[start:end]}
+
+    def _by_recency(self, project_ids, limit: int) -> List[str]:
+        """Les `limit` projets les plus récents parmi `project_ids`"""
+        if self._recent_order is None:
+            self._recent_order = sorted(self._projects, key=lambda project_id: self._projects[project_id]["date"], reverse=True)
+        if len(project_ids) <= limit:
+            return sorted(project_ids, key=lambda project_id: self._projects[project_id]["date"], reverse=True)
+        found = []
+        for project_id in self._recent_order:
+            if project_id in project_ids:
+                found.append(project_id)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def recent(self, limit: int = 25) -> List[str]:
+        """Projets au passage le plus récent d'abord"""
+        return self._by_recency(self._projects, limit)
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        """
+        Projets correspondant à la requête, les plus pertinents d'abord
+
+        Args:
+            query: Texte saisi (code du module, slug ou nom, éventuellement partiel)
+            limit: Nombre maximum de projets (25 pour l'autocomplétion Discord)
+
+        Returns:
+            Identifiants "module/projet"
+        """
+        query = normalize(query).strip()
+        if not query:
+            return self.recent(limit)
+
+        # 1. Identifiant exact, puis chaque mot de la requête est le début d'un mot du projet
+        exact = [self._normalized_ids[query]] if query in self._normalized_ids else []
+        prefix = set()
+        for position, term in enumerate(TOKEN_RE.findall(query)):
+            prefix = self._prefix_matches(term) if position == 0 else prefix & self._prefix_matches(term)
+            if not prefix:
+                break
+        prefix.difference_update(exact)
+        found = exact + self._by_recency(prefix, limit - len(exact))
+        if len(found) >= limit:
+            return found
+
+        # 2. Sous-chaîne, puis 3. sous-séquence (fautes de frappe, abréviations)
+        seen = set(found)
+        substring = {project_id for project_id, entry in self._projects.items()
+                     if project_id not in seen and query in entry["haystack"]}
+        found += self._by_recency(substring, limit - len(found))
+        if len(found) < limit:
+            pattern = _fuzzy_pattern(query.replace(" ", ""))
+            seen.update(found)
+            fuzzy = {project_id for project_id, entry in self._projects.items()
+                     if project_id not in seen and pattern.search(entry["haystack"])}
+            found += self._by_recency(fuzzy, limit - len(found))
+        return found
+
+    def timed_search(self, query: str, limit: int = 25):
+        """Recherche et retourne (résultats, durée en millisecondes)"""
+        start = time.perf_counter()
+        results = self.search(query, limit)
+        return results, (time.perf_counter() - start) * 1000
+
+
+# Instance partagée entre l'ingestion des résultats (epitech_api.py) et /history
+project_index = ProjectIndex()
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+def results_signature(results: List[Dict]) -> int:
+    """
+    Calcule une empreinte légère d'une liste de résultats
+
+    Deux listes contenant les mêmes passages (projet + testRunId + date)
+    ont la même empreinte, quel que soit leur ordre.
+    """
+    keys = frozenset(
+        (
+            result.get("project", {}).get("slug", ""),
+            result.get("results", {}).get("testRunId"),
+            result.get("date", ""),
+        )
+        for result in results
+    )
+    return hash(keys)
+
+
+class RenderCache:
+    """Cache LRU des embeds déjà rendus, indexé par (vue, arguments, génération de données)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._signature: Optional[int] = None
+        self._entries: "OrderedDict[Tuple[str, Hashable, int], Any]" = OrderedDict()
+
+    def bump_generation(self) -> int:
+        """Passe à une nouvelle génération de données et invalide les rendus précédents"""
+        self.generation += 1
+        # Les clés contiennent la génération : les anciennes entrées ne seront plus jamais lues
+        self._entries.clear()
+        return self.generation
+
+    def observe_results(self, results: List[Dict]) -> int:
+        """
+        Signale l'ingestion d'une liste de résultats
+
+        La génération n'est incrémentée que si le contenu a réellement changé,
+        ce qui arrive au plus une fois par vérification automatique.
+
+        Returns:
+            Génération courante
+        """
+        signature = results_signature(results)
+        if signature != self._signature:
+            self._signature = signature
+            self.bump_generation()
+        return self.generation
+
+    def get_or_render(self, view: str, args: Hashable, render: Callable[[], Any]) -> Any:
+        """
+        Retourne une copie de l'embed en cache, ou le construit via `render`
+
+        Args:
+            view: Nom de la vue (ex: "results", "history_run")
+            args: Arguments hashables qui influencent le rendu
+            render: Fonction sans argument qui construit l'embed
+
+        Returns:
+            Copie de l'embed, modifiable par l'appelant (footer, etc.)
+        """
+        key = (view, args, self.generation)
+        embed = self._entries.get(key)
+        if embed is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embed.copy()
+
+        self.misses += 1
+        embed = render()
+        self._entries[key] = embed
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return embed.copy()
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio de succès du cache (0.0 si aucune requête)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict:
+        """Retourne les statistiques du cache"""
+        return {
+            "generation": self.generation,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def format_stats(self) -> str:
+        """Formate les statistiques pour un champ d'embed Discord"""
+        return (
+            f"🎯 Ratio: **{self.hit_ratio * 100:.1f}%** ({self.hits} hits / {self.misses} miss)\n"
+            f"🧬 Génération: {self.generation} • {len(self._entries)} rendus en cache"
+        )
+
+
+# Instance partagée par toutes les vues (survit au remplacement de l'instance EpitechAPI)
+embed_cache = RenderCache()
@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from notify_tracker import format_duration
+
+
+class ResultsSnapshot:
+    """
+    Dernier état connu des résultats /me/{year}, résident en mémoire
+
+    Chargé depuis l'historique local au démarrage, il permet de répondre aux
+    commandes en lecture (/results, /stats, /status...) avant l'obtention du
+    premier token. Chaque récupération réussie le remplace en une seule
+    affectation: un lecteur voit soit l'ancien état complet, soit le nouveau.
+    """
+
+    def __init__(self, storage_file: str = "results_history.json"):
+        self.storage_file = storage_file
+        # (résultats, horodatage des données, source "local" ou "live")
+        self._state: Tuple[List[Dict], Optional[float], str] = ([], None, "local")
+
+    @property
+    def results(self) -> List[Dict]:
+        return self._state[0]
+
+    @property
+    def updated_at(self) -> Optional[float]:
+        return self._state[1]
+
+    @property
+    def is_live(self) -> bool:
+        return self._state[2] == "live"
+
+    def load(self) -> int:
+        """
+        Charge l'instantané persisté (sans effet si des données en direct sont déjà là)
+
+        Returns:
+            Nombre de résultats disponibles
+        """
+        if self.is_live:
+            return len(self.results)
+        try:
+            with open(self.storage_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            results = data.get("results", []) if isinstance(data, dict) else []
+            try:
+                updated_at = datetime.fromisoformat(data["last_update"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                updated_at = os.path.getmtime(self.storage_file)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Aucun instantané local utilisable: {e}")
+            return 0
+        if not self.is_live:
+            self._state = (results, updated_at, "local")
+        return len(results)
+
+    def swap(self, results: List[Dict]):
+        """Remplace l'instantané par des données fraîches de l'API (affectation atomique)"""
+        self._state = (results, time.time(), "live")
+
+    def age(self) -> Optional[float]:
+        """Âge des données en secondes (None si aucune donnée)"""
+        return time.time() - self.updated_at if self.updated_at is not None else None
+
+    def staleness(self) -> str:
+        """Marque d'ancienneté affichée avec des données servies depuis l'instantané"""
+        if self.updated_at is None:
+            return "💾 Aucune donnée locale"
+        origin = "dernière récupération" if self.is_live else "instantané local"
+        date = datetime.fromtimestamp(self.updated_at).strftime("%d/%m %H:%M")
+        return f"💾 {origin.capitalize()} du {date} (il y a {format_duration(self.age())})"
+
+
+# Instance partagée entre le client API (mise à jour) et les commandes (lecture)
+results_snapshot = ResultsSnapshot()
@@ -0,0 +1,320 @@
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional
+
+
+def project_id_of(result: Dict) -> str:
+    """Retourne l'identifiant "module/projet" d'un résultat (chaîne vide si incomplet)"""
+    project = result.get("project", {})
+    module_code = project.get("module", {}).get("code", "")
+    project_slug = project.get("slug", "")
+    return f"{module_code}/{project_slug}" if module_code and project_slug else ""
+
+
+def _skill_summary(skill_data: Dict) -> Dict:
+    """Réduit une compétence aux compteurs utiles à la comparaison"""
+    return {
+        "passed": skill_data.get("passed", 0),
+        "count": skill_data.get("count", 0),
+        "crashed": skill_data.get("crashed", 0),
+        "mandatoryFailed": skill_data.get("mandatoryFailed", 0)
+    }
+
+
+def _is_passing(summary: Optional[Dict]) -> bool:
+    """Une tâche est réussie si tous ses tests passent"""
+    return bool(summary) and summary["count"] > 0 and summary["passed"] == summary["count"]
+
+
+def _lint_counts(items: List[Dict]) -> Dict[str, int]:
+    """Extrait les compteurs lint.* d'une liste d'externalItems"""
+    lint = {}
+    for item in items or []:
+        item_type = item.get("type", "")
+        if item_type.startswith("lint."):
+            lint[item_type.replace("lint.", "")] = item.get("value", 0)
+    return lint
+
+
+def _failing_tests(details: Optional[Dict]) -> Dict[str, List[str]]:
+    """Noms des tests en échec, par tâche, à partir des détails d'un passage"""
+    failing = {}
+    skills = (details or {}).get("results", {}).get("skills", {}) or (details or {}).get("skills", {})
+    for skill_name, skill_data in skills.items():
+        if not isinstance(skill_data, dict):
+            continue
+        names = [
+            test.get("name", "")
+            for test in skill_data.get("tests", []) or []
+            if isinstance(test, dict) and not test.get("passed", False)
+        ]
+        if names:
+            failing[skill_name] = names
+    return failing
+
+
+def _rate(skills: Dict[str, Dict]) -> float:
+    """Taux de réussite global à partir des compétences résumées"""
+    total = sum(skill["count"] for skill in skills.values())
+    passed = sum(skill["passed"] for skill in skills.values())
+    return (passed / total * 100) if total > 0 else 0
+
+
+class RunDiffStore:
+    """
+    Moteur de comparaison entre deux passages successifs d'un même projet
+
+    Seul le dernier passage de chaque projet est conservé (résumé par
+    compétence), si bien qu'un nouveau passage se compare en O(compétences)
+    quelle que soit la longueur de l'historique. Les différences calculées
+    sont stockées pour /history, les notifications et les exports.
+    """
+
+    def __init__(self, diff_file: str = "run_diffs.json"):
+        self.diff_file = diff_file
+        self.last_runs: Dict[str, Dict] = {}
+        self.diffs: Dict[str, Dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Charge les différences et les derniers passages depuis le disque"""
+        if not os.path.exists(self.diff_file):
+            return
+        try:
+            with open(self.diff_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.last_runs = data.get("last_runs", {})
+            self.diffs = data.get("diffs", {})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Historique des différences illisible, réinitialisation: {e}")
+
+    def save(self):
+        """Sauvegarde sur le disque (uniquement si quelque chose a changé)"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._write({"last_runs": self.last_runs, "diffs": self.diffs})
+
+    async def save_async(self):
+        """
+        save() sans bloquer la boucle d'événements
+
+        L'état est copié sur la boucle (qui seule le modifie), puis sérialisé et
+        écrit dans un thread.
+        """
+        if not self._dirty:
+            return
+        self._dirty = False
+        data = {"last_runs": {project_id: dict(run) for project_id, run in self.last_runs.items()},
+                "diffs": dict(self.diffs)}
+        await asyncio.to_thread(self._write, data)
+
+    def _write(self, data: Dict):
+        try:
+            tmp_file = f"{self.diff_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.diff_file)
+        except Exception as e:
+            self._dirty = True
+            print(f"❌ Erreur lors de la sauvegarde des différences: {e}")
+
+    def _snapshot(self, result: Dict) -> Dict:
+        """Résumé compact d'un passage, conservé comme point de comparaison"""
+        results = result.get("results", {})
+        return {
+            "run_id": results.get("testRunId"),
+            "date": result.get("date", ""),
+            "skills": {name: _skill_summary(data) for name, data in results.get("skills", {}).items()},
+            "lint": _lint_counts(results.get("externalItems", [])),
+            "failing_tests": {},
+            # Tests en échec connus (détails récupérés): sinon aucune comparaison test par test
+            "has_details": False
+        }
+
+    def seed(self, results: List[Dict]):
+        """Initialise les points de comparaison à partir de résultats déjà stockés"""
+        for result in results:
+            project_id = project_id_of(result)
+            if not project_id:
+                continue
+            known = self.last_runs.get(project_id)
+            if not known or known.get("date", "") < result.get("date", ""):
+                self.last_runs[project_id] = self._snapshot(result)
+                self._dirty = True
+
+    def record(self, result: Dict) -> Optional[Dict]:
+        """
+        Compare un nouveau passage au précédent passage du même projet
+
+        Args:
+            result: Nouveau résultat (format /me/{year})
+
+        Returns:
+            La différence calculée, ou None s'il n'y a pas de passage précédent
+        """
+        project_id = project_id_of(result)
+        if not project_id:
+            return None
+
+        current = self._snapshot(result)
+        previous = self.last_runs.get(project_id)
+        if previous and previous.get("date", "") >= current["date"]:
+            # Passage déjà connu ou plus ancien que la référence
+            return self.diffs.get(str(current["run_id"]))
+
+        self.last_runs[project_id] = current
+        self._dirty = True
+        if not previous:
+            return None
+
+        diff = {
+            "run_id": current["run_id"],
+            "previous_run_id": previous.get("run_id"),
+            "project_id": project_id,
+            "date": current["date"],
+            "rate_before": _rate(previous["skills"]),
+            "rate_after": _rate(current["skills"]),
+            "newly_failing": [],
+            "newly_passing": [],
+            "new_tasks": [],
+            "removed_tasks": [],
+            "crash_changes": {},
+            "tests_newly_failing": [],
+            "tests_newly_passing": [],
+            "lint_delta": {}
+        }
+
+        previous_skills = previous["skills"]
+        for name, summary in current["skills"].items():
+            before = previous_skills.get(name)
+            if before == summary:
+                # Compétence inchangée: aucun travail supplémentaire
+                continue
+            if before is None:
+                diff["new_tasks"].append(name)
+            elif _is_passing(before) and not _is_passing(summary):
+                diff["newly_failing"].append(name)
+            elif not _is_passing(before) and _is_passing(summary):
+                diff["newly_passing"].append(name)
+            crashed_before = before["crashed"] if before else 0
+            if crashed_before != summary["crashed"]:
+                diff["crash_changes"][name] = [crashed_before, summary["crashed"]]
+        diff["removed_tasks"] = [name for name in previous_skills if name not in current["skills"]]
+
+        for level in set(previous["lint"]) | set(current["lint"]):
+            delta = current["lint"].get(level, 0) - previous["lint"].get(level, 0)
+            if delta:
+                diff["lint_delta"][level] = delta
+
+        # Conserver les tests en échec du passage précédent pour l'enrichissement ultérieur
+        # (sauf s'il n'a jamais été enrichi: passages initiaux de seed, détails indisponibles)
+        if previous.get("has_details", bool(previous.get("failing_tests"))):
+            current["previous_failing_tests"] = previous.get("failing_tests", {})
+        self.diffs[str(current["run_id"])] = diff
+        return diff
+
+    def enrich_with_details(self, result: Dict, details: Optional[Dict]) -> Optional[Dict]:
+        """
+        Complète la différence au niveau des tests à partir des détails du passage
+
+        Seules les tâches dont les compteurs ou les tests en échec ont changé sont
+        comparées test par test, et seulement si les détails du passage précédent
+        étaient connus (sinon tous ses tests en échec paraîtraient nouveaux).
+        """
+        project_id = project_id_of(result)
+        run_id = result.get("results", {}).get("testRunId")
+        current = self.last_runs.get(project_id)
+        if not details or not current or current.get("run_id") != run_id:
+            return None
+
+        failing = _failing_tests(details)
+        current["failing_tests"] = failing
+        current["has_details"] = True
+        lint = _lint_counts(details.get("results", {}).get("externalItems", []) or details.get("externalItems", []))
+        if lint and not current["lint"]:
+            current["lint"] = lint
+        self._dirty = True
+
+        diff = self.diffs.get(str(run_id))
+        if "previous_failing_tests" not in current:
+            return diff
+        previous_failing = current.pop("previous_failing_tests")
+        if not diff:
+            return None
+        changed = set(diff["newly_failing"]) | set(diff["newly_passing"]) | set(diff["new_tasks"]) | set(diff["crash_changes"])
+        changed |= {name for name in failing if failing[name] != previous_failing.get(name)}
+        for name in changed:
+            before = set(previous_failing.get(name, []))
+            after = set(failing.get(name, []))
+            diff["tests_newly_failing"].extend(f"{name}: {test}" for test in sorted(after - before))
+            diff["tests_newly_passing"].extend(f"{name}: {test}" for test in sorted(before - after))
+        return diff
+
+    def get(self, run_id) -> Optional[Dict]:
+        """Retourne la différence stockée pour un passage (testRunId)"""
+        return self.diffs.get(str(run_id))
+
+
+def format_diff(diff: Optional[Dict], max_items: int = 5) -> str:
+    """
+    Formate une différence pour Discord
+
+    Args:
+        diff: Différence calculée par RunDiffStore
+        max_items: Nombre maximum d'éléments affichés par catégorie
+
+    Returns:
+        Texte multi-lignes (chaîne vide si rien n'a changé)
+    """
+    if not diff:
+        return ""
+
+    def _list(items: List[str]) -> str:
+        shown = ", ".join(f"`{item}`" for item in items[:max_items])
+        return shown + (f" (+{len(items) - max_items})" if len(items) > max_items else "")
+
+    lines = []
+    evolution = diff["rate_after"] - diff["rate_before"]
+    if evolution:
+        emoji = "📈" if evolution > 0 else "📉"
+        lines.append(f"{emoji} {diff['rate_before']:.1f}% → {diff['rate_after']:.1f}%")
+    if diff["newly_failing"]:
+        lines.append(f"❌ Régressions: {_list(diff['newly_failing'])}")
+    if diff["newly_passing"]:
+        lines.append(f"✅ Corrigées: {_list(diff['newly_passing'])}")
+    if diff["new_tasks"]:
+        lines.append(f"🆕 Nouvelles tâches: {_list(diff['new_tasks'])}")
+    if diff["crash_changes"]:
+        crashes = [f"{name} {before}→{after}" for name, (before, after) in diff["crash_changes"].items()]
+        lines.append(f"💥 Crashs: {_list(crashes)}")
+    if diff["tests_newly_failing"]:
+        lines.append(f"🔻 Tests cassés: {_list(diff['tests_newly_failing'])}")
+    if diff["tests_newly_passing"]:
+        lines.append(f"🔺 Tests réparés: {_list(diff['tests_newly_passing'])}")
+    if diff["lint_delta"]:
+        lint = ", ".join(f"{level} {delta:+d}" for level, delta in sorted(diff["lint_delta"].items()))
+        lines.append(f"🔍 Lint: {lint}")
+    return "\n".join(lines)
+
+
+def format_diff_inline(diff: Optional[Dict]) -> str:
+    """Résumé d'une ligne d'une différence (colonne d'export)"""
+    if not diff:
+        return ""
+    parts = []
+    if diff["newly_failing"]:
+        parts.append(f"régressions: {', '.join(diff['newly_failing'])}")
+    if diff["newly_passing"]:
+        parts.append(f"corrigées: {', '.join(diff['newly_passing'])}")
+    if diff["crash_changes"]:
+        parts.append(f"crashs: {', '.join(diff['crash_changes'])}")
+    if diff["lint_delta"]:
+        parts.append("lint " + " ".join(f"{level}{delta:+d}" for level, delta in sorted(diff["lint_delta"].items())))
+    return "; ".join(parts)
+
+
+# Instance partagée entre la surveillance automatique et les commandes
+run_diff_store = RunDiffStore()
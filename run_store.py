@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+
+def run_id_of(result: Dict) -> Optional[int]:
+    """testRunId d'un passage (None s'il est absent)"""
+    return result.get("results", {}).get("testRunId")
+
+
+class RunStore:
+    """
+    Passages partagés par toutes les vues, indexés par testRunId
+
+    Les vues Discord restent ouvertes 5 minutes: au lieu de garder chacune sa
+    propre liste de résultats (compétences comprises), elles ne conservent que
+    des testRunId et un curseur de page, et relisent ici le contenu de la page
+    affichée. Une seule copie de chaque passage est gardée (la plus récente);
+    les passages les moins récemment consultés sont évincés au-delà de
+    `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._runs: "OrderedDict[int, Dict]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __contains__(self, run_id: int) -> bool:
+        return run_id in self._runs
+
+    def put_many(self, results: Iterable[Dict]) -> List[int]:
+        """
+        Enregistre des passages (remplace les copies précédentes)
+
+        Returns:
+            testRunId des passages, dans l'ordre (ceux sans identifiant sont ignorés)
+        """
+        run_ids = []
+        for result in results:
+            run_id = run_id_of(result)
+            if run_id is None:
+                continue
+            self._runs[run_id] = result
+            self._runs.move_to_end(run_id)
+            run_ids.append(run_id)
+        while len(self._runs) > self.max_entries:
+            self._runs.popitem(last=False)
+        return run_ids
+
+    def get(self, run_id: int) -> Optional[Dict]:
+        result = self._runs.get(run_id)
+        if result is not None:
+            self._runs.move_to_end(run_id)
+        return result
+
+    def get_many(self, run_ids: Iterable[int]) -> List[Optional[Dict]]:
+        """Passages dans l'ordre demandé (None pour ceux qui ont été évincés)"""
+        return [self.get(run_id) for run_id in run_ids]
+
+
+# Instance partagée entre le client API (ingestion) et les vues /history et /logs
+run_store = RunStore()
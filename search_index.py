@@ -0,0 +1,331 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from trace_parser import strip_ansi
+
+
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+MAX_STORED_TEXT = 64 * 1024
+SNIPPET_RADIUS = 80
+# Compaction du journal au-delà de cette taille (et s'il a doublé depuis la précédente)
+COMPACT_THRESHOLD = 32 * 1024 * 1024
+# Passages les plus récents dont la trace est conservée pour les extraits lors d'une compaction
+KEEP_TEXT_RUNS = 500
+
+
+def tokenize(text: str) -> Set[str]:
+    """Découpe un texte en termes uniques (minuscules, alphanumériques)"""
+    return set(TOKEN_RE.findall(text.lower()))
+
+
+def _iter_test_names(details: Dict) -> Iterable[str]:
+    """Parcourt les noms de tâches et de tests présents dans les détails d'un passage"""
+    skills = details.get("results", {}).get("skills", {}) or details.get("skills", {})
+    for skill_name, skill_data in skills.items():
+        yield skill_name
+        if isinstance(skill_data, dict):
+            for test in skill_data.get("tests", []) or []:
+                if isinstance(test, dict) and test.get("name"):
+                    yield test["name"]
+
+
+def _trace_text(details: Dict) -> str:
+    """Retourne la trace `trace-pool` nettoyée d'un passage (chaîne vide si absente)"""
+    for item in details.get("externalItems", []) or []:
+        if item.get("type") == "trace-pool":
+            return strip_ansi(item.get("comment", "") or "")
+    return ""
+
+
+def build_entry(result: Dict, details: Optional[Dict]) -> Optional[Tuple[str, Dict, Set[str], str]]:
+    """
+    Prépare l'entrée d'index d'un passage (tokenisation de la trace, sans modifier l'index)
+
+    Fonction pure, appelée dans un thread: une trace peut peser plusieurs mégaoctets.
+
+    Returns:
+        (testRunId, document, termes, texte), ou None si le passage n'a pas d'identifiant
+    """
+    run_id = result.get("results", {}).get("testRunId")
+    if run_id is None:
+        return None
+
+    project = result.get("project", {})
+    test_names = list(dict.fromkeys(_iter_test_names(details or {}))) or list(result.get("results", {}).get("skills", {}).keys())
+    trace = _trace_text(details or {})
+    header = f"{project.get('name', '')} {project.get('slug', '')} {project.get('module', {}).get('code', '')}"
+
+    tokens = tokenize(header) | tokenize(" ".join(test_names)) | tokenize(trace)
+    doc = {
+        "project": project.get("name", "Projet inconnu"),
+        "module": project.get("module", {}).get("code", ""),
+        "slug": project.get("slug", ""),
+        "date": result.get("date", ""),
+        "tests": test_names
+    }
+    # Texte tronqué, uniquement pour l'extraction d'extraits (conservé sur disque, pas en mémoire)
+    doc_text = trace[:MAX_STORED_TEXT]
+    return str(run_id), doc, tokens, doc_text
+
+
+class TraceSearchIndex:
+    """
+    Index inversé local des traces de moulinette et des noms de tests
+
+    Chaque passage (testRunId) est indexé une seule fois. L'index est persisté
+    en journal JSON Lines, une ligne par passage avec ses termes et sa trace:
+    une sauvegarde n'ajoute que les passages indexés depuis la précédente, et
+    le chargement reconstruit les listes de postings sans re-tokeniser les
+    traces. Seuls les documents et les postings restent en mémoire; la trace
+    d'un passage est relue dans le journal (position connue) pour ses extraits.
+    Au-delà de COMPACT_THRESHOLD, le journal est réécrit sans lignes
+    invalides et sans la trace des passages les plus anciens.
+
+    Le journal est chargé au premier accès (ou à la phase "cache" du démarrage).
+    """
+
+    def __init__(self, index_file: str = "search_index.jsonl"):
+        self.index_file = index_file
+        self.docs: Dict[str, Dict] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        # Position de la ligne de chaque passage dans le journal
+        self._offsets: Dict[str, int] = {}
+        # Passages indexés mais pas encore ajoutés au journal (avec leur trace)
+        self._unsaved: List[Tuple[str, Set[str], str]] = []
+        self._texts: Dict[str, str] = {}
+        self._compacted_size = 0
+        self._loaded = False
+        # load(), save() et la lecture des traces sont appelés depuis des threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    def _add(self, run_id: str, doc: Dict, tokens: Iterable[str]):
+        self.docs[run_id] = doc
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(run_id)
+
+    def load(self):
+        """Charge le journal (une seule fois)"""
+        if self._loaded:
+            # Sans le verrou: une sauvegarde en cours dans un thread ne bloque pas la boucle
+            return
+        with self._lock:
+            if not self._loaded and os.path.exists(self.index_file):
+                self._read_journal()
+            # Marqué chargé seulement une fois le journal lu (la vérification sans verrou en dépend)
+            self._loaded = True
+
+    def _read_journal(self):
+        """Reconstruit les documents, les postings et les positions à partir du journal"""
+        try:
+            offset = 0
+            with open(self.index_file, 'rb') as f:
+                for line in f:
+                    line_offset, offset = offset, offset + len(line)
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Dernière ligne tronquée (arrêt pendant une écriture): le passage sera réindexé
+                        continue
+                    if record["run_id"] not in self.docs:
+                        self._add(record["run_id"], record["doc"], record["tokens"])
+                        self._offsets[record["run_id"]] = line_offset
+            self._compacted_size = offset
+        except (OSError, KeyError) as e:
+            print(f"⚠️  Index de recherche illisible, reconstruction: {e}")
+            self.docs, self.postings, self._offsets = {}, {}, {}
+
+    def save(self):
+        """Ajoute au journal les passages indexés depuis la dernière sauvegarde (compaction au-delà du seuil)"""
+        self.load()
+        with self._lock:
+            if not self._unsaved:
+                return
+            pending, self._unsaved = self._unsaved, []
+            try:
+                with open(self.index_file, 'ab') as f:
+                    for run_id, tokens, text in pending:
+                        record = {"run_id": run_id, "tokens": sorted(tokens), "doc": self.docs[run_id], "text": text}
+                        self._offsets[run_id] = f.tell()
+                        f.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+                        self._texts.pop(run_id, None)
+                    size = f.tell()
+            except Exception as e:
+                self._unsaved = pending + self._unsaved
+                print(f"❌ Erreur lors de la sauvegarde de l'index de recherche: {e}")
+                return
+            if size > COMPACT_THRESHOLD and size > 2 * self._compacted_size:
+                self._compact()
+
+    def _compact(self):
+        """Réécrit le journal: une ligne valide par passage, trace conservée pour les KEEP_TEXT_RUNS plus récents"""
+        recent = sorted(self._offsets, key=lambda run_id: self.docs[run_id].get("date", ""), reverse=True)
+        keep_text = set(recent[:KEEP_TEXT_RUNS])
+        tmp_file = f"{self.index_file}.tmp"
+        offsets: Dict[str, int] = {}
+        try:
+            with open(self.index_file, 'rb') as src, open(tmp_file, 'wb') as dst:
+                for line in src:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    run_id = record.get("run_id")
+                    if run_id not in self._offsets or run_id in offsets:
+                        continue
+                    if run_id not in keep_text:
+                        record.pop("text", None)
+                    offsets[run_id] = dst.tell()
+                    dst.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+                size = dst.tell()
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"❌ Erreur lors de la compaction de l'index de recherche: {e}")
+            return
+        previous = self._compacted_size
+        self._offsets, self._compacted_size = offsets, size
+        print(f"📚 Index de recherche compacté ({previous / 1024 / 1024:.1f} → {size / 1024 / 1024:.1f} Mo)")
+
+    def _read_text(self, run_id: str) -> str:
+        """Trace stockée d'un passage (lecture disque: à appeler hors de la boucle d'événements)"""
+        with self._lock:
+            if run_id in self._texts:
+                return self._texts[run_id]
+            offset = self._offsets.get(run_id)
+            if offset is None:
+                return ""
+            try:
+                with open(self.index_file, 'rb') as f:
+                    f.seek(offset)
+                    return json.loads(f.readline()).get("text", "")
+            except (OSError, json.JSONDecodeError):
+                return ""
+
+    def __contains__(self, run_id) -> bool:
+        self.load()
+        return str(run_id) in self.docs
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self.docs)
+
+    def add_entry(self, entry: Optional[Tuple[str, Dict, Set[str], str]]) -> bool:
+        """
+        Ajoute une entrée préparée par build_entry (sur la boucle d'événements, comme les recherches)
+
+        Returns:
+            True si le passage a été ajouté, False s'il était déjà indexé
+        """
+        self.load()
+        if entry is None or entry[0] in self.docs:
+            return False
+        run_id, doc, tokens, text = entry
+        self._add(run_id, doc, tokens)
+        # Trace gardée en mémoire jusqu'à son ajout au journal
+        self._texts[run_id] = text
+        self._unsaved.append((run_id, tokens, text))
+        return True
+
+    def index_run(self, result: Dict, details: Optional[Dict]) -> bool:
+        """
+        Indexe un passage (trace + noms de tests)
+
+        Args:
+            result: Résultat tel que renvoyé par /me/{year}
+            details: Détails du passage (/me/details/{id}), ou None
+
+        Returns:
+            True si le passage a été ajouté, False s'il était déjà indexé
+        """
+        if result.get("results", {}).get("testRunId") in self:
+            return False
+        return self.add_entry(build_entry(result, details))
+
+    async def index_run_async(self, result: Dict, details: Optional[Dict]) -> bool:
+        """index_run sans bloquer la boucle d'événements (tokenisation dans un thread)"""
+        if result.get("results", {}).get("testRunId") in self:
+            return False
+        return self.add_entry(await asyncio.to_thread(build_entry, result, details))
+
+    def _match(self, terms: Set[str], limit: int) -> List[str]:
+        """testRunId des passages contenant tous les termes, du plus récent au plus ancien (mémoire seule)"""
+        self.load()
+        if not terms:
+            return []
+
+        # Intersection en partant de la liste de postings la plus courte
+        postings = sorted((self.postings.get(term, set()) for term in terms), key=len)
+        matches = set(postings[0])
+        for run_ids in postings[1:]:
+            matches &= run_ids
+            if not matches:
+                return []
+
+        return sorted(matches, key=lambda run_id: self.docs[run_id].get("date", ""), reverse=True)[:limit]
+
+    def _results(self, ranked: List[str], query: str, terms: Set[str]) -> List[Dict]:
+        """Résultats avec extraits (relit les traces sur disque)"""
+        return [
+            {
+                "run_id": run_id,
+                "project": self.docs[run_id]["project"],
+                "module": self.docs[run_id]["module"],
+                "slug": self.docs[run_id]["slug"],
+                "date": self.docs[run_id]["date"],
+                "snippet": self._snippet(self.docs[run_id], self._read_text(run_id), query, terms)
+            }
+            for run_id in ranked
+        ]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Recherche les passages contenant tous les termes de la requête
+
+        Args:
+            query: Texte recherché (ex: "Segmentation fault")
+            limit: Nombre maximum de résultats
+
+        Returns:
+            Résultats triés du plus récent au plus ancien, avec extrait
+        """
+        terms = tokenize(query)
+        return self._results(self._match(terms, limit), query, terms)
+
+    def _snippet(self, doc: Dict, text: str, query: str, terms: Set[str]) -> str:
+        """Extrait le passage de texte le plus pertinent autour de la requête"""
+        patterns = [re.escape(query.strip())] + [re.escape(term) for term in sorted(terms, key=len, reverse=True)]
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                start = max(0, match.start() - SNIPPET_RADIUS)
+                end = min(len(text), match.end() + SNIPPET_RADIUS)
+                snippet = text[start:end].strip()
+                return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+        # Pas de correspondance dans la trace stockée: chercher dans les noms de tests
+        for test_name in doc.get("tests", []):
+            if terms & tokenize(test_name):
+                return f"Test: {test_name}"
+        return ""
+
+    def timed_search(self, query: str, limit: int = 10):
+        """Recherche et retourne (résultats, durée en millisecondes)"""
+        start = time.perf_counter()
+        results = self.search(query, limit)
+        return results, (time.perf_counter() - start) * 1000
+
+    async def timed_search_async(self, query: str, limit: int = 10):
+        """timed_search pour la boucle d'événements: correspondances en mémoire, extraits lus dans un thread"""
+        start = time.perf_counter()
+        terms = tokenize(query)
+        ranked = self._match(terms, limit)
+        results = await asyncio.to_thread(self._results, ranked, query, terms) if ranked else []
+        return results, (time.perf_counter() - start) * 1000
+
+
+# Instance partagée entre la surveillance automatique et les commandes
+trace_search_index = TraceSearchIndex()
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from metrics import registry
+
+
+token_refresh_requests = registry.counter(
+    "moulicord_token_refresh_requests_total",
+    "Demandes de renouvellement du token (refreshed, coalesced, failed, skipped)", ("outcome",))
+
+
+class SharedToken:
+    """
+    Token Epitech courant, partagé par toutes les instances d'EpitechAPI
+
+    Quand une requête reçoit un 401, le client demande un renouvellement en
+    indiquant le token refusé. Le renouvellement (connexion Selenium, plusieurs
+    dizaines de secondes) tourne dans un thread dédié, un seul à la fois: les
+    demandes qui arrivent pendant qu'il tourne attendent le même résultat, sans
+    en relancer un autre. N commandes concurrentes pendant une expiration
+    coûtent donc un renouvellement et N nouveaux essais.
+
+    Les threads (EpitechAPI._get) attendent avec refresh(); la boucle
+    d'événements attend avec refresh_async(), sans être bloquée. Après un
+    renouvellement en échec, aucune nouvelle tentative n'est faite avant
+    `retry_interval` secondes.
+    """
+
+    def __init__(self, retry_interval: float = 60.0):
+        self.retry_interval = retry_interval
+        self._token: Optional[str] = None
+        self._refresher: Optional[Callable[[], Optional[str]]] = None
+        self._failed_at = 0.0
+        self._pending: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="token-refresh")
+        # Ne protège que l'état (jamais tenu pendant le renouvellement)
+        self._lock = threading.Lock()
+        self.refreshed = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.skipped = 0
+
+    @property
+    def current(self) -> Optional[str]:
+        return self._token
+
+    def set_refresher(self, refresher: Callable[[], Optional[str]]):
+        """Fonction bloquante qui génère un nouveau token (None en cas d'échec)"""
+        self._refresher = refresher
+
+    def publish(self, token: str):
+        """Enregistre le token courant (après un renouvellement, quelle qu'en soit l'origine)"""
+        self._token = token
+
+    def _count(self, outcome: str):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        token_refresh_requests.inc(outcome=outcome)
+
+    def _start(self, stale_token: Optional[str]) -> Tuple[Optional[Future], Optional[str]]:
+        """Renouvellement à attendre (lancé ou rejoint), sinon le token à utiliser tout de suite"""
+        with self._lock:
+            if self._token and self._token != stale_token:
+                # Déjà renouvelé par un autre appelant
+                self._count("coalesced")
+                return None, self._token
+            if self._pending is not None:
+                self._count("coalesced")
+                return self._pending, None
+            if self._refresher is None or time.time() - self._failed_at < self.retry_interval:
+                self._count("skipped")
+                return None, None
+            self._pending = self._executor.submit(self._run, stale_token)
+            return self._pending, None
+
+    def _run(self, stale_token: Optional[str]) -> Optional[str]:
+        try:
+            token = self._refresher()
+        except Exception as e:
+            print(f"⚠️  Renouvellement du token en échec: {e}")
+            token = None
+        with self._lock:
+            self._pending = None
+            if not token or token == stale_token:
+                self._failed_at = time.time()
+                self._count("failed")
+                return None
+            self._token = token
+            self._count("refreshed")
+            return token
+
+    def refresh(self, stale_token: Optional[str]) -> Optional[str]:
+        """
+        Nouveau token pour remplacer `stale_token` (bloquant: à appeler depuis un thread)
+
+        Args:
+            stale_token: Token refusé par l'API (None s'il n'y en a pas encore)
+
+        Returns:
+            Token à utiliser pour le nouvel essai, ou None (pas de nouvel essai)
+        """
+        future, token = self._start(stale_token)
+        return future.result() if future is not None else token
+
+    async def refresh_async(self, stale_token: Optional[str]) -> Optional[str]:
+        """Comme refresh(), pour la boucle d'événements (le renouvellement reste dans son thread)"""
+        future, token = self._start(stale_token)
+        return await asyncio.wrap_future(future) if future is not None else token
+
+    def stats(self) -> Dict:
+        return {
+            "refreshed": self.refreshed,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "pending": self._pending is not None,
+        }
+
+
+# Instance partagée entre bot.py (renouvellements) et les clients EpitechAPI (401)
+shared_token = SharedToken()
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -5,18 +6,34 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, List
 import json
 import base64
-import csv
 import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+import time
 from epitech_api import EpitechAPI
+from circuit_breaker import upstream_breakers
+from command_sync import command_tree_sync
+from loop_watchdog import loop_watchdog
+from notify_tracker import notify_tracker
+from profiler import profiler
+from metrics import command_latency
+from prefetch import details_prefetcher, history_prefetcher
+from project_index import project_index
+from render_cache import embed_cache
+from results_snapshot import results_snapshot
+from run_diff import format_diff, run_diff_store
+from run_store import run_store
+from startup_pipeline import startup_pipeline
+from tracing import SELF_PHASE, span, trace_recorder, traced
 from token_refresher import auto_refresh_token
 import os
 
 
+# Délai minimal entre deux essais de la revalidation en arrière-plan (secondes)
+REVALIDATION_DELAY = 5.0
+
+# Nombre de projets dont /history précharge l'historique pendant l'affichage du menu
+HISTORY_PREFETCH = 5
+
+
 # (ProjectDetailsView et ProjectSelect supprimées - utilisées uniquement pour /details)
 
 class TokenView(discord.ui.View):
@@ -27,6 +44,7 @@ class TokenView(discord.ui.View):
         self.epitech_api = epitech_api
     
     @discord.ui.button(label="🔄 Actualiser Token", style=discord.ButtonStyle.primary)
+    @traced("TokenView.refresh_token_button")
     async def refresh_token_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Bouton pour actualiser le token"""
         await interaction.response.defer()
@@ -42,13 +60,14 @@ class TokenView(discord.ui.View):
             await interaction.followup.send(embed=embed, ephemeral=True)
             
             # Lancer l'actualisation avec Selenium
-            success = auto_refresh_token(headless=True, update_env=False)
+            # Connexion Selenium dans un thread (la boucle d'événements reste disponible)
+            success = await asyncio.to_thread(auto_refresh_token, headless=True, update_env=False)
             
             if success:
                 # Vérifier le nouveau token et relier l'API en mémoire
                 try:
                     import bot as bot_module
-                    if bot_module.ensure_valid_token() and getattr(bot_module, 'epitech_api', None):
+                    if await bot_module.ensure_valid_token_async() and getattr(bot_module, 'epitech_api', None):
                         self.epitech_api = bot_module.epitech_api
                 except Exception:
                     pass
@@ -132,14 +151,60 @@ class RefreshView(discord.ui.View):
         self.epitech_api = epitech_api
         self.nombre = nombre
 
+    def _build_embed(self, results: list) -> discord.Embed:
+        """Construit l'embed actualisé (tri, limite et barres de progression)"""
+        # Trier par date (plus récent en premier) puis limiter au nombre demandé
+        results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
+        limited_results = results_sorted[:self.nombre]
+        
+        # Créer le nouvel embed
+        if hasattr(self.epitech_api, 'format_summary'):
+            embed = self.epitech_api.format_summary(limited_results)
+        else:
+            # Fallback si format_summary n'existe pas
+            embed = discord.Embed(
+                title=f"🏫 Résultats Moulinette ({self.nombre} derniers) - Actualisé",
+                color=discord.Color.green(),
+                timestamp=datetime.now()
+            )
+            
+            for result in limited_results:
+                project = result.get("project", {})
+                name = project.get("name", "Projet inconnu")
+                skills = result.get("results", {}).get("skills", {})
+                total_tests = sum(skill.get("count", 0) for skill in skills.values())
+                total_passed = sum(skill.get("passed", 0) for skill in skills.values())
+                rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
+                
+                # Choisir les couleurs selon le taux de réussite
+                if rate >= 100:
+                    emoji = "✅"
+                elif rate >= 80:
+                    emoji = "🟡"
+                elif rate >= 50:
+                    emoji = "🟠"
+                else:
+                    emoji = "❌"
+                
+                progress = EpitechAPI._generate_progress_bar(total_passed, total_tests, 10)
+                
+                embed.add_field(
+                    name=f"{emoji} {name}",
+                    value=f"📊 {total_passed}/{total_tests} ({rate:.1f}%)\n📈 {progress}",
+                    inline=False
+                )
+        
+        return embed
+
     @discord.ui.button(label="🔄 Actualiser", style=discord.ButtonStyle.primary)
+    @traced("RefreshView.refresh_button")
     async def refresh_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Bouton pour actualiser les résultats"""
         await interaction.response.defer()
         
         try:
             # Récupérer les nouveaux résultats
-            results = self.epitech_api.get_moulinette_results(2025)
+            results = await asyncio.to_thread(self.epitech_api.get_moulinette_results, 2025)
             if not results:
                 embed = discord.Embed(
                     title="❌ Erreur",
@@ -149,46 +214,12 @@ class RefreshView(discord.ui.View):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
 
-            # Trier par date (plus récent en premier) puis limiter au nombre demandé
-            results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
-            limited_results = results_sorted[:self.nombre]
-            
-            # Créer le nouvel embed
-            if hasattr(self.epitech_api, 'format_summary'):
-                embed = self.epitech_api.format_summary(limited_results)
-            else:
-                # Fallback si format_summary n'existe pas
-                embed = discord.Embed(
-                    title=f"🏫 Résultats Moulinette ({self.nombre} derniers) - Actualisé",
-                    color=discord.Color.green(),
-                    timestamp=datetime.now()
-                )
-                
-                for result in limited_results:
-                    project = result.get("project", {})
-                    name = project.get("name", "Projet inconnu")
-                    skills = result.get("results", {}).get("skills", {})
-                    total_tests = sum(skill.get("count", 0) for skill in skills.values())
-                    total_passed = sum(skill.get("passed", 0) for skill in skills.values())
-                    rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
-                    
-                    # Choisir les couleurs selon le taux de réussite
-                    if rate >= 100:
-                        emoji = "✅"
-                    elif rate >= 80:
-                        emoji = "🟡"
-                    elif rate >= 50:
-                        emoji = "🟠"
-                    else:
-                        emoji = "❌"
-                    
-                    progress = self.epitech_api._generate_progress_bar(total_passed, total_tests, 10)
-                    
-                    embed.add_field(
-                        name=f"{emoji} {name}",
-                        value=f"📊 {total_passed}/{total_tests} ({rate:.1f}%)\n📈 {progress}",
-                        inline=False
-                    )
+            # Rendu mis en cache tant que les données n'ont pas changé
+            embed = embed_cache.get_or_render(
+                "refresh",
+                self.nombre,
+                lambda: self._build_embed(results)
+            )
 
             embed.set_footer(text=f"Dernière actualisation: {datetime.now().strftime('%H:%M:%S')}")
             await interaction.edit_original_response(embed=embed, view=self)
@@ -208,6 +239,7 @@ class MouliCordSlashCommands(commands.Cog):
     def __init__(self, bot, epitech_api):
         self.bot = bot
         self.epitech_api = epitech_api
+        self._revalidation: Optional[asyncio.Task] = None
     
     def update_epitech_api(self, new_api):
         """Met à jour l'instance de l'API Epitech"""
@@ -215,84 +247,198 @@ class MouliCordSlashCommands(commands.Cog):
         # Log côté bot uniquement; éviter le bruit ici
         pass
     
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Horodate chaque slash command du cog (mesure de latence par commande)"""
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+    
+    def _observe_command(self, interaction: discord.Interaction, outcome: str):
+        """Enregistre la durée d'une slash command dans les métriques"""
+        started_at = interaction.extras.get("started_at")
+        if started_at is not None and interaction.command is not None:
+            command_latency.observe(time.perf_counter() - started_at, command=interaction.command.qualified_name, outcome=outcome)
+    
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        self._observe_command(interaction, "success")
+    
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self._observe_command(interaction, "error")
+    
     async def get_results_with_fallback(self, year=2025):
-        """Récupère les résultats avec fallback automatique vers les données locales en cas d'erreur API"""
-        try:
-            # Tentative via l'API
-            results = self.epitech_api.get_moulinette_results(year)
+        """
+        Récupère les résultats, avec repli immédiat sur l'instantané résident
+        
+        Sans token utilisable (client temporaire du démarrage, token expiré), ou quand
+        le disjoncteur de /me/{year} est ouvert, l'instantané est servi sans requête
+        vers l'API: la commande n'attend jamais un renouvellement en cours. Si l'appel
+        échoue, l'instantané est servi et une revalidation est lancée en arrière-plan:
+        c'est elle, et non la commande, qui retente l'API jusqu'à son retour.
+        """
+        if self.epitech_api is None or not self.epitech_api.has_valid_token():
+            return self._snapshot_fallback("Token indisponible (récupération en cours)")
+        
+        if upstream_breakers.get("/me/{year}").is_open:
+            self._schedule_revalidation(year)
+            return self._snapshot_fallback("API indisponible (requêtes suspendues)")
+        
+        results, api_error = await self._fetch_results(year)
+        if results:
             return results, None  # results, error_message
+        
+        # Fallback vers l'instantané résident (dernières données connues)
+        self._schedule_revalidation(year)
+        return self._snapshot_fallback(api_error)
+    
+    async def _fetch_results(self, year: int):
+        """
+        Un appel à /me/{year} hors de la boucle d'événements (le disjoncteur est tenu par EpitechAPI._get)
+
+        Returns:
+            (résultats, None) si l'API a répondu, même par une liste vide, sinon (None, erreur)
+        """
+        # Le client avale ses erreurs (liste vide): seule une réponse valide remplace l'instantané
+        updated_before = results_snapshot.updated_at
+        try:
+            results = await asyncio.to_thread(self.epitech_api.get_moulinette_results, year)
         except Exception as api_err:
-            api_error = str(api_err)
+            return None, str(api_err)
+        if results or results_snapshot.updated_at != updated_before:
+            return results, None
+        return None, "Aucun résultat reçu de l'API"
+    
+    def _schedule_revalidation(self, year: int):
+        """Lance la revalidation en arrière-plan (une seule à la fois)"""
+        if self._revalidation is None or self._revalidation.done():
+            self._revalidation = asyncio.get_running_loop().create_task(self._revalidate(year))
+    
+    async def _revalidate(self, year: int):
+        """Retente /me/{year} au rythme du disjoncteur jusqu'au retour de l'API (l'instantané est alors remplacé)"""
+        breaker = upstream_breakers.get("/me/{year}")
+        while self.epitech_api is not None:
+            await asyncio.sleep(max(REVALIDATION_DELAY, breaker.retry_in()))
+            if breaker.is_open:
+                continue
+            results, api_error = await self._fetch_results(year)
+            if api_error is None:
+                print(f"✅ API de nouveau disponible, instantané revalidé ({len(results)} résultats)")
+                return
+    
+    def _snapshot_fallback(self, api_error: str):
+        """Résultats de l'instantané local avec leur marque d'ancienneté, ou (None, erreur)"""
+        with span("snapshot"):
+            results = results_snapshot.results
+        if results:
+            return results, results_snapshot.staleness()
+        return None, api_error
+
+    def _build_results_embed(self, results: list, nombre: int, degraded: bool) -> discord.Embed:
+        """Construit l'embed de /results (tri, barres de progression, footer), sans source ni horodatage"""
+        # Trier par date (plus récent en premier) puis limiter aux résultats demandés
+        results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
+        limited_results = results_sorted[:nombre]
+        
+        # Créer l'embed manuellement (format_summary peut ne pas être disponible)
+        embed = discord.Embed(
+            title=f"📊 Résultats Moulinette ({len(limited_results)} derniers)",
+            color=discord.Color.orange() if degraded else discord.Color.green()
+        )
+        
+        # Ajouter les résultats
+        for result in limited_results:
+            project = result.get("project", {})
+            name = project.get("name", "Projet inconnu")
+            skills = result.get("results", {}).get("skills", {})
+            total_tests = sum(skill.get("count", 0) for skill in skills.values())
+            total_passed = sum(skill.get("passed", 0) for skill in skills.values())
+            rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
             
-            # Vérifier si c'est une erreur de token (403)
-            if "403" in api_error or "Forbidden" in api_error:
-                # Tentative silencieuse de renouvellement
-                
-                try:
-                    import importlib
-                    import bot
-                    importlib.reload(bot)  # Recharger pour obtenir les variables globales mises à jour
-                    
-                    if bot.ensure_valid_token() and bot.epitech_api:
-                        self.epitech_api = bot.epitech_api
-                        results = self.epitech_api.get_moulinette_results(year)
-                        return results, None
-                    else:
-                        pass
-                except Exception as refresh_err:
-                    pass
+            # Créer une barre de progression colorée
+            progress_length = 10
+            filled = int((total_passed / total_tests) * progress_length) if total_tests > 0 else 0
             
-            # Fallback vers les données locales
-            try:
-                with open("results_history.json", "r") as f:
-                    local_data = json.load(f)
-                    results = local_data.get("results", [])
-                    
-                if results:
-                    return results, f"Token expiré - Données du cache local"
-                else:
-                    return None, api_error
-            except Exception as local_err:
-                return None, api_error
+            # Choisir les couleurs selon le taux de réussite (carrés)
+            if rate >= 100:
+                filled_char = "🟩"
+                empty_char = "⬜"
+                emoji = "✅"
+            elif rate >= 80:
+                filled_char = "🟨"
+                empty_char = "⬜"
+                emoji = "🟡"
+            elif rate >= 50:
+                filled_char = "🟧"
+                empty_char = "⬜"
+                emoji = "🟠"
+            else:
+                filled_char = "🟥"
+                empty_char = "⬜"
+                emoji = "❌"
+            
+            progress_bar = filled_char * filled + empty_char * (progress_length - filled)
+            
+            embed.add_field(
+                name=f"{emoji} {name}",
+                value=f"📊 {total_passed}/{total_tests} ({rate:.1f}%)\n📈 {progress_bar}",
+                inline=False
+            )
+        
+        # Footer avec info sur le token
+        if degraded:
+            embed.set_footer(text="Mode dégradé • Utilisez /token pour actualiser")
+        else:
+            embed.set_footer(text="Token valide ~1h • Actualisation automatique")
+        
+        return embed
+
+    def _build_check_now_embed(self, results: list) -> discord.Embed:
+        """Construit l'embed de /check_now (3 résultats les plus récents)"""
+        embed = discord.Embed(
+            title="🔍 Vérification terminée",
+            description=f"{len(results)} projet(s) trouvés dans les résultats actuels",
+            color=discord.Color.blue()
+        )
+        # Trier par date (plus récent en premier) puis prendre les 3 premiers
+        results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
+        for i, result in enumerate(results_sorted[:3]):
+            # Extraire le nom du projet depuis la structure correcte
+            project_data = result.get("project", {})
+            project_name = project_data.get("name", "Projet inconnu")
+            
+            skills = result.get("results", {}).get("skills", {})
+            total_tests = sum(skill.get("count", 0) for skill in skills.values())
+            total_passed = sum(skill.get("passed", 0) for skill in skills.values())
+            rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
+            
+            # Choisir l'emoji selon le taux de réussite
+            if rate >= 100:
+                emoji = "✅"
+            elif rate >= 80:
+                emoji = "🟡"
+            elif rate >= 50:
+                emoji = "🟠"
+            else:
+                emoji = "❌"
+            
+            embed.add_field(
+                name=f"{emoji} {project_name}",
+                value=f"📊 {total_passed}/{total_tests} ({rate:.1f}%)",
+                inline=True
+            )
+        
+        return embed
 
     async def _run_check_now(self) -> discord.Embed:
         """Exécute la vérification immédiate et retourne l'embed approprié."""
         try:
-            results = self.epitech_api.get_moulinette_results(2025)
+            results = await asyncio.to_thread(self.epitech_api.get_moulinette_results, 2025)
             if results:
-                embed = discord.Embed(
-                    title="🔍 Vérification terminée",
-                    description=f"{len(results)} projet(s) trouvés dans les résultats actuels",
-                    color=discord.Color.blue(),
-                    timestamp=datetime.now()
+                embed = embed_cache.get_or_render(
+                    "check_now",
+                    None,
+                    lambda: self._build_check_now_embed(results)
                 )
-                # Trier par date (plus récent en premier) puis prendre les 3 premiers
-                results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
-                for i, result in enumerate(results_sorted[:3]):
-                    # Extraire le nom du projet depuis la structure correcte
-                    project_data = result.get("project", {})
-                    project_name = project_data.get("name", "Projet inconnu")
-                    
-                    skills = result.get("results", {}).get("skills", {})
-                    total_tests = sum(skill.get("count", 0) for skill in skills.values())
-                    total_passed = sum(skill.get("passed", 0) for skill in skills.values())
-                    rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
-                    
-                    # Choisir l'emoji selon le taux de réussite
-                    if rate >= 100:
-                        emoji = "✅"
-                    elif rate >= 80:
-                        emoji = "🟡"
-                    elif rate >= 50:
-                        emoji = "🟠"
-                    else:
-                        emoji = "❌"
-                    
-                    embed.add_field(
-                        name=f"{emoji} {project_name}",
-                        value=f"📊 {total_passed}/{total_tests} ({rate:.1f}%)",
-                        inline=True
-                    )
+                embed.timestamp = datetime.now()
             else:
                 embed = discord.Embed(
                     title="❌ Erreur",
@@ -308,6 +454,7 @@ class MouliCordSlashCommands(commands.Cog):
             )
 
     @app_commands.command(name="ping", description="🏓 Teste la latence du bot")
+    @traced("/ping")
     async def ping_slash(self, interaction: discord.Interaction):
         """Slash command pour tester la latence"""
         latency = round(self.bot.latency * 1000)
@@ -321,6 +468,7 @@ class MouliCordSlashCommands(commands.Cog):
 
     @app_commands.command(name="results", description="📊 Affiche les résultats de la moulinette")
     @app_commands.describe(nombre="Nombre de résultats à afficher (par défaut: 5)")
+    @traced("/results")
     async def results_slash(self, interaction: discord.Interaction, nombre: Optional[int] = 5):
         """Slash command pour afficher les résultats"""
         await interaction.response.defer(thinking=True)
@@ -351,64 +499,16 @@ class MouliCordSlashCommands(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
 
-            # Trier par date (plus récent en premier) puis limiter aux résultats demandés
-            results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
-            limited_results = results_sorted[:nombre]
-            
-            # Créer l'embed manuellement (format_summary peut ne pas être disponible)
-            embed = discord.Embed(
-                title=f"📊 Résultats Moulinette ({len(limited_results)} derniers)",
-                color=discord.Color.green() if not error_msg else discord.Color.orange(),
-                timestamp=datetime.now()
+            # Rendu mis en cache par génération de données et source (temps réel ou instantané);
+            # la source détaillée (ancienneté) et l'horodatage changent à chaque appel
+            degraded = error_msg is not None
+            embed = embed_cache.get_or_render(
+                "results",
+                (nombre, degraded),
+                lambda: self._build_results_embed(results, nombre, degraded)
             )
-            
-            # Indication de la source des données
-            embed.description = "Source: 🌐 Temps réel" if not error_msg else "Source: 💾 Cache local (token expiré)"
-            
-            # Ajouter les résultats
-            for result in limited_results:
-                project = result.get("project", {})
-                name = project.get("name", "Projet inconnu")
-                skills = result.get("results", {}).get("skills", {})
-                total_tests = sum(skill.get("count", 0) for skill in skills.values())
-                total_passed = sum(skill.get("passed", 0) for skill in skills.values())
-                rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
-                
-                # Créer une barre de progression colorée
-                progress_length = 10
-                filled = int((total_passed / total_tests) * progress_length) if total_tests > 0 else 0
-                
-                # Choisir les couleurs selon le taux de réussite (carrés)
-                if rate >= 100:
-                    filled_char = "🟩"
-                    empty_char = "⬜"
-                    emoji = "✅"
-                elif rate >= 80:
-                    filled_char = "🟨"
-                    empty_char = "⬜"
-                    emoji = "🟡"
-                elif rate >= 50:
-                    filled_char = "🟧"
-                    empty_char = "⬜"
-                    emoji = "🟠"
-                else:
-                    filled_char = "🟥"
-                    empty_char = "⬜"
-                    emoji = "❌"
-                
-                progress_bar = filled_char * filled + empty_char * (progress_length - filled)
-                
-                embed.add_field(
-                    name=f"{emoji} {name}",
-                    value=f"📊 {total_passed}/{total_tests} ({rate:.1f}%)\n📈 {progress_bar}",
-                    inline=False
-                )
-            
-            # Footer avec info sur le token
-            if error_msg:
-                embed.set_footer(text="Mode dégradé • Utilisez /token pour actualiser")
-            else:
-                embed.set_footer(text="Token valide ~1h • Actualisation automatique")
+            embed.description = f"Source: {error_msg}" if degraded else "Source: 🌐 Temps réel"
+            embed.timestamp = datetime.now()
             
             view = RefreshView(self.epitech_api, nombre)
             await interaction.followup.send(embed=embed, view=view)
@@ -425,22 +525,28 @@ class MouliCordSlashCommands(commands.Cog):
     # (/watch supprimée)
 
     @app_commands.command(name="status", description="📊 Affiche le statut du bot et de l'API")
+    @traced("/status")
     async def status_slash(self, interaction: discord.Interaction):
         """Slash command pour le statut"""
         await interaction.response.defer(thinking=True)
         
         try:
-            # Vérifier l'état de l'API
-            try:
-                results = self.epitech_api.get_moulinette_results(2025)
-                api_status = "✅ Connectée et fonctionnelle"
-                
-                # Vérifier le token
-                token_info = self.epitech_api.check_token_expiration()
-                
-            except Exception as e:
-                api_status = f"❌ Erreur: {str(e)[:50]}..."
-                token_info = "❌ Impossible de vérifier"
+            # Vérifier l'état de l'API (sans requête tant qu'aucun token n'est disponible)
+            if self.epitech_api is None or not self.epitech_api.has_valid_token():
+                api_status = "⏳ En attente du token"
+                token_info = "⏳ Récupération en cours"
+            else:
+                try:
+                    # Même chemin que les commandes: pas de requête si le disjoncteur est ouvert
+                    _, error_msg = await self.get_results_with_fallback(2025)
+                    api_status = "✅ Connectée et fonctionnelle" if error_msg is None else f"⚠️ {error_msg[:100]}"
+                    
+                    # Vérifier le token
+                    token_info = self.epitech_api.check_token_expiration()
+                    
+                except Exception as e:
+                    api_status = f"❌ Erreur: {str(e)[:50]}..."
+                    token_info = "❌ Impossible de vérifier"
             
             embed = discord.Embed(
                 title="📊 Statut du Bot MouliCord",
@@ -460,6 +566,12 @@ class MouliCordSlashCommands(commands.Cog):
                 inline=True
             )
             
+            embed.add_field(
+                name="🔌 Disjoncteur API",
+                value=upstream_breakers.format_stats(),
+                inline=False
+            )
+            
             embed.add_field(
                 name="🔑 Token Status",
                 value=token_info,
@@ -485,7 +597,44 @@ class MouliCordSlashCommands(commands.Cog):
                 value=f"📊 {total_entries} entrées sauvegardées",
                 inline=True
             )
-            
+
+            embed.add_field(
+                name="🧩 Cache de rendu",
+                value=embed_cache.format_stats(),
+                inline=False
+            )
+
+            embed.add_field(
+                name="🔮 Préchargement",
+                value=f"**/logs**\n{details_prefetcher.format_stats()}\n**/history**\n{history_prefetcher.format_stats()}",
+                inline=False
+            )
+
+            embed.add_field(
+                name="🐢 Blocages de la boucle",
+                value=loop_watchdog.format_stats(),
+                inline=False
+            )
+
+            embed.add_field(
+                name="⏱️ Délai de notification (passage → message)",
+                value=notify_tracker.format_stats()[:1024],
+                inline=False
+            )
+
+            embed.add_field(
+                name="💾 Données",
+                value=f"{len(results_snapshot.results)} résultats • " + (
+                    "🌐 Temps réel" if results_snapshot.is_live and results_snapshot.age() < 600 else results_snapshot.staleness()),
+                inline=False
+            )
+
+            embed.add_field(
+                name="🚀 Démarrage",
+                value=startup_pipeline.format_stats()[:1024],
+                inline=False
+            )
+
             await interaction.followup.send(embed=embed, ephemeral=True)
             
         except Exception as e:
@@ -497,6 +646,7 @@ class MouliCordSlashCommands(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
 
     @app_commands.command(name="check_now", description="🔄 Force une vérification immédiate des résultats")
+    @traced("/check_now")
     async def check_now_slash(self, interaction: discord.Interaction):
         """Slash command pour vérification immédiate"""
         await interaction.response.defer(thinking=True)
@@ -506,13 +656,61 @@ class MouliCordSlashCommands(commands.Cog):
 
     # (Alias /force_check supprimé)
 
+    def _compute_stats(self, results: list) -> dict:
+        """
+        Calcule les statistiques affichées par /stats
+        
+        Args:
+            results: Résultats (format /me/{year})
+            
+        Returns:
+            Dict avec les totaux, le taux global, la répartition par taux et le top 3 (nom, taux)
+        """
+        total_tests = 0
+        total_passed = 0
+        rates = []
+        for result in results:
+            skills = result.get("results", {}).get("skills", {})
+            tests = sum(skill.get("count", 0) for skill in skills.values())
+            passed = sum(skill.get("passed", 0) for skill in skills.values())
+            total_tests += tests
+            total_passed += passed
+            # Taux de réussite du projet, calculé une seule fois
+            rates.append((passed / tests * 100) if tests > 0 else 0)
+        
+        # Projets les mieux réussis (tri stable: ordre d'origine en cas d'égalité)
+        top_projects = []
+        for index in sorted(range(len(results)), key=lambda i: rates[i], reverse=True)[:3]:
+            project = results[index]
+            # Préférer le nom du projet si disponible
+            project_info = project.get("project", {}) if isinstance(project.get("project"), dict) else {}
+            project_name = project_info.get("name") if project_info else None
+            # Fallback: code du module dans project.project.module.code ou ancienne clé "module"
+            module_info = project_info.get("module", {}) if project_info else {}
+            module_code = module_info.get("code") if isinstance(module_info, dict) else None
+            legacy_module = project.get("module")
+            top_projects.append((project_name or module_code or legacy_module or "Projet inconnu", rates[index]))
+        
+        return {
+            "total_projects": len(results),
+            "total_tests": total_tests,
+            "total_passed": total_passed,
+            "global_rate": (total_passed / total_tests * 100) if total_tests > 0 else 0,
+            "excellent": sum(1 for rate in rates if rate >= 80),
+            "good": sum(1 for rate in rates if 60 <= rate < 80),
+            "average": sum(1 for rate in rates if 40 <= rate < 60),
+            "poor": sum(1 for rate in rates if rate < 40),
+            "top_projects": top_projects
+        }
+
     @app_commands.command(name="stats", description="📈 Statistiques complètes des résultats")
+    @traced("/stats")
     async def stats_slash(self, interaction: discord.Interaction):
         """Slash command pour les statistiques"""
         await interaction.response.defer(thinking=True)
         
         try:
-            results = self.epitech_api.get_moulinette_results(2025)
+            results, error_msg = await self.get_results_with_fallback(2025)
             
             if not results:
                 embed = discord.Embed(
@@ -523,37 +721,17 @@ class MouliCordSlashCommands(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # Calculs statistiques
-            total_projects = len(results)
-            total_tests = sum(
-                sum(skill.get("count", 0) for skill in result.get("results", {}).get("skills", {}).values())
-                for result in results
-            )
-            total_passed = sum(
-                sum(skill.get("passed", 0) for skill in result.get("results", {}).get("skills", {}).values())
-                for result in results
-            )
-            
-            global_rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
-            
-            # Répartition par taux de réussite
-            def get_project_rate(project):
-                skills = project.get("results", {}).get("skills", {})
-                tests = sum(skill.get("count", 0) for skill in skills.values())
-                passed = sum(skill.get("passed", 0) for skill in skills.values())
-                return (passed / tests * 100) if tests > 0 else 0
-            
-            excellent = sum(1 for result in results if get_project_rate(result) >= 80)
-            good = sum(1 for result in results if 60 <= get_project_rate(result) < 80)
-            average = sum(1 for result in results if 40 <= get_project_rate(result) < 60)
-            poor = sum(1 for result in results if get_project_rate(result) < 40)
-            
-            # Projets les mieux réussis
-            top_projects = sorted(results, key=get_project_rate, reverse=True)[:3]
+            stats = self._compute_stats(results)
+            total_projects = stats["total_projects"]
+            total_tests = stats["total_tests"]
+            total_passed = stats["total_passed"]
+            global_rate = stats["global_rate"]
+            excellent, good, average, poor = stats["excellent"], stats["good"], stats["average"], stats["poor"]
+            top_projects = stats["top_projects"]
             
             embed = discord.Embed(
                 title="📈 Statistiques Complètes",
-                description=f"📊 **Taux de réussite global:** {global_rate:.1f}%",
+                description=f"📊 **Taux de réussite global:** {global_rate:.1f}%" + (f"\n{error_msg}" if error_msg else ""),
                 color=discord.Color.green() if global_rate >= 70 else discord.Color.orange() if global_rate >= 50 else discord.Color.red(),
                 timestamp=datetime.now()
             )
@@ -573,18 +751,8 @@ class MouliCordSlashCommands(commands.Cog):
             # Top 3 projets
             if top_projects:
                 top_text = ""
-                for i, project in enumerate(top_projects):
-                    # Préférer le nom du projet si disponible
-                    project_info = project.get("project", {}) if isinstance(project.get("project"), dict) else {}
-                    project_name = project_info.get("name") if project_info else None
-                    # Fallback: code du module dans project.project.module.code ou ancienne clé "module"
-                    module_info = project_info.get("module", {}) if project_info else {}
-                    module_code = module_info.get("code") if isinstance(module_info, dict) else None
-                    legacy_module = project.get("module")
-                    display_name = project_name or module_code or legacy_module or "Projet inconnu"
-
-                    rate = get_project_rate(project)
-                    medals = ["🥇", "🥈", "🥉"]
+                medals = ["🥇", "🥈", "🥉"]
+                for i, (display_name, rate) in enumerate(top_projects):
                     top_text += f"{medals[i]} `{display_name}` ({rate:.1f}%)\n"
                 
                 embed.add_field(
@@ -594,7 +762,7 @@ class MouliCordSlashCommands(commands.Cog):
                 )
             
             # Barre de progression globale
-            progress_bar = self.epitech_api._generate_progress_bar(total_passed, total_tests, 20)
+            progress_bar = EpitechAPI._generate_progress_bar(total_passed, total_tests, 20)
             embed.add_field(
                 name="📈 Progression Globale",
                 value=progress_bar,
@@ -613,6 +781,7 @@ class MouliCordSlashCommands(commands.Cog):
 
 
     @app_commands.command(name="clear_storage", description="🗑️ Vider le stockage des résultats")
+    @traced("/clear_storage")
     async def clear_storage_slash(self, interaction: discord.Interaction):
         """Slash command pour vider le stockage avec confirmation"""
         
@@ -634,6 +803,7 @@ class MouliCordSlashCommands(commands.Cog):
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     @app_commands.command(name="token", description="🔐 Vérifie le token Epitech (durée de vie: 1h)")
+    @traced("/token")
     async def token_slash(self, interaction: discord.Interaction):
         """Slash command pour vérifier le token avec bouton de rafraîchissement"""
         
@@ -671,11 +841,17 @@ class MouliCordSlashCommands(commands.Cog):
     # (/refresh_token supprimée - fonctionnalité intégrée dans /token)
 
     @app_commands.command(name="history", description="📈 Analyse l'historique d'un projet avec sélection interactive")
-    async def history_slash(self, interaction: discord.Interaction):
+    @app_commands.describe(projet="Projet à analyser (code du module, slug ou nom) - sinon menu des projets récents")
+    @traced("/history")
+    async def history_slash(self, interaction: discord.Interaction, projet: Optional[str] = None):
         """Slash command pour l'historique avec sélection de projet"""
         await interaction.response.defer(thinking=True)
         
         try:
+            if projet:
+                await self._show_project_history(interaction, projet)
+                return
+            
             # Récupérer tous les résultats avec fallback automatique
             results, error_msg = await self.get_results_with_fallback(2025)
             
@@ -688,25 +864,10 @@ class MouliCordSlashCommands(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # Extraire tous les projets uniques avec leurs informations
-            projects_map = {}
-            for result in results:
-                # Extraire les informations du projet depuis la structure correcte
-                project_data = result.get("project", {})
-                module_code = project_data.get("module", {}).get("code", "")
-                project_slug = project_data.get("slug", "")
-                project_name = project_data.get("name", project_slug)
-                
-                # Construire l'ID du projet au format "module/project"
-                if module_code and project_slug:
-                    project_id = f"{module_code}/{project_slug}"
-                    
-                    if project_id not in projects_map:
-                        projects_map[project_id] = {
-                            "name": project_name,
-                            "module": module_code,
-                            "slug": project_slug
-                        }
+            # Projets tirés de l'index résident (sans effet si ces résultats y sont déjà),
+            # les 25 plus récents dans le menu (limite Discord)
+            project_index.observe(results)
+            projects_map = {project_id: project_index.get(project_id) for project_id in project_index.recent(25)}
             
             if not projects_map:
                 embed = discord.Embed(
@@ -720,7 +881,9 @@ class MouliCordSlashCommands(commands.Cog):
             # Créer l'embed de sélection
             embed = discord.Embed(
                 title="📋 Sélection du Projet",
-                description=f"**Choisissez un projet** pour analyser son historique complet.\n\n📊 **{len(projects_map)} projets** disponibles",
+                description=f"**Choisissez un projet** pour analyser son historique complet.\n\n📊 **{len(project_index)} projets** disponibles"
+                            + (f" • les {len(projects_map)} plus récents ci-dessous\n💡 `/history projet:` recherche parmi tous les projets"
+                               if len(project_index) > len(projects_map) else ""),
                 color=discord.Color.blue(),
                 timestamp=datetime.now()
             )
@@ -737,6 +900,10 @@ class MouliCordSlashCommands(commands.Cog):
                 inline=True
             )
             
+            # Précharger l'historique des projets les plus récemment actifs pendant que le menu est affiché (pas avant le premier token)
+            if self.epitech_api is not None and self.epitech_api.has_valid_token():
+                history_prefetcher.schedule(list(projects_map)[:HISTORY_PREFETCH], self.epitech_api.get_project_history)
+            
             # Créer la vue de sélection
             project_selection_view = ProjectSelectionView(self.epitech_api, projects_map)
             await interaction.followup.send(embed=embed, view=project_selection_view, ephemeral=True)
@@ -749,315 +916,214 @@ class MouliCordSlashCommands(commands.Cog):
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
 
-    @app_commands.command(name="logs", description="📋 Affiche les logs d'erreur des dernières moulinettes")
-    async def logs_slash(self, interaction: discord.Interaction):
-        """Slash command pour afficher les logs d'erreur des moulinettes"""
-        await interaction.response.defer(thinking=True)
-        
-        try:
-            # Récupérer tous les résultats avec fallback automatique
-            results, error_msg = await self.get_results_with_fallback(2025)
-            
-            if not results:
-                embed = discord.Embed(
-                    title="❌ Aucun résultat disponible",
-                    description="• ⚠️ Token expiré (validité ~1h)\n• 📡 API inaccessible (403 Forbidden)\n• 💾 Aucune donnée locale disponible\n\n💡 Utilisez `/token` puis cliquez sur 'Actualiser Token'",
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            # Trier par date (plus récent en premier) et limiter à 25 pour le menu
-            results_sorted = sorted(results, key=lambda x: x.get("date", ""), reverse=True)
-            limited_results = results_sorted[:25]
-            
-            # Créer l'embed de sélection
-            embed = discord.Embed(
-                title="📋 Logs d'Erreur des Moulinettes",
-                description=f"**Sélectionnez une moulinette** pour voir les détails des erreurs.\n\n📊 **{len(limited_results)} moulinettes** disponibles",
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
-            )
-            
-            embed.add_field(
-                name="🔍 Fonctionnalités",
-                value="• Messages d'erreur détaillés\n• Première tâche qui échoue\n• Détails des tests",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="📊 Informations",
-                value="• Troncature des erreurs\n• Navigation interactive\n• Détails complets",
-                inline=True
-            )
-            
-            # Créer la vue de sélection
-            logs_view = LogsSelectionView(self.epitech_api, limited_results)
-            await interaction.followup.send(embed=embed, view=logs_view, ephemeral=True)
-            
-        except Exception as e:
+    @history_slash.autocomplete("projet")
+    async def history_project_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Propose les projets de l'index résident (préfixe, sous-chaîne puis approximatif)"""
+        project_ids, elapsed_ms = project_index.timed_search(current, 25)
+        command_latency.observe(elapsed_ms / 1000, command="/history:projet", outcome="autocomplete")
+        return [
+            app_commands.Choice(name=f"{project_index.get(project_id)['name']} ({project_id})"[:100], value=project_id)
+            for project_id in project_ids
+        ]
+
+    async def _show_project_history(self, interaction: discord.Interaction, projet: str):
+        """Affiche directement l'historique du projet passé à /history (choix d'autocomplétion ou texte libre)"""
+        if not len(project_index):
+            # Démarrage à froid: alimenter l'index avant de résoudre le texte saisi
+            results, _ = await self.get_results_with_fallback(2025)
+            project_index.observe(results)
+        
+        project_id = projet if projet in project_index else next(iter(project_index.search(projet, 1)), None)
+        if project_id is None and "/" in projet:
+            # Identifiant "module/projet" absent de l'index: laisser l'API trancher
+            project_id = projet
+        if project_id is None:
             embed = discord.Embed(
-                title="❌ Erreur",
-                description=f"Erreur lors de la récupération des logs:\n```{str(e)}```",
+                title="❌ Projet introuvable",
+                description=f"Aucun projet ne correspond à `{projet[:100]}`\n\n💡 Choisissez une proposition de l'autocomplétion",
                 color=discord.Color.red()
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        project_data = project_index.get(project_id) or {
+            "name": project_id.split("/")[-1], "module": project_id.split("/")[0], "slug": project_id.split("/")[-1]}
+        select = HistoryProjectSelect(self.epitech_api, {project_id: project_data})
+        await select.show_history(interaction, project_id)
 
-    @app_commands.command(name="export", description="📊 Exporte vos données en CSV, JSON ou PDF")
-    @app_commands.choices(format=[
-        app_commands.Choice(name="CSV", value="csv"),
-        app_commands.Choice(name="JSON", value="json"),
-        app_commands.Choice(name="PDF", value="pdf")
-    ])
-    async def export_slash(self, interaction: discord.Interaction, format: str = "csv"):
-        """Slash command pour exporter les données"""
-        await interaction.response.defer(thinking=True)
+    @app_commands.command(name="perf", description="⏱️ Durées par phase des commandes et interactions (admin)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(
+        cible="Filtrer sur une commande ou une vue (ex: /history, LogsMoulinetteSelect)",
+        export="Joindre les dernières traces au format JSON lines"
+    )
+    @traced("/perf")
+    async def perf_slash(self, interaction: discord.Interaction, cible: Optional[str] = None, export: bool = False):
+        """Slash command affichant les percentiles p50/p95/p99 par phase"""
+        summary = trace_recorder.summary(cible)
         
-        try:
-            # Récupérer les résultats
-            results, error_msg = await self.get_results_with_fallback(2025)
-            
-            if not results:
-                embed = discord.Embed(
-                    title="❌ Aucun résultat disponible",
-                    description="• ⚠️ Token expiré (validité ~1h)\n• 📡 API inaccessible (403 Forbidden)\n• 💾 Aucune donnée locale disponible\n\n💡 Utilisez `/token` puis cliquez sur 'Actualiser Token'",
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            # Préparer les données pour l'export
-            export_data = []
-            for result in results:
-                # Extraire les informations de base depuis différentes structures possibles
-                project_name = result.get("projectName") or result.get("project", {}).get("name") or "N/A"
-                module_code = result.get("moduleCode") or result.get("project", {}).get("module", {}).get("code") or "N/A"
-                date = result.get("date", "N/A")
-                
-                # Extraire le score depuis différentes sources
-                score = result.get("score", 0)
-                if score == 0:
-                    # Essayer de calculer le score depuis les skills
-                    skills = result.get("results", {}).get("skills", {})
-                    if skills:
-                        total_tasks = 0
-                        passed_tasks = 0
-                        for skill_data in skills.values():
-                            if isinstance(skill_data, dict):
-                                count = skill_data.get("count", 0)
-                                passed = skill_data.get("passed", 0)
-                                total_tasks += count
-                                passed_tasks += passed
-                        if total_tasks > 0:
-                            score = int((passed_tasks / total_tasks) * 100)
-                
-                status = result.get("status", "N/A")
-                
-                # Extraire les détails des skills
-                skills = result.get("results", {}).get("skills", {})
-                total_tasks = 0
-                passed_tasks = 0
-                failed_tasks = 0
-                
-                for skill_name, skill_data in skills.items():
-                    if isinstance(skill_data, dict):
-                        count = skill_data.get("count", 0)
-                        passed = skill_data.get("passed", 0)
-                        total_tasks += count
-                        passed_tasks += passed
-                        failed_tasks += (count - passed)
-                
-                export_data.append({
-                    "Date": date,
-                    "Module": module_code,
-                    "Projet": project_name,
-                    "Score": score,
-                    "Statut": status,
-                    "Tâches Total": total_tasks,
-                    "Tâches Réussies": passed_tasks,
-                    "Tâches Échouées": failed_tasks,
-                    "Taux de Réussite": f"{(passed_tasks/total_tasks*100):.1f}%" if total_tasks > 0 else "0%"
-                })
-            
-            # Trier par date (plus récentes en premier)
-            export_data.sort(key=lambda x: x["Date"], reverse=True)
-            
-            # Créer le fichier selon le format demandé
-            if format.lower() == "csv":
-                # Créer le CSV
-                output = io.StringIO()
-                writer = csv.DictWriter(output, fieldnames=export_data[0].keys())
-                writer.writeheader()
-                writer.writerows(export_data)
-                file_content = output.getvalue()
-                file_extension = "csv"
-                mime_type = "text/csv"
-            elif format.lower() == "pdf":
-                # Créer le PDF
-                file_content = self._generate_pdf_report(export_data)
-                file_extension = "pdf"
-                mime_type = "application/pdf"
-            else:  # JSON
-                file_content = json.dumps(export_data, indent=2, ensure_ascii=False)
-                file_extension = "json"
-                mime_type = "application/json"
-            
-            # Créer le fichier Discord
-            if format.lower() == "pdf":
-                file = discord.File(io.BytesIO(file_content), 
-                                  filename=f"moulicord_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}")
-            else:
-                file = discord.File(io.BytesIO(file_content.encode('utf-8')), 
-                                  filename=f"moulicord_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}")
-            
+        embed = discord.Embed(
+            title="⏱️ Performances des interactions",
+            description=f"p50 / p95 / p99 par phase, sur les {trace_recorder.max_samples} dernières exécutions au plus",
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        
+        if not summary:
+            embed.description = "Aucune trace enregistrée" + (f" pour `{cible}`" if cible else "")
+        
+        # Interactions les plus lentes d'abord (p95 total)
+        ranked = sorted(summary.items(), key=lambda item: item[1]["total"]["p95"], reverse=True)
+        for name, phases in ranked[:25]:
+            ordered = sorted(
+                ((phase, stats) for phase, stats in phases.items() if phase != "total"),
+                key=lambda item: item[1]["p50"],
+                reverse=True
+            )
+            lines = [
+                f"**total** {phases['total']['p50'] * 1000:.0f} / {phases['total']['p95'] * 1000:.0f} / {phases['total']['p99'] * 1000:.0f} ms ({phases['total']['count']})"
+            ]
+            for phase, stats in ordered[:6]:
+                label = f"*{phase}*" if phase == SELF_PHASE else phase
+                lines.append(f"{label} {stats['p50'] * 1000:.0f} / {stats['p95'] * 1000:.0f} / {stats['p99'] * 1000:.0f} ms")
+            embed.add_field(name=name, value="\n".join(lines)[:1024], inline=False)
+        
+        embed.set_footer(text=f"« {SELF_PHASE} » = temps du callback hors API, stockage et réponses Discord")
+        
+        if export and trace_recorder.traces:
+            file = discord.File(io.BytesIO(trace_recorder.to_jsonl().encode("utf-8")),
+                                filename=f"moulicord_traces_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+            await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="profile", description="🔬 Profil CPU et mémoire du bot en cours d'exécution (admin)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(duree="Durée du profil en secondes (1 à 120, par défaut: 15)")
+    @traced("/profile")
+    async def profile_slash(self, interaction: discord.Interaction, duree: app_commands.Range[int, 1, 120] = 15):
+        """Slash command lançant un profil par échantillonnage et un instantané tracemalloc"""
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        try:
+            result = await profiler.profile(duration=duree)
+        except RuntimeError as e:
             embed = discord.Embed(
-                title="📊 Export terminé",
-                description=f"Vos données ont été exportées en format **{format.upper()}**\n\n"
-                           f"📈 **{len(export_data)}** entrées exportées\n"
-                           f"📅 Du {export_data[-1]['Date']} au {export_data[0]['Date']}",
-                color=discord.Color.green()
+                title="⏳ Profil indisponible",
+                description=str(e),
+                color=discord.Color.orange()
             )
-            
-            await interaction.followup.send(embed=embed, file=file, ephemeral=True)
-            
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        files = [
+            discord.File(io.BytesIO(result["collapsed"].encode("utf-8")), filename=f"moulicord_profile_{stamp}.collapsed"),
+            discord.File(io.BytesIO(result["allocations"].encode("utf-8")), filename=f"moulicord_allocations_{stamp}.txt")
+        ]
+        
+        embed = discord.Embed(
+            title="🔬 Profil terminé",
+            description=f"**{result['samples']}** échantillons sur **{duree}s**\n"
+                        f"📎 `.collapsed` : à ouvrir avec speedscope ou flamegraph.pl",
+            color=discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        
+        if result["top_frames"]:
+            embed.add_field(
+                name="🔥 Fonctions les plus présentes",
+                value="\n".join(f"• `{frame[:70]}` {share * 100:.1f}%" for frame, share in result["top_frames"][:5]),
+                inline=False
+            )
+        if result["top_allocations"]:
+            embed.add_field(
+                name="🧠 Principales allocations",
+                value="\n".join(f"• `{site[:70]}` {size / 1024:.0f} Ko ({count})" for site, size, count in result["top_allocations"][:5]),
+                inline=False
+            )
+        
+        await interaction.followup.send(embed=embed, files=files, ephemeral=True)
+
+    @app_commands.command(name="sync", description="🔁 Synchronise les commandes slash avec Discord (admin)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(forcer="Synchroniser même si les commandes n'ont pas changé")
+    @traced("/sync")
+    async def sync_slash(self, interaction: discord.Interaction, forcer: bool = False):
+        """Slash command de synchronisation de l'arbre des commandes (ignorée si l'empreinte est inchangée)"""
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
+        try:
+            result = await command_tree_sync.sync(self.bot, force=forcer)
         except Exception as e:
             embed = discord.Embed(
-                title="❌ Erreur d'export",
-                description=f"Erreur lors de l'export: {str(e)}",
+                title="❌ Erreur de synchronisation",
+                description=f"```{str(e)[:300]}```",
                 color=discord.Color.red()
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+        
+        if result["synced"]:
+            embed = discord.Embed(
+                title="🔁 Commandes synchronisées",
+                description=f"**{result['count']}** commandes envoyées à Discord en **{result['duration']:.2f}s** ({result['reason']})",
+                color=discord.Color.green()
+            )
+        else:
+            embed = discord.Embed(
+                title="✅ Déjà à jour",
+                description=f"Les **{result['count']}** commandes n'ont pas changé depuis la dernière synchronisation"
+                            f" ({result['synced_at'] or 'date inconnue'})\n\n💡 Utilisez `forcer: True` pour synchroniser quand même",
+                color=discord.Color.blue()
+            )
+        embed.set_footer(text=f"Empreinte {result['hash'][:12]}")
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
     @app_commands.command(name="help", description="❓ Guide complet des commandes MouliCord")
+    @traced("/help")
     async def help_slash(self, interaction: discord.Interaction):
         """Slash command d'aide avec navigation par pages"""
         
         view = HelpView()
         await interaction.response.send_message(embed=view.get_embed(), view=view, ephemeral=True)
 
-    def _generate_pdf_report(self, export_data: list) -> bytes:
-        """Génère un rapport PDF des données exportées"""
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1,  # Centré
-            textColor=colors.HexColor('#2E86AB')
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.HexColor('#A23B72')
-        )
-        
-        # Contenu du PDF
-        story = []
-        
-        # Titre
-        story.append(Paragraph("📊 Rapport MouliCord", title_style))
-        story.append(Spacer(1, 12))
-        
-        # Informations générales
-        total_entries = len(export_data)
-        if export_data:
-            avg_score = sum(int(row["Score"]) for row in export_data if row["Score"] != "N/A") / len([r for r in export_data if r["Score"] != "N/A"])
-            date_range = f"Du {export_data[-1]['Date'][:10]} au {export_data[0]['Date'][:10]}"
-        else:
-            avg_score = 0
-            date_range = "Aucune donnée"
-        
-        story.append(Paragraph(f"<b>Résumé des performances</b>", heading_style))
-        story.append(Paragraph(f"• <b>Total des entrées:</b> {total_entries}", styles['Normal']))
-        story.append(Paragraph(f"• <b>Score moyen:</b> {avg_score:.1f}%", styles['Normal']))
-        story.append(Paragraph(f"• <b>Période:</b> {date_range}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Tableau des données
-        if export_data:
-            story.append(Paragraph("<b>Détails des moulinettes</b>", heading_style))
-            
-            # Préparer les données du tableau
-            table_data = [["Date", "Module", "Projet", "Score", "Tâches", "Réussite"]]
-            
-            for row in export_data[:50]:  # Limiter à 50 entrées pour éviter les PDF trop longs
-                date_str = row["Date"][:10] if row["Date"] != "N/A" else "N/A"
-                module = row["Module"][:15] + "..." if len(row["Module"]) > 15 else row["Module"]
-                project = row["Projet"][:20] + "..." if len(row["Projet"]) > 20 else row["Projet"]
-                score = str(row["Score"]) + "%" if row["Score"] != "N/A" else "N/A"
-                tasks = f"{row['Tâches Réussies']}/{row['Tâches Total']}"
-                success_rate = row["Taux de Réussite"]
-                
-                table_data.append([date_str, module, project, score, tasks, success_rate])
-            
-            # Créer le tableau
-            table = Table(table_data, colWidths=[1.2*inch, 1.2*inch, 1.8*inch, 0.8*inch, 0.8*inch, 1*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            
-            story.append(table)
-            story.append(Spacer(1, 20))
-        
-        # Statistiques par performance
-        if export_data:
-            story.append(Paragraph("<b>Répartition par performance</b>", heading_style))
-            
-            excellent = len([r for r in export_data if int(r["Score"]) >= 90])
-            good = len([r for r in export_data if 70 <= int(r["Score"]) < 90])
-            average = len([r for r in export_data if 50 <= int(r["Score"]) < 70])
-            poor = len([r for r in export_data if int(r["Score"]) < 50])
-            
-            stats_data = [
-                ["Performance", "Nombre", "Pourcentage"],
-                ["🟢 Excellent (≥90%)", str(excellent), f"{(excellent/total_entries*100):.1f}%"],
-                ["🟡 Bon (70-89%)", str(good), f"{(good/total_entries*100):.1f}%"],
-                ["🟠 Moyen (50-69%)", str(average), f"{(average/total_entries*100):.1f}%"],
-                ["🔴 À améliorer (<50%)", str(poor), f"{(poor/total_entries*100):.1f}%"]
-            ]
-            
-            stats_table = Table(stats_data, colWidths=[2*inch, 1*inch, 1*inch])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#A23B72')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 9)
-            ]))
-            
-            story.append(stats_table)
-        
-        # Pied de page
-        story.append(Spacer(1, 30))
-        story.append(Paragraph(f"<i>Rapport généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')} par MouliCord</i>", styles['Normal']))
-        
-        # Construire le PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
 
 
+class MouliCordExtension(commands.Cog):
+    """
+    Base des cogs chargés en extensions séparées (logs_commands, export_commands)
+    
+    Partage l'API, le fallback local et la mesure de latence du cog principal,
+    qui doit être chargé avant.
+    """
+    
+    def __init__(self, bot, core: MouliCordSlashCommands):
+        self.bot = bot
+        self.core = core
+    
+    @property
+    def epitech_api(self):
+        # L'API est remplacée sur le cog principal à chaque renouvellement du token
+        return self.core.epitech_api
+    
+    async def get_results_with_fallback(self, year=2025):
+        return await self.core.get_results_with_fallback(year)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return await self.core.interaction_check(interaction)
+    
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.core._observe_command(interaction, "error")
+    
+    @classmethod
+    async def setup_extension(cls, bot: commands.Bot):
+        """Ajoute le cog au bot (utilisé par la fonction setup de chaque extension)"""
+        core = bot.get_cog("MouliCordSlashCommands")
+        if core is None:
+            raise RuntimeError("Le cog principal (slash_commands) doit être chargé avant cette extension")
+        await bot.add_cog(cls(bot, core))
+
 # VIEWS ET COMPOSANTS INTERACTIFS
 
 class ConfirmClearView(discord.ui.View):
@@ -1067,6 +1133,7 @@ class ConfirmClearView(discord.ui.View):
         super().__init__(timeout=30)
     
     @discord.ui.button(label="✅ Confirmer", style=discord.ButtonStyle.danger)
+    @traced("ConfirmClearView.confirm_clear")
     async def confirm_clear(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
             # Compter les entrées avant suppression
@@ -1099,6 +1166,7 @@ class ConfirmClearView(discord.ui.View):
             await interaction.response.edit_message(embed=embed, view=None)
     
     @discord.ui.button(label="❌ Annuler", style=discord.ButtonStyle.secondary)
+    @traced("ConfirmClearView.cancel_clear")
     async def cancel_clear(self, interaction: discord.Interaction, button: discord.ui.Button):
         embed = discord.Embed(
             title="❌ Annulé",
@@ -1152,6 +1220,7 @@ class HistoryProjectSelect(discord.ui.Select):
             max_values=1
         )
     
+    @traced("HistoryProjectSelect")
     async def callback(self, interaction: discord.Interaction):
         """Traite la sélection du projet"""
         selected_project = self.values[0]
@@ -1167,20 +1236,17 @@ class HistoryProjectSelect(discord.ui.Select):
             return
         
         await interaction.response.defer()
+        await self.show_history(interaction, selected_project)
+    
+    async def show_history(self, interaction: discord.Interaction, selected_project: str):
+        """Envoie l'historique d'un projet de `projects_map` (interaction déjà différée)"""
+        project_data = self.projects_map[selected_project]
         
         try:
-            # Vérifier que l'API est disponible
-            if not self.epitech_api:
-                embed = discord.Embed(
-                    title="❌ API non disponible",
-                    description="L'API Epitech n'est pas initialisée. Utilisez `/token` pour la réinitialiser.",
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            # Récupérer l'historique du projet (API + fallback local)
-            history = self.epitech_api.get_project_history(selected_project)
+            # Récupérer l'historique du projet (préchargé, API si un token est utilisable, puis fallback local)
+            history = None
+            if self.epitech_api is not None and self.epitech_api.has_valid_token():
+                history = await history_prefetcher.get(selected_project, self.epitech_api.get_project_history)
             
             # Si pas d'historique via API, essayer de construire depuis les données locales
             if not history:
@@ -1222,6 +1288,16 @@ class HistoryProjectSelect(discord.ui.Select):
                     inline=True
                 )
             
+            # Ce qui a changé lors du dernier passage (différence calculée à l'ingestion)
+            latest_run_id = history[0].get("results", {}).get("testRunId")
+            changes = format_diff(run_diff_store.get(latest_run_id)) if latest_run_id else ""
+            if changes:
+                embed.add_field(
+                    name="🔀 Ce qui a changé",
+                    value=changes[:1024],
+                    inline=False
+                )
+            
             # Informations sur le dernier passage
             if history:
                 latest_entry = history[0]
@@ -1250,8 +1326,8 @@ class HistoryProjectSelect(discord.ui.Select):
             
             embed.set_footer(text="MouliCord • Historique détaillé du projet")
             
-            # Créer une vue avec menu pour naviguer dans l'historique
-            history_view = HistoryView(self.epitech_api, history[:25])
+            # Créer une vue avec menu pour naviguer dans l'historique (25 passages par page)
+            history_view = HistoryView(self.epitech_api, selected_project, run_store.put_many(history))
             await interaction.followup.send(embed=embed, view=history_view, ephemeral=True)
             
         except Exception as e:
@@ -1300,28 +1376,130 @@ class HistoryProjectSelect(discord.ui.Select):
             return []
 
 
-class HistoryView(discord.ui.View):
-    """Vue pour naviguer dans l'historique d'un projet"""
+class PaginatedResultsView(discord.ui.View):
+    """Vue avec pagination: ne garde que des identifiants et un curseur de page"""
     
-    def __init__(self, epitech_api: EpitechAPI, history: list):
+    def __init__(self, items: list, page_size: int = 10):
         super().__init__(timeout=300)
-        self.epitech_api = epitech_api
-        self.history = history
+        # Identifiants compacts (testRunId...) et non les résultats eux-mêmes
+        self.items = tuple(items)
+        self.page_size = page_size
+        self.current_page = 0
+        self.max_pages = max(1, (len(self.items) - 1) // page_size + 1)
         
-        if history:
-            self.add_item(HistorySelect(epitech_api, history))
+        # Mettre à jour les boutons
+        self.update_buttons()
+    
+    def update_buttons(self):
+        """Met à jour l'état des boutons de pagination"""
+        self.clear_items()
+        self.add_navigation()
+    
+    def add_navigation(self):
+        """Ajoute les boutons Précédent / page / Suivant"""
+        # Bouton Précédent
+        prev_button = discord.ui.Button(
+            label="⬅️ Précédent",
+            style=discord.ButtonStyle.secondary,
+            disabled=self.current_page == 0
+        )
+        prev_button.callback = self.previous_page
+        self.add_item(prev_button)
+        
+        # Bouton Page actuelle
+        page_button = discord.ui.Button(
+            label=f"📄 {self.current_page + 1}/{self.max_pages}",
+            style=discord.ButtonStyle.primary,
+            disabled=True
+        )
+        self.add_item(page_button)
+        
+        # Bouton Suivant
+        next_button = discord.ui.Button(
+            label="Suivant ➡️",
+            style=discord.ButtonStyle.secondary,
+            disabled=self.current_page >= self.max_pages - 1
+        )
+        next_button.callback = self.next_page
+        self.add_item(next_button)
+    
+    @property
+    def page_start(self) -> int:
+        return self.current_page * self.page_size
+    
+    def get_current_page_items(self) -> tuple:
+        """Identifiants de la page actuelle"""
+        return self.items[self.page_start:self.page_start + self.page_size]
+    
+    def get_current_page_results(self) -> list:
+        """Passages de la page actuelle, relus dans le magasin partagé (évincés ignorés)"""
+        return [result for result in run_store.get_many(self.get_current_page_items()) if result is not None]
+    
+    async def load_page(self):
+        """Recharge le contenu de la page actuelle s'il n'est plus en mémoire (surchargée par les classes filles)"""
+        pass
+    
+    async def go_to_page(self, interaction: discord.Interaction, page: int):
+        """Déplace le curseur, charge la page puis met à jour le message"""
+        self.current_page = max(0, min(page, self.max_pages - 1))
+        await self.load_page()
+        self.update_buttons()
+        await self.update_embed(interaction)
+    
+    @traced("PaginatedResultsView.previous_page")
+    async def previous_page(self, interaction: discord.Interaction):
+        """Page précédente"""
+        if self.current_page > 0:
+            await self.go_to_page(interaction, self.current_page - 1)
+    
+    @traced("PaginatedResultsView.next_page")
+    async def next_page(self, interaction: discord.Interaction):
+        """Page suivante"""
+        if self.current_page < self.max_pages - 1:
+            await self.go_to_page(interaction, self.current_page + 1)
+    
+    async def update_embed(self, interaction: discord.Interaction):
+        """Met à jour l'embed avec la page actuelle"""
+        # Cette méthode sera surchargée par les classes filles
+        pass
+
+
+class HistoryView(PaginatedResultsView):
+    """Vue pour naviguer dans l'historique d'un projet (25 passages par page)"""
+    
+    def __init__(self, epitech_api: EpitechAPI, project_id: str, run_ids: list):
+        self.epitech_api = epitech_api
+        self.project_id = project_id
+        super().__init__(run_ids, page_size=25)
+    
+    def update_buttons(self):
+        """Menu des passages de la page, puis navigation si l'historique dépasse une page"""
+        self.clear_items()
+        runs = self.get_current_page_results()
+        if runs:
+            self.add_item(HistorySelect(self.epitech_api, runs, self.page_start))
+        if self.max_pages > 1:
+            self.add_navigation()
+    
+    async def load_page(self):
+        """Recharge l'historique du projet si des passages de la page ont été évincés du magasin"""
+        if self.epitech_api is not None and self.epitech_api.has_valid_token() and any(run_id not in run_store for run_id in self.get_current_page_items()):
+            run_store.put_many(await history_prefetcher.get(self.project_id, self.epitech_api.get_project_history) or [])
+    
+    async def update_embed(self, interaction: discord.Interaction):
+        """Change de page: seul le menu des passages est remplacé"""
+        await interaction.response.edit_message(view=self)
 
 
 class HistorySelect(discord.ui.Select):
-    """Menu déroulant pour sélectionner un passage dans l'historique"""
+    """Menu déroulant pour sélectionner un passage dans une page de l'historique"""
     
-    def __init__(self, epitech_api: EpitechAPI, history: list):
+    def __init__(self, epitech_api: EpitechAPI, runs: list, first_index: int = 0):
         self.epitech_api = epitech_api
-        self.history = history
         
-        # Créer les options pour chaque passage (max 25)
+        # Créer les options pour chaque passage de la page (max 25), valeur = testRunId
         options = []
-        for i, entry in enumerate(history[:25]):
+        for i, entry in enumerate(runs[:25], start=first_index):
             date = entry.get("date", "Date inconnue")
             try:
                 # Formater la date
@@ -1339,7 +1517,7 @@ class HistorySelect(discord.ui.Select):
             options.append(discord.SelectOption(
                 label=f"#{i+1} - {rate:.1f}%",
                 description=f"{date_str} • {total_passed}/{total_tests} tests",
-                value=str(i)
+                value=str(entry["results"]["testRunId"])
             ))
         
         super().__init__(
@@ -1349,178 +1527,89 @@ class HistorySelect(discord.ui.Select):
             max_values=1
         )
     
-    async def callback(self, interaction: discord.Interaction):
-        """Affiche les détails d'un passage spécifique"""
-        try:
-            run_index = int(self.values[0])
-            run_data = self.history[run_index]
-            
-            await interaction.response.defer()
-            
-            # Créer l'embed détaillé pour ce passage manuellement
-            project = run_data.get("project", {})
-            project_name = project.get("name", "Projet inconnu")
-            skills = run_data.get("results", {}).get("skills", {})
-            total_tests = sum(skill.get("count", 0) for skill in skills.values())
-            total_passed = sum(skill.get("passed", 0) for skill in skills.values())
-            rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
-            progress = self.epitech_api._generate_progress_bar(total_passed, total_tests, 15)
-            
-            embed = discord.Embed(
-                title=f"📊 Passage #{run_index + 1} - {project_name}",
-                description=f"📊 **{total_passed}/{total_tests} tests** ({rate:.1f}%)\n📈 {progress}",
-                color=discord.Color.green() if rate >= 70 else discord.Color.orange() if rate >= 50 else discord.Color.red(),
-                timestamp=datetime.now()
-            )
-            
-            # Détails par compétence
-            for skill_name, skill_data in skills.items():
-                count = skill_data.get("count", 0)
-                passed = skill_data.get("passed", 0)
-                skill_rate = (passed / count * 100) if count > 0 else 0
-                skill_progress = self.epitech_api._generate_progress_bar(passed, count, 8)
-                
-                embed.add_field(
-                    name=f"🎯 {skill_name}",
-                    value=f"{passed}/{count} ({skill_rate:.1f}%)\n{skill_progress}",
-                    inline=True
-                )
-            
-            # Ajouter la date
-            date = run_data.get("date", "")
-            if date:
-                try:
-                    dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-                    embed.add_field(
-                        name="📅 Date",
-                        value=dt.strftime("%d/%m/%Y à %H:%M:%S"),
-                        inline=True
-                    )
-                except:
-                    embed.add_field(
-                        name="📅 Date",
-                        value=date,
-                        inline=True
-                    )
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
-        except (ValueError, IndexError):
-            embed = discord.Embed(
-                title="❌ Passage introuvable",
-                description=f"Impossible de récupérer les détails pour ce passage",
-                color=discord.Color.red()
-            )
-            await interaction.followup.send(embed=embed, ephemeral=True)
-                
-        except Exception as e:
-            embed = discord.Embed(
-                title="❌ Erreur",
-                description=f"```{str(e)}```",
-                color=discord.Color.red()
-            )
-            await interaction.followup.send(embed=embed, ephemeral=True)
-
-
-class LogsSelectionView(discord.ui.View):
-    """Vue pour la sélection de moulinette dans /logs"""
-    
-    def __init__(self, epitech_api: EpitechAPI, results: list):
-        super().__init__(timeout=300)
-        self.epitech_api = epitech_api
-        self.results = results
+    def _build_run_embed(self, run_index: int, run_data: dict) -> discord.Embed:
+        """Construit l'embed détaillé d'un passage (barres de progression par compétence)"""
+        # Créer l'embed détaillé pour ce passage manuellement
+        project = run_data.get("project", {})
+        project_name = project.get("name", "Projet inconnu")
+        skills = run_data.get("results", {}).get("skills", {})
+        total_tests = sum(skill.get("count", 0) for skill in skills.values())
+        total_passed = sum(skill.get("passed", 0) for skill in skills.values())
+        rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
+        progress = EpitechAPI._generate_progress_bar(total_passed, total_tests, 15)
         
-        # Ajouter le menu de sélection des moulinettes
-        self.add_item(LogsMoulinetteSelect(epitech_api, results))
-
-
-class LogsMoulinetteSelect(discord.ui.Select):
-    """Menu déroulant pour sélectionner une moulinette dans /logs"""
-    
-    def __init__(self, epitech_api: EpitechAPI, results: list):
-        self.epitech_api = epitech_api
-        self.results = results
+        embed = discord.Embed(
+            title=f"📊 Passage #{run_index + 1} - {project_name}",
+            description=f"📊 **{total_passed}/{total_tests} tests** ({rate:.1f}%)\n📈 {progress}",
+            color=discord.Color.green() if rate >= 70 else discord.Color.orange() if rate >= 50 else discord.Color.red(),
+            timestamp=datetime.now()
+        )
         
-        # Créer les options pour le menu (max 25)
-        options = []
-        for i, result in enumerate(results[:25]):
-            project = result.get("project", {})
-            project_name = project.get("name", "Projet inconnu")
-            date = result.get("date", "")
+        # Détails par compétence
+        for skill_name, skill_data in skills.items():
+            count = skill_data.get("count", 0)
+            passed = skill_data.get("passed", 0)
+            skill_rate = (passed / count * 100) if count > 0 else 0
+            skill_progress = EpitechAPI._generate_progress_bar(passed, count, 8)
             
-            # Formater la date
+            embed.add_field(
+                name=f"🎯 {skill_name}",
+                value=f"{passed}/{count} ({skill_rate:.1f}%)\n{skill_progress}",
+                inline=True
+            )
+        
+        # Ajouter la date
+        date = run_data.get("date", "")
+        if date:
             try:
                 dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-                date_str = dt.strftime("%d/%m/%Y %H:%M")
+                embed.add_field(
+                    name="📅 Date",
+                    value=dt.strftime("%d/%m/%Y à %H:%M:%S"),
+                    inline=True
+                )
             except:
-                date_str = date[:16] if len(date) > 16 else date
-            
-            # Calculer le score
-            skills = result.get("results", {}).get("skills", {})
-            total_tests = sum(skill.get("count", 0) for skill in skills.values())
-            total_passed = sum(skill.get("passed", 0) for skill in skills.values())
-            rate = (total_passed / total_tests * 100) if total_tests > 0 else 0
-            
-            # Tronquer le nom si trop long
-            display_name = project_name[:50] + "..." if len(project_name) > 50 else project_name
-            
-            # Choisir l'emoji selon le score
-            if rate >= 100:
-                emoji = "✅"
-            elif rate >= 80:
-                emoji = "🟡"
-            elif rate >= 50:
-                emoji = "🟠"
-            else:
-                emoji = "❌"
-            
-            options.append(discord.SelectOption(
-                label=f"{emoji} {display_name}",
-                description=f"{date_str} • {rate:.1f}%",
-                value=str(i)
-            ))
+                embed.add_field(
+                    name="📅 Date",
+                    value=date,
+                    inline=True
+                )
         
-        super().__init__(
-            placeholder="📋 Choisissez une moulinette...",
-            options=options,
-            min_values=1,
-            max_values=1
-        )
+        return embed
     
+    @traced("HistorySelect")
     async def callback(self, interaction: discord.Interaction):
-        """Traite la sélection de la moulinette"""
+        """Affiche les détails d'un passage spécifique"""
         try:
-            moulinette_index = int(self.values[0])
-            moulinette_data = self.results[moulinette_index]
+            run_id = int(self.values[0])
+            run_index = self.view.items.index(run_id)
             
             await interaction.response.defer()
             
-            # Récupérer les détails de la moulinette
-            test_run_id = moulinette_data.get("results", {}).get("testRunId")
-            if not test_run_id:
-                embed = discord.Embed(
-                    title="❌ Erreur",
-                    description="ID de test non trouvé pour cette moulinette",
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=embed, ephemeral=True)
-                return
-            
-            # Récupérer les détails via l'API
-            details = self.epitech_api.get_detailed_results(test_run_id)
-            
-            if not details:
-                # Fallback: utiliser les données de base
-                await self._show_basic_logs(interaction, moulinette_data)
-                return
+            await self.view.load_page()
+            run_data = run_store.get(run_id)
+            if run_data is None:
+                raise LookupError(run_id)
+            
+            # Rendu mis en cache par passage tant que les données n'ont pas changé
+            run_key = (
+                run_data.get("project", {}).get("slug", ""),
+                run_data.get("results", {}).get("testRunId"),
+                run_data.get("date", ""),
+                run_index
+            )
+            embed = embed_cache.get_or_render(
+                "history_run",
+                run_key,
+                lambda: self._build_run_embed(run_index, run_data)
+            )
             
-            # Afficher les logs détaillés
-            await self._show_detailed_logs(interaction, moulinette_data, details)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             
-        except (ValueError, IndexError):
+        except (ValueError, LookupError):
             embed = discord.Embed(
-                title="❌ Moulinette introuvable",
-                description="Impossible de récupérer les détails pour cette moulinette",
+                title="❌ Passage introuvable",
+                description=f"Impossible de récupérer les détails pour ce passage",
                 color=discord.Color.red()
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
@@ -1528,431 +1617,41 @@ class LogsMoulinetteSelect(discord.ui.Select):
         except Exception as e:
             embed = discord.Embed(
                 title="❌ Erreur",
-                description=f"Erreur lors de la récupération des logs:\n```{str(e)}```",
+                description=f"```{str(e)}```",
                 color=discord.Color.red()
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
-    
-    async def _show_basic_logs(self, interaction: discord.Interaction, moulinette_data: dict):
-        """Affiche les logs basiques quand les détails ne sont pas disponibles"""
-        project = moulinette_data.get("project", {})
-        project_name = project.get("name", "Projet inconnu")
-        skills = moulinette_data.get("results", {}).get("skills", {})
-        
-        # Trouver la première tâche qui échoue
-        first_failed_task = None
-        for task_name, task_data in skills.items():
-            task_passed = task_data.get("passed", 0)
-            task_count = task_data.get("count", 0)
-            task_crashed = task_data.get("crashed", 0)
-            task_mandatory_failed = task_data.get("mandatoryFailed", 0)
-            
-            # Une tâche échoue si : pas tous les tests passés, ou des tests crashés, ou des échecs obligatoires
-            if (task_passed < task_count and task_count > 0) or task_crashed > 0 or task_mandatory_failed > 0:
-                first_failed_task = {
-                    "name": task_name,
-                    "passed": task_passed,
-                    "count": task_count,
-                    "crashed": task_crashed,
-                    "mandatory_failed": task_mandatory_failed
-                }
-                break
-        
-        embed = discord.Embed(
-            title=f"📋 Logs - {project_name}",
-            description="Détails des erreurs de la moulinette",
-            color=discord.Color.orange(),
-            timestamp=datetime.now()
-        )
-        
-        if first_failed_task:
-            # Construire le message d'erreur selon le type d'échec
-            error_details = f"**{first_failed_task['name']}**\n"
-            error_details += f"Tests: {first_failed_task['passed']}/{first_failed_task['count']}\n"
-            
-            if first_failed_task['crashed'] > 0:
-                error_details += f"💥 **Crashed:** {first_failed_task['crashed']}\n"
-            if first_failed_task['mandatory_failed'] > 0:
-                error_details += f"🚫 **Mandatory Failed:** {first_failed_task['mandatory_failed']}\n"
-            
-            # Déterminer l'icône selon le type d'échec
-            if first_failed_task['crashed'] > 0:
-                icon = "💥"
-                error_type = "Tâche crashée"
-            elif first_failed_task['mandatory_failed'] > 0:
-                icon = "🚫"
-                error_type = "Échec obligatoire"
-            else:
-                icon = "❌"
-                error_type = "Tests échoués"
-            
-            embed.add_field(
-                name=f"{icon} {error_type}",
-                value=error_details,
-                inline=False
-            )
-            
-            # Ajouter un message pour les logs détaillés
-            embed.add_field(
-                name="🔍 Logs d'erreur",
-                value="Les logs détaillés ne sont pas disponibles en mode basique.\n"
-                      "Utilisez `/token` pour actualiser et obtenir les détails complets.",
-                inline=False
-            )
-        else:
-            embed.add_field(
-                name="✅ Aucune erreur",
-                value="Toutes les tâches ont réussi",
-                inline=False
-            )
-        
-        # Résumé des compétences
-        skills_summary = []
-        for task_name, task_data in list(skills.items())[:10]:  # Limiter à 10
-            task_passed = task_data.get("passed", 0)
-            task_count = task_data.get("count", 0)
-            task_crashed = task_data.get("crashed", 0)
-            
-            if task_passed == task_count and task_count > 0:
-                icon = "✅"
-            elif task_crashed > 0:
-                icon = "💥"
-            elif task_passed > 0:
-                icon = "⚠️"
-            else:
-                icon = "❌"
-            
-            skills_summary.append(f"{icon} **{task_name}**: {task_passed}/{task_count}")
-        
-        if skills_summary:
-            embed.add_field(
-                name="📊 Résumé des tâches",
-                value="\n".join(skills_summary),
-                inline=False
-            )
-        
-        embed.set_footer(text="MouliCord • Logs basiques (détails non disponibles)")
-        await interaction.followup.send(embed=embed, ephemeral=True)
-    
-    def _get_performance_color(self, score: int) -> discord.Color:
-        """Retourne une couleur selon le score de performance"""
-        if score >= 90:
-            return discord.Color.green()
-        elif score >= 70:
-            return discord.Color.yellow()
-        elif score >= 50:
-            return discord.Color.orange()
-        else:
-            return discord.Color.red()
-    
-    def _get_performance_emoji(self, score: int) -> str:
-        """Retourne un emoji selon le score de performance"""
-        if score >= 90:
-            return "🟢"
-        elif score >= 70:
-            return "🟡"
-        elif score >= 50:
-            return "🟠"
-        else:
-            return "🔴"
 
-    def _extract_failed_task_output(self, output: str, task_name: str) -> str:
-        """Extrait uniquement la partie pertinente des logs d'erreur d'une tâche"""
-        if not output:
-            return ""
-        
-        # Nettoyer l'output (enlever les caractères de contrôle)
-        cleaned_output = output.replace('\x1b[0m', '').replace('\x1b[31m', '').replace('\x1b[32m', '').replace('\x1b[33m', '')
-        
-        # Diviser par lignes
-        lines = cleaned_output.split('\n')
-        
-        # Chercher la première tâche qui échoue (FAILURE)
-        failed_task_start = -1
-        for i, line in enumerate(lines):
-            if ": FAILURE" in line or "Test failed:" in line:
-                # Remonter pour trouver le début de la section de cette tâche
-                for j in range(i, max(0, i-20), -1):
-                    if "====" in lines[j] and ("task" in lines[j].lower() or "====" in lines[j]):
-                        failed_task_start = j
-                        break
-                break
-        
-        if failed_task_start == -1:
-            # Si on ne trouve pas de FAILURE, chercher la tâche spécifique par nom
-            task_name_short = task_name.split(' - ')[1] if ' - ' in task_name else task_name
-            for i, line in enumerate(lines):
-                if f"task{task_name_short}" in line and "====" in line:
-                    failed_task_start = i
-                    break
-            
-            if failed_task_start == -1:
-                return cleaned_output[:2000] + ("..." if len(cleaned_output) > 2000 else "")
-        
-        # Extraire la section de la tâche qui échoue
-        task_lines = []
-        
-        for i in range(failed_task_start, len(lines)):
-            line = lines[i]
-            task_lines.append(line)
-            
-            # Arrêter à la prochaine section de tâche ou à la fin
-            if i + 1 < len(lines) and "====" in lines[i + 1] and "task" in lines[i + 1].lower():
-                break
-        
-        # Filtrer pour ne garder que la partie "Executing all tests..." et les résultats d'erreur
-        filtered_lines = []
-        in_execution_section = False
-        
-        for line in task_lines:
-            if "# Executing all tests..." in line:
-                in_execution_section = True
-                filtered_lines.append(line)
-            elif in_execution_section:
-                # Garder toutes les lignes importantes, même vides
-                if not line.startswith("# Building...") and not line.startswith("# Checking for forbidden functions..."):
-                    filtered_lines.append(line)
-                # Ne pas s'arrêter à la première ligne qui commence par "#"
-                # Continuer jusqu'à la fin de la section de la tâche
-        
-        result = '\n'.join(filtered_lines)
-        
-        # Tronquer si trop long
-        if len(result) > 2000:
-            result = result[:2000] + "\n... (tronqué)"
-        
-        return result
-
-    async def _show_detailed_logs(self, interaction: discord.Interaction, moulinette_data: dict, details: dict):
-        """Affiche les logs détaillés avec les messages d'erreur"""
-        project = moulinette_data.get("project", {})
-        project_name = project.get("name", "Projet inconnu")
-        
-        # Utiliser les données de moulinette_data en priorité (comme les autres commandes)
-        skills = moulinette_data.get("results", {}).get("skills", {})
-        
-        # Si pas de skills dans moulinette_data, essayer de récupérer depuis les détails
-        if not skills:
-            results = details.get("results", {})
-            skills = results.get("skills", {})
-        
-        # Trouver la première tâche qui échoue
-        first_failed_task = None
-        for task_name, task_data in skills.items():
-            task_passed = task_data.get("passed", 0)
-            task_count = task_data.get("count", 0)
-            task_crashed = task_data.get("crashed", 0)
-            task_mandatory_failed = task_data.get("mandatoryFailed", 0)
-            
-            # Une tâche échoue si : pas tous les tests passés, ou des tests crashés, ou des échecs obligatoires
-            if (task_passed < task_count and task_count > 0) or task_crashed > 0 or task_mandatory_failed > 0:
-                first_failed_task = {
-                    "name": task_name,
-                    "passed": task_passed,
-                    "count": task_count,
-                    "crashed": task_crashed,
-                    "mandatory_failed": task_mandatory_failed,
-                    "tests": task_data.get("tests", [])
-                }
-                break
-        
-        embed = discord.Embed(
-            title=f"📋 Logs Détaillés - {project_name}",
-            description="Messages d'erreur de la moulinette",
-            color=discord.Color.red() if first_failed_task else discord.Color.green(),
-            timestamp=datetime.now()
-        )
-        
-        if first_failed_task:
-            # Construire le message d'erreur selon le type d'échec
-            error_details = f"**{first_failed_task['name']}**\n"
-            error_details += f"Tests: {first_failed_task['passed']}/{first_failed_task['count']}\n"
-            
-            if first_failed_task['crashed'] > 0:
-                error_details += f"💥 **Crashed:** {first_failed_task['crashed']}\n"
-            if first_failed_task['mandatory_failed'] > 0:
-                error_details += f"🚫 **Mandatory Failed:** {first_failed_task['mandatory_failed']}\n"
-            
-            # Déterminer l'icône selon le type d'échec
-            if first_failed_task['crashed'] > 0:
-                icon = "💥"
-                error_type = "Tâche crashée"
-            elif first_failed_task['mandatory_failed'] > 0:
-                icon = "🚫"
-                error_type = "Échec obligatoire"
-            else:
-                icon = "❌"
-                error_type = "Tests échoués"
-            
-            # Afficher les détails de la première tâche échouée
-            embed.add_field(
-                name=f"{icon} {error_type}",
-                value=error_details,
-                inline=False
-            )
-            
-            # Afficher les détails des tests échoués de la première tâche
-            failed_tests = []
-            
-            # Essayer de récupérer les logs depuis les détails de l'API
-            if details and "externalItems" in details:
-                external_items = details.get("externalItems", [])
-                
-                # Chercher l'item de type "trace-pool" qui contient les logs
-                for item in external_items:
-                    if item.get("type") == "trace-pool":
-                        trace_content = item.get("comment", "")
-                        
-                        # Extraire les logs de la tâche échouée
-                        cleaned_output = self._extract_failed_task_output(trace_content, first_failed_task['name'])
-                        if cleaned_output:
-                            failed_tests.append(f"```\n{cleaned_output}\n```")
-                        break
-            
-            # Si pas de logs trouvés, essayer depuis moulinette_data
-            if not failed_tests:
-                for test in first_failed_task.get("tests", []):
-                    if not test.get("passed", False):
-                        test_output = test.get("output", "")
-                        if test_output:
-                            cleaned_output = self._extract_failed_task_output(test_output, first_failed_task['name'])
-                            if cleaned_output:
-                                failed_tests.append(f"```\n{cleaned_output}\n```")
-                                break
-            
-            if failed_tests:
-                embed.add_field(
-                    name="🔍 Logs d'erreur de la première tâche",
-                    value="\n\n".join(failed_tests),
-                    inline=False
-                )
-            else:
-                # Si pas de détails de tests, afficher un message générique
-                embed.add_field(
-                    name="🔍 Détails de l'échec",
-                    value=f"Tâche **{first_failed_task['name']}** échouée\n"
-                          f"Tests passés: {first_failed_task['passed']}/{first_failed_task['count']}\n"
-                          f"Pour plus de détails, consultez le rapport complet sur EpiTest",
-                    inline=False
-                )
-        else:
-            embed.add_field(
-                name="✅ Aucune erreur",
-                value="Toutes les tâches ont réussi",
-                inline=False
-            )
-        
-        # Résumé des compétences
-        skills_summary = []
-        for task_name, task_data in list(skills.items())[:10]:  # Limiter à 10
-            task_passed = task_data.get("passed", 0)
-            task_count = task_data.get("count", 0)
-            task_crashed = task_data.get("crashed", 0)
-            
-            if task_passed == task_count and task_count > 0:
-                icon = "✅"
-            elif task_crashed > 0:
-                icon = "💥"
-            elif task_passed > 0:
-                icon = "⚠️"
-            else:
-                icon = "❌"
-            
-            skills_summary.append(f"{icon} **{task_name}**: {task_passed}/{task_count}")
-        
-        if skills_summary:
-            embed.add_field(
-                name="📊 Résumé des tâches",
-                value="\n".join(skills_summary),
-                inline=False
-            )
-        
-        embed.set_footer(text="MouliCord • Logs détaillés avec messages d'erreur")
-        await interaction.followup.send(embed=embed, ephemeral=True)
-
-
-class PaginatedResultsView(discord.ui.View):
-    """Vue avec pagination pour les résultats"""
-    
-    def __init__(self, results: list, page_size: int = 10):
-        super().__init__(timeout=300)
-        self.results = results
-        self.page_size = page_size
-        self.current_page = 0
-        self.max_pages = (len(results) - 1) // page_size + 1
-        
-        # Mettre à jour les boutons
-        self.update_buttons()
-    
-    def update_buttons(self):
-        """Met à jour l'état des boutons de pagination"""
-        self.clear_items()
-        
-        # Bouton Précédent
-        prev_button = discord.ui.Button(
-            label="⬅️ Précédent",
-            style=discord.ButtonStyle.secondary,
-            disabled=self.current_page == 0
-        )
-        prev_button.callback = self.previous_page
-        self.add_item(prev_button)
-        
-        # Bouton Page actuelle
-        page_button = discord.ui.Button(
-            label=f"📄 {self.current_page + 1}/{self.max_pages}",
-            style=discord.ButtonStyle.primary,
-            disabled=True
-        )
-        self.add_item(page_button)
-        
-        # Bouton Suivant
-        next_button = discord.ui.Button(
-            label="Suivant ➡️",
-            style=discord.ButtonStyle.secondary,
-            disabled=self.current_page >= self.max_pages - 1
-        )
-        next_button.callback = self.next_page
-        self.add_item(next_button)
-    
-    def get_current_page_results(self):
-        """Retourne les résultats de la page actuelle"""
-        start = self.current_page * self.page_size
-        end = start + self.page_size
-        return self.results[start:end]
-    
-    async def previous_page(self, interaction: discord.Interaction):
-        """Page précédente"""
-        if self.current_page > 0:
-            self.current_page -= 1
-            self.update_buttons()
-            await self.update_embed(interaction)
-    
-    async def next_page(self, interaction: discord.Interaction):
-        """Page suivante"""
-        if self.current_page < self.max_pages - 1:
-            self.current_page += 1
-            self.update_buttons()
-            await self.update_embed(interaction)
-    
-    async def update_embed(self, interaction: discord.Interaction):
-        """Met à jour l'embed avec la page actuelle"""
-        # Cette méthode sera surchargée par les classes filles
-        pass
 
 class HistoryPaginatedView(PaginatedResultsView):
     """Vue paginée pour l'historique des projets"""
     
     def __init__(self, epitech_api: EpitechAPI, projects_list: list):
+        # Agrégats par projet (nom, module, moyenne, nombre de passages): déjà compacts
+        self.projects = projects_list
         super().__init__(projects_list, page_size=15)
         self.epitech_api = epitech_api
+        # Empreinte du contenu pour partager les pages rendues entre vues identiques
+        self._content_key = hash(tuple(
+            (p.get("name"), p.get("module"), p.get("avg_score"), p.get("total_runs"))
+            for p in projects_list
+        ))
     
     def get_embed(self):
         """Retourne l'embed pour la page actuelle"""
-        current_projects = self.get_current_page_results()
+        return embed_cache.get_or_render(
+            "history_page",
+            (self._content_key, self.current_page),
+            self._build_embed
+        )
+    
+    def _build_embed(self):
+        """Construit l'embed de la page actuelle"""
+        current_projects = self.get_current_page_items()
         
         # Calculer les statistiques globales
-        total_projects = len(self.results)
-        avg_score = sum(p.get("avg_score", 0) for p in self.results) / len(self.results) if self.results else 0
+        total_projects = len(self.projects)
+        avg_score = sum(p.get("avg_score", 0) for p in self.projects) / len(self.projects) if self.projects else 0
         
         # Couleur dynamique basée sur la moyenne
         color = self._get_performance_color(int(avg_score))
@@ -2034,10 +1733,11 @@ class HelpView(discord.ui.View):
                 "description": "**Commandes essentielles pour surveiller vos résultats:**",
                 "fields": [
                     {"name": "`/results`", "value": "📊 Derniers résultats avec actualisation", "inline": False},
-                    {"name": "`/history`", "value": "📈 Sélection projet + pagination + couleurs dynamiques", "inline": False},
+                    {"name": "`/history [projet]`", "value": "📈 Sélection projet (ou recherche par autocomplétion) + pagination + couleurs dynamiques", "inline": False},
                     {"name": "`/stats`", "value": "📈 Statistiques complètes", "inline": False},
                     {"name": "`/logs`", "value": "📋 Logs d'erreur des moulinettes", "inline": False},
-                    {"name": "`/export`", "value": "📊 Export des données en CSV/JSON/PDF", "inline": False}
+                    {"name": "`/search`", "value": "🔎 Recherche dans les traces (erreurs, tests)", "inline": False},
+                    {"name": "`/export`", "value": "📊 Export des données en CSV/JSON/PDF/Parquet/Arrow, filtrable par date, module et projet", "inline": False}
                 ]
             },
             {
@@ -2046,7 +1746,10 @@ class HelpView(discord.ui.View):
                 "fields": [
                     {"name": "`/status`", "value": "📊 État du bot, API et token", "inline": False},
                     {"name": "`/check_now`", "value": "🔄 Vérification immédiate", "inline": False},
-                    {"name": "`/token`", "value": "🔐 Vérification + actualisation du token", "inline": False}
+                    {"name": "`/token`", "value": "🔐 Vérification + actualisation du token", "inline": False},
+                    {"name": "`/perf`", "value": "⏱️ Durées p50/p95/p99 par phase des commandes (admin)", "inline": False},
+                    {"name": "`/profile`", "value": "🔬 Profil CPU (flamegraph) + allocations mémoire à chaud (admin)", "inline": False},
+                    {"name": "`/sync`", "value": "🔁 Resynchronise les commandes slash si elles ont changé, ou de force (admin)", "inline": False}
                 ]
             },
             {
@@ -2096,6 +1799,7 @@ class HelpView(discord.ui.View):
         # Note: Les boutons sont mis à jour dans les méthodes callback individuelles
     
     @discord.ui.button(label="◀️ Précédent", style=discord.ButtonStyle.primary)
+    @traced("HelpView.previous_page")
     async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.current_page > 0:
             self.current_page -= 1
@@ -2104,6 +1808,7 @@ class HelpView(discord.ui.View):
             await interaction.response.defer()
     
     @discord.ui.button(label="Suivant ▶️", style=discord.ButtonStyle.primary)
+    @traced("HelpView.next_page")
     async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.current_page < len(self.pages) - 1:
             self.current_page += 1
@@ -0,0 +1,98 @@
+import asyncio
+import inspect
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import registry
+
+
+startup_phase_duration = registry.gauge(
+    "moulicord_startup_phase_seconds", "Durée de chaque phase du démarrage (dernier démarrage)", ("phase",))
+
+
+class StartupPipeline:
+    """
+    Démarrage du bot en phases explicites, exécuté une seule fois par processus
+
+    on_ready est déclenché à nouveau après chaque reprise ou reconnexion de la
+    passerelle Discord: les appels suivants attendent le démarrage en cours ou
+    ne font rien s'il est terminé. Une phase en erreur est journalisée et
+    n'empêche pas les suivantes; la durée de chaque phase est conservée.
+    """
+
+    def __init__(self):
+        self.phases: List[Tuple[str, Callable]] = []
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+        self.ready_events = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def phase(self, name: str):
+        """Décorateur: ajoute une phase (fonction synchrone ou coroutine) dans l'ordre de déclaration"""
+        def decorator(func):
+            self.phases.append((name, func))
+            return func
+        return decorator
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    @property
+    def completed(self) -> bool:
+        return self.completed_at is not None
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+    async def run(self) -> bool:
+        """
+        Exécute le pipeline au premier appel; les appels suivants ne le relancent pas
+
+        Returns:
+            True si cet appel a lancé le démarrage, False s'il était déjà lancé
+        """
+        self.ready_events += 1
+        if self._task is not None:
+            if not self._task.done():
+                await asyncio.shield(self._task)
+            return False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        await asyncio.shield(self._task)
+        return True
+
+    async def _run(self):
+        self.started_at = time.time()
+        for name, func in self.phases:
+            start = time.perf_counter()
+            try:
+                result = func()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.errors[name] = str(e)
+                print(f"[WARN] Phase de démarrage « {name} » en erreur: {e}")
+            finally:
+                self.timings[name] = time.perf_counter() - start
+                startup_phase_duration.set(self.timings[name], phase=name)
+        self.completed_at = time.time()
+
+    def format_stats(self) -> str:
+        """Durée de chaque phase (pour les logs et /status)"""
+        if not self.timings:
+            return "Démarrage en cours" if self.started else "Démarrage non lancé"
+        parts = [f"{name} {duration * 1000:.0f}ms" if duration < 1 else f"{name} {duration:.1f}s"
+                 for name, duration in self.timings.items()]
+        summary = f"{self.total:.1f}s • " + ", ".join(parts)
+        if self.errors:
+            summary += f" • ⚠️ {len(self.errors)} phase(s) en erreur"
+        if self.ready_events > 1:
+            summary += f" • {self.ready_events - 1} reconnexion(s)"
+        return summary
+
+
+# Instance partagée entre on_ready (bot.py) et /status
+startup_pipeline = StartupPipeline()
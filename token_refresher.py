@@ -1,14 +1,11 @@
 import time
 import json
 import os
-from typing import Optional, Dict
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from typing import Optional, Dict, TYPE_CHECKING
+from metrics import token_refresh_duration
+
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 
 class TokenRefresher:
@@ -21,8 +18,13 @@ class TokenRefresher:
         self.use_persistent_profile = use_persistent_profile
         self.profile_dir = os.path.join(os.getcwd(), "chrome_profile_epitech")
         
-    def _setup_driver(self) -> webdriver.Chrome:
+    def _setup_driver(self) -> "webdriver.Chrome":
         """Configure et initialise le driver Chrome avec persistance"""
+        # Selenium n'est importé qu'au premier renouvellement (démarrage du bot plus rapide)
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         try:
             chrome_options = Options()
             
@@ -162,6 +164,8 @@ class TokenRefresher:
     
     def _check_existing_session(self) -> bool:
         """Vérifie si une session Office valide existe déjà"""
+        from selenium.webdriver.common.by import By
+        
         try:
             if not self.use_persistent_profile or not os.path.exists(self.profile_dir):
                 return False
@@ -198,6 +202,11 @@ class TokenRefresher:
         Returns:
             Dict avec 'success', 'token', 'message' et optionnellement 'error'
         """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        
         try:
             print("🚀 Démarrage de la récupération automatique du token...")
             
@@ -399,8 +408,14 @@ def auto_refresh_token(headless: bool = True, update_env: bool = True, use_persi
     Returns:
         Dictionnaire avec le résultat de l'opération
     """
-    refresher = TokenRefresher(headless=headless, use_persistent_profile=use_persistent_profile)
-    result = refresher.refresh_token()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        refresher = TokenRefresher(headless=headless, use_persistent_profile=use_persistent_profile)
+        result = refresher.refresh_token()
+        outcome = "success" if result.get("success") else "failure"
+    finally:
+        token_refresh_duration.observe(time.perf_counter() - start, outcome=outcome)
     
     if result.get("success") and update_env and result.get("token"):
         env_updated = refresher.update_env_file(result["token"])
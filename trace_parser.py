@@ -0,0 +1,204 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+# Toutes les séquences ANSI (CSI, OSC et échappements à deux caractères)
+ANSI_ESCAPE_RE = re.compile(r'\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])')
+
+FAILURE_MARKERS = (": FAILURE", "Test failed:")
+EXECUTION_MARKER = "# Executing all tests..."
+NOISE_PREFIXES = ("# Building...", "# Checking for forbidden functions...")
+MAX_OUTPUT_LENGTH = 2000
+
+
+def strip_ansi(text: str) -> str:
+    """Supprime toutes les séquences d'échappement ANSI d'un texte"""
+    return ANSI_ESCAPE_RE.sub('', text)
+
+
+class TraceIndex:
+    """
+    Index d'une trace `trace-pool` construit en une seule passe
+
+    La trace nettoyée est conservée telle quelle; l'index ne contient que des
+    numéros de ligne et des offsets, de sorte que l'extraction d'une section
+    se résume à un découpage de chaîne.
+    """
+
+    def __init__(self, output: str):
+        self.text = strip_ansi(output)
+        # (numéro de ligne, offset de début) de chaque ligne "===="
+        self.separators: List[Tuple[int, int]] = []
+        self.separator_lines: List[str] = []
+        # Sous-ensemble des séparateurs qui ouvrent une section de tâche
+        self.task_starts: List[Tuple[int, int]] = []
+        # (numéro de ligne, offset de début) des lignes "# Executing all tests..."
+        self.executions: List[Tuple[int, int]] = []
+        # (numéro de ligne, offset de début, offset de fin) des lignes à ignorer
+        self.noise: List[Tuple[int, int, int]] = []
+        # (numéro de ligne, offset de début, offset de fin) des lignes d'échec
+        self.failures: List[Tuple[int, int, int]] = []
+        self.sections: List[Dict] = []
+        self._parse()
+
+    def _parse(self):
+        """Parcourt la trace une seule fois et enregistre les repères utiles"""
+        offset = 0
+        for line_no, line in enumerate(self.text.split('\n')):
+            end = offset + len(line)
+            if "====" in line:
+                self.separators.append((line_no, offset))
+                self.separator_lines.append(line)
+                if "task" in line.lower():
+                    self.task_starts.append((line_no, offset))
+                    self.sections.append({
+                        "name": line.strip("= \t\r"),
+                        "line": line_no,
+                        "start": offset,
+                        "end": len(self.text),
+                        "status": "success",
+                        "failure_lines": []
+                    })
+            if "#" in line:
+                if EXECUTION_MARKER in line:
+                    self.executions.append((line_no, offset))
+                if line.startswith(NOISE_PREFIXES):
+                    self.noise.append((line_no, offset, end))
+            if FAILURE_MARKERS[0] in line or FAILURE_MARKERS[1] in line:
+                self.failures.append((line_no, offset, end))
+                if self.sections:
+                    self.sections[-1]["status"] = "failure"
+                    self.sections[-1]["failure_lines"].append(line_no)
+            offset = end + 1
+
+        # Numéros de ligne seuls, pour les recherches dichotomiques
+        self._separator_line_nos = [line_no for line_no, _ in self.separators]
+        self._task_line_nos = [line_no for line_no, _ in self.task_starts]
+        self._execution_line_nos = [line_no for line_no, _ in self.executions]
+        self._noise_line_nos = [line_no for line_no, _, _ in self.noise]
+
+        # Chaque section se termine juste avant la suivante
+        for current, following in zip(self.sections, self.sections[1:]):
+            current["end"] = following["start"] - 1
+
+    def failed_sections(self) -> List[Dict]:
+        """Retourne les sections de tâches contenant au moins un échec"""
+        return [section for section in self.sections if section["status"] == "failure"]
+
+    def _failure_start_line(self, task_name: str) -> int:
+        """Détermine la ligne de début de la section à extraire (-1 si introuvable)"""
+        separator_line_nos = self._separator_line_nos
+
+        if self.failures:
+            # Séparateur le plus proche au-dessus du premier échec (19 lignes max)
+            failure_line = self.failures[0][0]
+            lower_bound = max(0, failure_line - 20) + 1
+            position = bisect_right(separator_line_nos, failure_line) - 1
+            if position >= 0 and separator_line_nos[position] >= lower_bound:
+                return separator_line_nos[position]
+
+        # Sinon, chercher la tâche par son nom
+        task_name_short = task_name.split(' - ')[1] if ' - ' in task_name else task_name
+        for (line_no, _), line in zip(self.separators, self.separator_lines):
+            if f"task{task_name_short}" in line:
+                return line_no
+        return -1
+
+    def extract(self, task_name: str) -> str:
+        """
+        Extrait la sortie de la première tâche en échec
+
+        Args:
+            task_name: Nom de la tâche (utilisé si aucun échec explicite n'est trouvé)
+
+        Returns:
+            Sortie à partir de "# Executing all tests...", tronquée à 2000 caractères
+        """
+        start_line = self._failure_start_line(task_name)
+        if start_line == -1:
+            return self.text[:MAX_OUTPUT_LENGTH] + ("..." if len(self.text) > MAX_OUTPUT_LENGTH else "")
+
+        # Fin de la section: ligne précédant la prochaine section de tâche
+        position = bisect_right(self._task_line_nos, start_line)
+        if position < len(self.task_starts):
+            end_line, next_offset = self.task_starts[position]
+            end_offset = next_offset - 1
+        else:
+            end_line, end_offset = float("inf"), len(self.text)
+
+        # Début de la sortie utile: "# Executing all tests..." dans la section
+        position = bisect_left(self._execution_line_nos, start_line)
+        if position >= len(self.executions) or self.executions[position][0] >= end_line:
+            return ""
+        exec_line, exec_offset = self.executions[position]
+
+        # Découpage direct, en retirant les éventuelles lignes de compilation
+        first_noise = bisect_right(self._noise_line_nos, exec_line)
+        pieces = []
+        cursor = exec_offset
+        for line_no, noise_start, noise_end in self.noise[first_noise:]:
+            if line_no >= end_line:
+                break
+            pieces.append(self.text[cursor:noise_start - 1])
+            cursor = noise_end
+        pieces.append(self.text[cursor:end_offset])
+        result = "".join(pieces)
+
+        if len(result) > MAX_OUTPUT_LENGTH:
+            result = result[:MAX_OUTPUT_LENGTH] + "\n... (tronqué)"
+        return result
+
+
+class TraceIndexCache:
+    """Cache LRU des index de traces, par testRunId"""
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[object, TraceIndex]" = OrderedDict()
+
+    def get(self, run_id, output: str) -> TraceIndex:
+        """Retourne l'index de la trace, en le construisant au premier accès"""
+        index = self._entries.get(run_id)
+        if index is not None:
+            self._entries.move_to_end(run_id)
+            self.hits += 1
+            return index
+
+        self.misses += 1
+        index = TraceIndex(output)
+        self._entries[run_id] = index
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return index
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio de succès du cache (0.0 si aucune requête)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def extract_failed_task_output(output: str, task_name: str, run_id: Optional[object] = None) -> str:
+    """
+    Extrait la partie pertinente des logs d'erreur d'une tâche
+
+    Args:
+        output: Trace brute (peut contenir des codes ANSI)
+        task_name: Nom de la tâche en échec
+        run_id: testRunId associé; si fourni, l'index est mis en cache
+
+    Returns:
+        Logs de la tâche en échec, ou chaîne vide
+    """
+    if not output:
+        return ""
+    index = trace_index_cache.get(run_id, output) if run_id is not None else TraceIndex(output)
+    return index.extract(task_name)
+
+
+# Instance partagée par toutes les vues /logs
+trace_index_cache = TraceIndexCache()
@@ -0,0 +1,245 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional, Tuple
+
+from metrics import percentile
+
+
+SELF_PHASE = "traitement"  # Temps passé dans le callback lui-même (formatage, logique locale)
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("moulicord_span", default=None)
+
+
+class Span:
+    """Intervalle de temps nommé, rattaché à son parent dans une trace"""
+
+    __slots__ = ("name", "start", "end", "attrs", "children")
+
+    def __init__(self, name: str, attrs: Optional[Dict] = None):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attrs = attrs or {}
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict:
+        """Représentation JSON (offsets et durées en millisecondes, relatifs à la racine)"""
+        origin = self.start if origin is None else origin
+        data = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3)
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict(origin) for child in self.children]
+        return data
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Mesure un bloc comme sous-étape de la trace en cours
+
+    Sans trace active (tâches de fond, scripts), le bloc s'exécute sans mesure.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, attrs)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def phase_durations(root: Span) -> Dict[str, float]:
+    """
+    Durée par phase d'une trace terminée
+
+    Les sous-étapes de même nom sont additionnées; la phase "traitement"
+    correspond au temps de la racine non couvert par ses sous-étapes directes.
+    """
+    phases: Dict[str, float] = {"total": root.duration}
+    pending = list(root.children)
+    while pending:
+        current = pending.pop()
+        phases[current.name] = phases.get(current.name, 0.0) + current.duration
+        pending.extend(current.children)
+    phases[SELF_PHASE] = max(0.0, root.duration - sum(child.duration for child in root.children))
+    return phases
+
+
+class TraceRecorder:
+    """
+    Conserve les dernières traces et des échantillons de durée par phase
+
+    Si TRACES_FILE est défini, les traces terminées y sont aussi ajoutées en JSON
+    lines: elles sont mises en attente et écrites par lots, hors de la boucle
+    d'événements, au plus tard `flush_interval` secondes après leur fin.
+    """
+
+    def __init__(self, max_traces: int = 500, max_samples: int = 1000, export_file: Optional[str] = None,
+                 flush_interval: float = 5.0):
+        self.traces: Deque[Dict] = deque(maxlen=max_traces)
+        self.max_samples = max_samples
+        self.samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self.export_file = export_file
+        self.flush_interval = flush_interval
+        self._unflushed: List[Dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def record(self, root: Span):
+        """Enregistre une trace terminée (aucune écriture disque ici)"""
+        for phase, duration in phase_durations(root).items():
+            samples = self.samples.get((root.name, phase))
+            if samples is None:
+                samples = self.samples[(root.name, phase)] = deque(maxlen=self.max_samples)
+            samples.append(duration)
+
+        trace = dict(root.to_dict(), timestamp=time.time())
+        self.traces.append(trace)
+        if self.export_file:
+            self._unflushed.append(trace)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Programme l'écriture du lot en attente (une seule à la fois)"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Hors boucle d'événements (scripts): écriture immédiate
+            self.flush()
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        await asyncio.to_thread(self.flush)
+
+    def flush(self):
+        """Ajoute au fichier d'export les traces en attente"""
+        pending, self._unflushed = self._unflushed, []
+        if not pending:
+            return
+        try:
+            with open(self.export_file, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(trace, ensure_ascii=False) + "\n" for trace in pending))
+        except OSError as e:
+            print(f"⚠️  Impossible d'écrire {len(pending)} trace(s) dans {self.export_file}: {e}")
+
+    def summary(self, root_name: Optional[str] = None) -> Dict[str, Dict[str, Dict]]:
+        """
+        Percentiles par interaction et par phase
+
+        Returns:
+            Dict interaction -> phase -> {"count", "p50", "p95", "p99"} (secondes)
+        """
+        result: Dict[str, Dict[str, Dict]] = {}
+        for (name, phase), samples in self.samples.items():
+            if root_name and name != root_name:
+                continue
+            values = list(samples)
+            result.setdefault(name, {})[phase] = {
+                "count": len(values),
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99)
+            }
+        return result
+
+    def to_jsonl(self) -> str:
+        """Exporte les traces conservées en JSON lines"""
+        return "".join(json.dumps(trace, ensure_ascii=False) + "\n" for trace in self.traces)
+
+
+class _TracedProxy:
+    """
+    Vue sur un objet discord.py dont certains appels deviennent des sous-étapes de trace
+
+    Seule l'interaction reçue par un callback @traced est enveloppée, le temps de
+    ce callback: les classes de discord.py ne sont pas modifiées.
+    """
+
+    __slots__ = ("_target", "_spans")
+
+    def __init__(self, target, spans: Dict):
+        self._target = target
+        self._spans = spans
+
+    def __getattr__(self, name: str):
+        value = getattr(self._target, name)
+        spec = self._spans.get(name)
+        if spec is None:
+            return value
+        if isinstance(spec, dict):
+            return _TracedProxy(value, spec)
+
+        @functools.wraps(value)
+        async def call(*args, **kwargs):
+            with span(spec):
+                return await value(*args, **kwargs)
+        return call
+
+
+# Réponses Discord mesurées dans les traces (attribut de l'interaction -> nom de la sous-étape)
+INTERACTION_SPANS = {
+    "response": {
+        "defer": "discord defer",
+        "send_message": "discord send_message",
+        "edit_message": "discord edit_message"
+    },
+    "followup": {"send": "discord followup.send"},
+    "edit_original_response": "discord edit_original_response"
+}
+
+
+def traced(name: str):
+    """
+    Décorateur: chaque appel du callback asynchrone devient une trace racine
+
+    À placer au plus près de la fonction (sous @app_commands.command, @app_commands.describe
+    ou @discord.ui.button): la signature d'origine est conservée pour discord.py.
+    L'interaction passée au callback mesure ses réponses Discord (INTERACTION_SPANS).
+    """
+    import discord
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            args = tuple(_TracedProxy(arg, INTERACTION_SPANS) if isinstance(arg, discord.Interaction) else arg
+                         for arg in args)
+            root = Span(name)
+            token = _current_span.set(root)
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                root.attrs["error"] = type(e).__name__
+                raise
+            finally:
+                root.end = time.perf_counter()
+                _current_span.reset(token)
+                trace_recorder.record(root)
+        return wrapper
+    return decorator
+
+
+# Instance partagée par les commandes slash et les vues
+trace_recorder = TraceRecorder(export_file=os.getenv("TRACES_FILE") or None)